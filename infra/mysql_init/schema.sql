@@ -33,4 +33,39 @@ CREATE TABLE IF NOT EXISTS work_requests (
     created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
     FOREIGN KEY (assigned_to) REFERENCES resources(resource_id)
 );
-CREATE INDEX IF NOT EXISTS idx_work_requests_status ON work_requests (status);
\ No newline at end of file
+CREATE INDEX IF NOT EXISTS idx_work_requests_status ON work_requests (status);
+CREATE TABLE IF NOT EXISTS assignment_jobs (
+    job_id VARCHAR(36) PRIMARY KEY,
+    work_id VARCHAR(128) NOT NULL,
+    priority TINYINT NOT NULL DEFAULT 1,
+    -- queued | running | done | failed
+    status VARCHAR(20) NOT NULL DEFAULT 'queued',
+    llm_provider VARCHAR(20) NOT NULL DEFAULT 'template',
+    attempts INT NOT NULL DEFAULT 0,
+    max_attempts INT NOT NULL DEFAULT 5,
+    available_at DATETIME NOT NULL,
+    lease_owner VARCHAR(64),
+    lease_expires_at DATETIME,
+    last_error TEXT,
+    result TEXT,
+    created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+    updated_at DATETIME,
+    FOREIGN KEY (work_id) REFERENCES work_requests(work_id)
+);
+CREATE INDEX IF NOT EXISTS idx_assignment_jobs_claim ON assignment_jobs (status, priority, available_at);
+CREATE INDEX IF NOT EXISTS idx_assignment_jobs_work ON assignment_jobs (work_id);
+
+CREATE TABLE IF NOT EXISTS assignment_explanations (
+    work_id VARCHAR(128) PRIMARY KEY,
+    resource_id VARCHAR(10),
+    provider VARCHAR(20) NOT NULL,
+    -- pending | ready | failed
+    status VARCHAR(20) NOT NULL DEFAULT 'pending',
+    llm_input TEXT,
+    explanation TEXT,
+    error TEXT,
+    requested_at DATETIME,
+    completed_at DATETIME,
+    FOREIGN KEY (work_id) REFERENCES work_requests(work_id)
+);
+CREATE INDEX IF NOT EXISTS idx_assignment_explanations_status ON assignment_explanations (status);
@@ -1,25 +1,30 @@
 # services/api/app/agents/add_work_agent.py
-import time
 from datetime import datetime, time as dt_time
 from typing import Union
 
 from services.api.app.agents.base_agent import BaseAgent
 from services.api.app.db.repositories import WorkRequestsRepo
+from services.api.app.utils.ids import new_work_id
 
 
 class AddWorkAgent(BaseAgent):
     def run(self, input_data: dict) -> dict:
+        record = self.build_record(input_data)
+        WorkRequestsRepo.create_work_request(record)
+        return self.serialize(record)
+
+    @classmethod
+    def build_record(cls, input_data: dict) -> dict:
         # Validate required fields
         for k in ("work_type", "description", "priority", "scheduled_date", "scheduled_time"):
             if k not in input_data:
                 raise ValueError(f"{k} is required")
-        scheduled_timestamp = self._compose_timestamp(
+        scheduled_timestamp = cls._compose_timestamp(
             input_data["scheduled_date"], input_data["scheduled_time"]
         )
-        # Create deterministic id for reproducibility (timestamp + random small int)
-        work_id = f"W{int(time.time() * 1000)}"
-        record = {
-            "work_id": work_id,
+        return {
+            # time-ordered and unique across concurrent requests (ULID)
+            "work_id": new_work_id(),
             "work_type": input_data["work_type"],
             "description": input_data["description"],
             "priority": int(input_data["priority"]),
@@ -27,9 +32,10 @@ class AddWorkAgent(BaseAgent):
             "status": "pending",
             "assigned_to": None,
         }
-        WorkRequestsRepo.create_work_request(record)
-        serialized = {**record, "scheduled_timestamp": scheduled_timestamp.isoformat()}
-        return {"work_id": work_id, **serialized}
+
+    @staticmethod
+    def serialize(record: dict) -> dict:
+        return {**record, "scheduled_timestamp": record["scheduled_timestamp"].isoformat()}
 
     @staticmethod
     def _compose_timestamp(
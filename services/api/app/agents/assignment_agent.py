@@ -1,15 +1,35 @@
 # services/api/app/agents/assignment_agent.py
 from services.api.app.agents.base_agent import BaseAgent
 from services.api.app.db.repositories import (
+    ExplanationsRepo,
     ResourceCalendarRepo,
     ResourcesRepo,
+    UnitOfWork,
     WorkRequestsRepo,
 )
+from services.api.app.services.explanation_queue import schedule_explanation
 from services.api.app.services.llm_client import LLMClient
 
 
 class AssignmentAgent(BaseAgent):
-    def run(self, input_data: dict, llm_provider: str = "template") -> dict:
+    def run(
+        self,
+        input_data: dict,
+        llm_provider: str = "template",
+        commit: bool = True,
+        defer_explanation: bool = False,
+    ) -> dict:
+        """
+        Pick the top-scored candidate and explain the choice. With commit=False
+        the DB writes are skipped so callers can persist several assignments
+        together (see AssignmentRepo.commit_assignments).
+
+        With defer_explanation=True the explanation is not generated inline:
+        a pending assignment_explanations row is committed with the
+        assignment and the text is produced in the background (see
+        services/explanation_queue.py). Callers using commit=False must
+        create that row themselves.
+        """
         scored = input_data.get("scored_candidates", [])
         work_id = input_data.get("work_id")
         if not scored:
@@ -23,21 +43,25 @@ class AssignmentAgent(BaseAgent):
         resource_id = top["resource_id"]
         calendar_id = top.get("calendar_id")
 
-        WorkRequestsRepo.assign_work(work_id, resource_id)
-        if calendar_id:
-            ResourceCalendarRepo.increment_workload(calendar_id, delta=1)
-        ResourcesRepo.increment_cases_handled(resource_id, delta=1)
+        llm_input = self.build_explanation_input(input_data, top)
+        if commit:
+            # one transaction (and one commit) for all writes
+            with UnitOfWork() as uow:
+                WorkRequestsRepo.assign_work(work_id, resource_id, uow=uow)
+                if calendar_id:
+                    ResourceCalendarRepo.increment_workload(calendar_id, delta=1, uow=uow)
+                ResourcesRepo.increment_cases_handled(resource_id, delta=1, uow=uow)
+                if defer_explanation:
+                    ExplanationsRepo.create_pending(
+                        work_id, resource_id, llm_provider, llm_input, uow=uow
+                    )
+                    uow.after_commit(schedule_explanation, work_id, llm_input, llm_provider)
 
-        llm_input = {
-            "work_type": input_data.get("work_type"),
-            "priority": input_data.get("priority"),
-            "selected_resource": top.get("name"),
-            "skill_level": top.get("skill_level"),
-            "cases_handled": top.get("total_cases_handled"),
-            "availability": top.get("availability_window"),
-            "workload": top.get("current_workload"),
-        }
-        explanation = LLMClient.generate_explanation(llm_input, provider=llm_provider)
+        if defer_explanation:
+            explanation, explanation_status = None, "pending"
+        else:
+            explanation = LLMClient.generate_explanation(llm_input, provider=llm_provider)
+            explanation_status = "ready"
 
         return {
             "work_id": work_id,
@@ -46,6 +70,19 @@ class AssignmentAgent(BaseAgent):
             "scheduled_timestamp": input_data.get("scheduled_timestamp"),
             "assigned_to": resource_id,
             "explanation": explanation,
+            "explanation_status": explanation_status,
             "selected": top,
             "scored_candidates": scored,
         }
+
+    @staticmethod
+    def build_explanation_input(input_data: dict, top: dict) -> dict:
+        return {
+            "work_type": input_data.get("work_type"),
+            "priority": input_data.get("priority"),
+            "selected_resource": top.get("name"),
+            "skill_level": top.get("skill_level"),
+            "cases_handled": top.get("total_cases_handled"),
+            "availability": top.get("availability_window"),
+            "workload": top.get("current_workload"),
+        }
@@ -3,11 +3,25 @@ from datetime import datetime
 
 from services.api.app.agents.base_agent import BaseAgent
 from services.api.app.db.repositories import ResourceCalendarRepo
-from services.api.app.utils.scoring import compute_candidate_score, parse_time_window
+from services.api.app.utils.scoring import (
+    compute_candidate_scores_batch,
+    encode_specialties,
+    score_payloads,
+)
+from services.api.app.utils.time_utils import time_to_seconds
+
+GENERAL_SPECIALTY = "General_Radiologist"
 
 
 class AvailabilityCheckerAgent(BaseAgent):
-    def run(self, input_data: dict) -> dict:
+    def run(self, input_data: dict, calendars=None, entries=None) -> dict:
+        """
+        `calendars` optionally supplies a ShiftIndex for the scheduled date
+        (e.g. a batch run's private copy); otherwise the shared calendar
+        interval index is used. `entries` (resource_id -> first covering
+        calendar row) skips the lookup, e.g. when the async repositories
+        already fetched them.
+        """
         candidates = input_data.get("candidates", [])
         if not candidates:
             return {
@@ -32,35 +46,38 @@ class AvailabilityCheckerAgent(BaseAgent):
         required_specialty = input_data.get("required_specialty")
 
         resource_ids = [c["resource_id"] for c in candidates]
-        calendars = ResourceCalendarRepo.get_calendars_for_resources_on_date(
-            resource_ids, scheduled_date
-        )
-
-        scored = []
-        for candidate in candidates:
-            matches = calendars.get(candidate["resource_id"], [])
-            entry = self._find_matching_entry(matches, scheduled_dt)
-            if not entry:
-                continue
-            entry_dict = entry if isinstance(entry, dict) else dict(entry)
-
-            score_payload = compute_candidate_score(
-                candidate=candidate,
-                calendar_entry=entry_dict,
-                scheduled_dt=scheduled_dt,
-                required_specialty=required_specialty,
-                priority=priority,
+        if entries is not None:
+            pass
+        elif calendars is None:
+            entries = ResourceCalendarRepo.first_entries_covering(
+                resource_ids, scheduled_date, scheduled_dt.time()
             )
-
-            scored.append(
-                {
-                    **candidate,
-                    **score_payload,
-                    "calendar_id": entry_dict["calendar_id"],
-                    "scheduled_timestamp": scheduled_dt.isoformat(),
-                }
+        else:
+            entries = calendars.first_covering(
+                time_to_seconds(scheduled_dt.time()), resource_ids
             )
 
+        matched = [
+            (candidate, entries[candidate["resource_id"]])
+            for candidate in candidates
+            if candidate["resource_id"] in entries
+        ]
+
+        scored = []
+        if matched:
+            batch = self._score_batch(matched, scheduled_dt, required_specialty, priority)
+            for (candidate, entry), score_payload in zip(
+                matched, score_payloads(batch, [entry for _, entry in matched])
+            ):
+                scored.append(
+                    {
+                        **candidate,
+                        **score_payload,
+                        "calendar_id": entry["calendar_id"],
+                        "scheduled_timestamp": scheduled_dt.isoformat(),
+                    }
+                )
+
         scored.sort(key=lambda x: x["score"], reverse=True)
         return {
             "work_id": input_data.get("work_id"),
@@ -71,12 +88,25 @@ class AvailabilityCheckerAgent(BaseAgent):
         }
 
     @staticmethod
-    def _find_matching_entry(entries, scheduled_dt: datetime):
-        if not entries:
-            return None
-        scheduled_time = scheduled_dt.time()
-        for entry in entries:
-            start, end = parse_time_window(entry["available_from"], entry["available_to"])
-            if start <= scheduled_time <= end:
-                return entry
-        return None
+    def _score_batch(matched, scheduled_dt: datetime, required_specialty, priority: int):
+        vocabulary = {GENERAL_SPECIALTY: 0}
+        codes, vocabulary = encode_specialties(
+            [candidate.get("specialty") for candidate, _ in matched], vocabulary
+        )
+        required_code = encode_specialties([required_specialty], vocabulary)[0][0]
+        return compute_candidate_scores_batch(
+            specialty_codes=codes,
+            skill_levels=[_or_nan(c.get("skill_level")) for c, _ in matched],
+            total_cases=[_or_nan(c.get("total_cases_handled")) for c, _ in matched],
+            window_start=[time_to_seconds(e["available_from"]) for _, e in matched],
+            window_end=[time_to_seconds(e["available_to"]) for _, e in matched],
+            current_workload=[_or_nan(e.get("current_workload")) for _, e in matched],
+            scheduled_seconds=time_to_seconds(scheduled_dt.time()),
+            required_code=required_code,
+            priority=priority,
+            general_code=vocabulary[GENERAL_SPECIALTY],
+        )
+
+
+def _or_nan(value):
+    return float("nan") if value is None else value
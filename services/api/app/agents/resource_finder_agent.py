@@ -1,35 +1,48 @@
 # services/api/app/agents/resource_finder_agent.py
+from datetime import datetime
+
 from services.api.app.agents.base_agent import BaseAgent
-from services.api.app.db.repositories import ResourcesRepo
+from services.api.app.db.repositories import ResourceCalendarRepo, ResourcesRepo
+from services.api.app.services.query_cache import normalize_query, query_cache
+from services.api.app.utils.time_utils import time_to_seconds
 
 # embeddings FAISS optional
 try:
-    from services.api.app.services.embeddings import query_faiss_by_text
+    from services.api.app.services.embeddings import index_version, query_faiss_by_text
 
     FAISS_AVAILABLE = True
 except Exception:
     FAISS_AVAILABLE = False
 
 
+PROFILE_COLUMNS = ("resource_id", "name", "specialty", "skill_level", "total_cases_handled")
+
+
 class ResourceFinderAgent(BaseAgent):
-    def run(self, input_data: dict) -> dict:
+    def run(self, input_data: dict, roster=None, calendars=None) -> dict:
+        """
+        `roster` optionally supplies pre-fetched resource rows (e.g. from a
+        batch run); candidates are then filtered in memory instead of queried.
+
+        The semantic expansion only searches resources on shift at the
+        scheduled time (from `calendars`, a ShiftIndex for the scheduled
+        date, or the shared calendar index), and builds their candidate rows
+        from the joined calendar/profile rows instead of another query.
+        """
         required = input_data.get("required_specialty")
         alternate = input_data.get("alternate_specialty")
-        candidates = ResourcesRepo.get_by_specialty([required, alternate])
+        if roster is None:
+            candidates = ResourcesRepo.roster_cache().get_by_specialty([required, alternate])
+        else:
+            wanted = {s for s in (required, alternate) if s}
+            candidates = [r for r in roster if r.get("specialty") in wanted]
         # If very few candidates, expand via semantic FAISS (if available)
         if FAISS_AVAILABLE and len(candidates) < 3:
-            try:
+            known = {c["resource_id"] for c in candidates}
+            on_duty = self._on_duty_profiles(input_data, calendars, exclude=known)
+            if on_duty != {}:  # {}: nobody else is on shift, nothing to search for
                 q = f"{input_data.get('work_type','')} {input_data.get('description','')}"
-                sem = query_faiss_by_text(q, top_k=5)
-                ids = [r["id"] for r in sem]
-                sem_cands = ResourcesRepo.get_by_ids(ids)
-                # merge
-                idset = {c["resource_id"] for c in candidates}
-                for s in sem_cands:
-                    if s["resource_id"] not in idset:
-                        candidates.append(s)
-            except Exception:
-                pass
+                self._semantic_fallback(q, candidates, roster, on_duty)
         return {
             "work_id": input_data["work_id"],
             "candidates": candidates,
@@ -40,3 +53,76 @@ class ResourceFinderAgent(BaseAgent):
             "required_specialty": required,
             "alternate_specialty": alternate,
         }
+
+    def _semantic_fallback(self, query: str, candidates: list, roster, on_duty):
+        # a search that found nothing new for these candidates is not repeated
+        # while the same index version is in service (checked against CURRENT)
+        key = (
+            index_version(),
+            normalize_query(query),
+            tuple(sorted(c["resource_id"] for c in candidates)),
+            tuple(sorted(on_duty)) if on_duty is not None else None,
+        )
+        if query_cache().is_negative(key):
+            return
+        try:
+            if not self._expand_semantic(query, candidates, roster, on_duty):
+                query_cache().mark_negative(key)
+        except Exception:
+            pass
+
+    @staticmethod
+    def _on_duty_profiles(input_data: dict, calendars, exclude=()):
+        """
+        Profile rows (resource_id -> row) of resources on shift at the
+        scheduled timestamp, excluding `exclude`; None if the schedule is
+        unknown.
+        """
+        scheduled_ts = input_data.get("scheduled_timestamp")
+        try:
+            scheduled_dt = (
+                scheduled_ts if isinstance(scheduled_ts, datetime) else datetime.fromisoformat(scheduled_ts)
+            )
+            if calendars is None:
+                rows = ResourceCalendarRepo.on_duty_at(
+                    scheduled_dt.date().isoformat(), scheduled_dt.time()
+                )
+            else:
+                rows = calendars.covering(time_to_seconds(scheduled_dt.time()))
+        except Exception:
+            return None
+        profiles = {}
+        for row in rows:
+            if row["resource_id"] not in exclude and row["resource_id"] not in profiles:
+                profiles[row["resource_id"]] = {k: row.get(k) for k in PROFILE_COLUMNS}
+        return profiles
+
+    @staticmethod
+    def _expand_semantic(query: str, candidates: list, roster, on_duty=None) -> int:
+        """
+        Append semantic matches not already in `candidates`; returns how many.
+        With `on_duty` (resource_id -> profile row) the search is restricted
+        to those resources and their rows are used directly.
+        """
+        if on_duty is not None:
+            sem = query_faiss_by_text(query, top_k=5, allow_ids=list(on_duty))
+            sem_cands = [on_duty[r["id"]] for r in sem if r["id"] in on_duty]
+        else:
+            sem = query_faiss_by_text(query, top_k=5)
+            ids = [r["id"] for r in sem]
+            if roster is None:
+                sem_cands = ResourcesRepo.roster_cache().get_by_ids(ids)
+            else:
+                by_id = {r["resource_id"]: r for r in roster}
+                missing = [i for i in ids if i not in by_id]
+                sem_cands = [by_id[i] for i in ids if i in by_id]
+                sem_cands += ResourcesRepo.roster_cache().get_by_ids(missing)
+        # merge
+        idset = {c["resource_id"] for c in candidates}
+        added = 0
+        for s in sem_cands:
+            if s["resource_id"] not in idset:
+                idset.add(s["resource_id"])
+                candidates.append(s)
+                added += 1
+        return added
@@ -19,8 +19,88 @@ SQLITE_PATH = os.getenv(
     "SQLITE_PATH", str(ROOT / "infra" / "mysql_init" / "work_allocation.db")
 )
 
+# Connection pool shared by both dialects: max open connections, seconds to
+# wait for a free one, and idle seconds after which a connection is pinged.
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", 8))
+DB_POOL_TIMEOUT_SECONDS = float(os.getenv("DB_POOL_TIMEOUT_SECONDS", 10))
+DB_POOL_HEALTH_CHECK_SECONDS = float(os.getenv("DB_POOL_HEALTH_CHECK_SECONDS", 30))
+
 HF_LLM_MODEL = os.getenv("HF_LLM_MODEL", "distilgpt2")
 EMB_MODEL = os.getenv("EMB_MODEL", "all-MiniLM-L6-v2")
+# Embedding inference backend: torch-fp32, torch-int8 (dynamic quantization)
+# or onnx (ONNX Runtime); EMB_BATCH_SIZE is the encode batch for bulk builds.
+EMB_BACKENDS = ("torch-fp32", "torch-int8", "onnx")
+EMB_BACKEND = os.getenv("EMB_BACKEND", "torch-fp32").lower()
+if EMB_BACKEND not in EMB_BACKENDS:
+    raise ValueError(f"EMB_BACKEND={EMB_BACKEND!r}; expected one of {', '.join(EMB_BACKENDS)}")
+EMB_BATCH_SIZE = int(os.getenv("EMB_BATCH_SIZE", 64))
 EMB_CACHE_DIR = os.getenv(
     "EMB_CACHE_DIR", str(ROOT / "infra" / "mysql_init" / "embeddings_cache")
 )
+# Seconds between checks for a newly published FAISS index version.
+FAISS_RELOAD_CHECK_SECONDS = float(os.getenv("FAISS_RELOAD_CHECK_SECONDS", 5))
+# Semantic fallback caches: LRU of query embeddings and the negative cache of
+# searches that found no new candidate.
+QUERY_CACHE_MAX_ENTRIES = int(os.getenv("QUERY_CACHE_MAX_ENTRIES", 2048))
+QUERY_NEGATIVE_CACHE_MAX_ENTRIES = int(os.getenv("QUERY_NEGATIVE_CACHE_MAX_ENTRIES", 4096))
+QUERY_NEGATIVE_CACHE_TTL_SECONDS = float(os.getenv("QUERY_NEGATIVE_CACHE_TTL_SECONDS", 300))
+
+# Seconds before a cached per-date calendar index is reloaded from the DB.
+# This is how calendar changes made outside the API (e.g. a bulk_load
+# re-seed) reach it; current_workload of the matched shifts is re-read from
+# the DB on every availability check.
+CALENDAR_INDEX_TTL_SECONDS = float(os.getenv("CALENDAR_INDEX_TTL_SECONDS", 60))
+
+# How often (seconds) the in-memory specialty routing table re-checks the
+# specialty_mapping fingerprint; 0 disables the check (explicit reload only).
+ROUTING_VERSION_CHECK_SECONDS = float(os.getenv("ROUTING_VERSION_CHECK_SECONDS", 30))
+
+# Resource roster cache (per-specialty buckets, write-through case counts).
+ROSTER_CACHE_TTL_SECONDS = float(os.getenv("ROSTER_CACHE_TTL_SECONDS", 300))
+ROSTER_CACHE_MAX_BUCKETS = int(os.getenv("ROSTER_CACHE_MAX_BUCKETS", 128))
+ROSTER_CACHE_MAX_ROWS = int(os.getenv("ROSTER_CACHE_MAX_ROWS", 10000))
+
+# Assignment job queue (services/worker): lease length, retry policy and how
+# often an idle worker polls for new jobs.
+JOB_LEASE_SECONDS = float(os.getenv("JOB_LEASE_SECONDS", 60))
+JOB_MAX_ATTEMPTS = int(os.getenv("JOB_MAX_ATTEMPTS", 5))
+JOB_BACKOFF_BASE_SECONDS = float(os.getenv("JOB_BACKOFF_BASE_SECONDS", 2))
+JOB_BACKOFF_MAX_SECONDS = float(os.getenv("JOB_BACKOFF_MAX_SECONDS", 300))
+WORKER_POLL_SECONDS = float(os.getenv("WORKER_POLL_SECONDS", 1))
+
+# Deferred (background) explanation generation: worker threads in the API
+# process; pending explanations left by a restart are resumed at startup.
+EXPLANATION_WORKERS = int(os.getenv("EXPLANATION_WORKERS", 1))
+
+# Micro-batching HF inference process (services/inference_server.py). When
+# enabled, HF explanations from all threads go through one model process
+# that batches up to LLM_BATCH_MAX_SIZE prompts, waiting at most
+# LLM_BATCH_MAX_WAIT_MS for a batch to fill. After the process fails to
+# start or dies, restarts are refused (callers get the last error) for
+# LLM_INFERENCE_RESTART_BACKOFF_SECONDS.
+LLM_INFERENCE_SERVER = os.getenv("LLM_INFERENCE_SERVER", "0").lower() in ("1", "true", "yes")
+LLM_BATCH_MAX_SIZE = int(os.getenv("LLM_BATCH_MAX_SIZE", 8))
+LLM_BATCH_MAX_WAIT_MS = float(os.getenv("LLM_BATCH_MAX_WAIT_MS", 20))
+LLM_INFERENCE_TIMEOUT_SECONDS = float(os.getenv("LLM_INFERENCE_TIMEOUT_SECONDS", 120))
+LLM_INFERENCE_RESTART_BACKOFF_SECONDS = float(os.getenv("LLM_INFERENCE_RESTART_BACKOFF_SECONDS", 30))
+
+# Content-addressed cache of generated (HF) explanations: in-memory LRU of
+# EXPLANATION_CACHE_MAX_ENTRIES texts in front of an on-disk tier capped at
+# EXPLANATION_CACHE_MAX_BYTES (0 disables the disk tier). The disk tier is
+# shared, but each process tracks its size itself and re-scans the directory
+# every EXPLANATION_CACHE_RESCAN_SECONDS, so with N writers it can overshoot
+# the cap by what they write in that interval.
+EXPLANATION_CACHE_ENABLED = os.getenv("EXPLANATION_CACHE_ENABLED", "1").lower() in ("1", "true", "yes")
+EXPLANATION_CACHE_DIR = os.getenv(
+    "EXPLANATION_CACHE_DIR", str(Path(EMB_CACHE_DIR) / "explanations")
+)
+EXPLANATION_CACHE_MAX_ENTRIES = int(os.getenv("EXPLANATION_CACHE_MAX_ENTRIES", 4096))
+EXPLANATION_CACHE_MAX_BYTES = int(os.getenv("EXPLANATION_CACHE_MAX_BYTES", 64 * 1024 * 1024))
+EXPLANATION_CACHE_RESCAN_SECONDS = float(os.getenv("EXPLANATION_CACHE_RESCAN_SECONDS", 60))
+
+# Models loaded in the background at API startup (comma separated:
+# "embedding", "hf"); /healthz returns 503 until they are loaded.
+MODEL_WARMUP = [m.strip() for m in os.getenv("MODEL_WARMUP", "").split(",") if m.strip()]
+
+# POST /add_work/batch: rows inserted per transaction (one executemany).
+WORK_INTAKE_CHUNK_SIZE = int(os.getenv("WORK_INTAKE_CHUNK_SIZE", 1000))
@@ -1,9 +1,19 @@
+from datetime import datetime
+
 from services.api.app.agents.add_work_agent import AddWorkAgent
 from services.api.app.agents.assignment_agent import AssignmentAgent
 from services.api.app.agents.availability_checker_agent import AvailabilityCheckerAgent
 from services.api.app.agents.resource_finder_agent import ResourceFinderAgent
 from services.api.app.agents.work_analyzer_agent import WorkAnalyzerAgent
-from services.api.app.db.repositories import WorkRequestsRepo
+from services.api.app.db.calendar_index import ShiftIndex
+from services.api.app.db.repositories import (
+    AssignmentJobsRepo,
+    AssignmentRepo,
+    ExplanationsRepo,
+    ResourceCalendarRepo,
+    ResourcesRepo,
+    WorkRequestsRepo,
+)
 
 
 class AssignmentController:
@@ -23,7 +33,9 @@ class AssignmentController:
         scored = self.checker.run(found)
         return analysis, found, scored
 
-    def assign(self, work_id: str, llm_provider: str = "template") -> dict:
+    def assign(
+        self, work_id: str, llm_provider: str = "template", defer_explanation: bool = False
+    ) -> dict:
         analysis, found, scored = self._run_pipeline_until_scoring(work_id)
         assignment_input = {
             **scored,
@@ -31,11 +43,160 @@ class AssignmentController:
             "priority": analysis["priority"],
             "scheduled_timestamp": analysis["scheduled_timestamp"],
         }
-        assignment = self.assigner.run(assignment_input, llm_provider=llm_provider)
+        assignment = self.assigner.run(
+            assignment_input, llm_provider=llm_provider, defer_explanation=defer_explanation
+        )
         return assignment
 
+    def assign_many(self, work_ids, llm_provider: str = "template") -> dict:
+        """
+        Run the full pipeline for many work items while sharing lookups:
+        work rows, the roster and each date's calendars are fetched once, and
+        all writes are committed in one transaction.
+
+        Items are processed in the given order and in-memory workloads/case
+        counts are bumped after each pick, so the outcome matches calling
+        `assign` for each id in sequence.
+        """
+        work_ids = list(dict.fromkeys(work_ids))
+        works = WorkRequestsRepo.get_works_by_ids(work_ids)
+        analyses, results = self.analyze_batch(work_ids, works)
+        roster = ResourcesRepo.roster_cache().get_by_specialty(self.batch_specialties(analyses))
+        calendars_by_date = {}
+
+        def shift_for_date(scheduled_date):
+            if scheduled_date not in calendars_by_date:
+                # private copy: in-batch workload bumps must not leak
+                # into the shared index before the commit
+                calendars_by_date[scheduled_date] = ShiftIndex(
+                    ResourceCalendarRepo.on_duty_at(scheduled_date)
+                )
+            return calendars_by_date[scheduled_date]
+
+        pending_writes = self.plan_batch(analyses, results, roster, shift_for_date, llm_provider)
+        AssignmentRepo.commit_assignments(pending_writes)
+        return self.batch_response(work_ids, results, pending_writes)
+
+    def analyze_batch(self, work_ids, works):
+        analyses = {}
+        results = {}
+        for work_id in work_ids:
+            work = works.get(work_id)
+            if not work:
+                results[work_id] = {"work_id": work_id, "error": f"work_id {work_id} not found"}
+                continue
+            analyses[work_id] = self.analyzer.analyze(work)
+        return analyses, results
+
+    @staticmethod
+    def batch_specialties(analyses):
+        return sorted(
+            {
+                s
+                for a in analyses.values()
+                for s in (a["required_specialty"], a["alternate_specialty"])
+                if s
+            }
+        )
+
+    def plan_batch(self, analyses, results, roster, shift_for_date, llm_provider="template"):
+        """
+        Pick a resource for each analysed item without touching the DB.
+        `shift_for_date(date)` returns a private ShiftIndex for that date.
+        Fills `results` and returns the writes to commit.
+        """
+        roster_by_id = {r["resource_id"]: r for r in roster}
+        pending_writes = []
+        for work_id, analysis in analyses.items():
+            try:
+                calendars = shift_for_date(self._scheduled_date(analysis["scheduled_timestamp"]))
+                found = self.finder.run(analysis, roster=roster, calendars=calendars)
+                for candidate in found["candidates"]:
+                    if candidate["resource_id"] not in roster_by_id:
+                        roster_by_id[candidate["resource_id"]] = candidate
+                        roster.append(candidate)
+                scored = self.checker.run(found, calendars=calendars)
+                assignment_input = {
+                    **scored,
+                    "work_type": analysis["work_type"],
+                    "priority": analysis["priority"],
+                    "scheduled_timestamp": analysis["scheduled_timestamp"],
+                }
+                assignment = self.assigner.run(
+                    assignment_input, llm_provider=llm_provider, commit=False
+                )
+            except Exception as exc:
+                results[work_id] = {"work_id": work_id, "error": str(exc)}
+                continue
+
+            results[work_id] = assignment
+            resource_id = assignment.get("assigned_to")
+            if not resource_id:
+                continue
+            calendar_id = assignment["selected"].get("calendar_id")
+            pending_writes.append(
+                {"work_id": work_id, "resource_id": resource_id, "calendar_id": calendar_id}
+            )
+            # Mirror the DB increments so later items see the updated state.
+            if calendar_id:
+                calendars.apply_workload_delta(calendar_id, 1)
+            resource = roster_by_id.get(resource_id)
+            if resource is not None:
+                resource["total_cases_handled"] = (
+                    resource.get("total_cases_handled") or 0
+                ) + 1
+        return pending_writes
+
+    @staticmethod
+    def batch_response(work_ids, results, pending_writes) -> dict:
+        return {
+            "assignments": [results[w] for w in work_ids],
+            "summary": {
+                "requested": len(work_ids),
+                "assigned": len(pending_writes),
+                "unassigned": sum(
+                    1 for r in results.values() if "error" not in r and not r.get("assigned_to")
+                ),
+                "errors": sum(1 for r in results.values() if "error" in r),
+            },
+        }
+
+    @staticmethod
+    def _scheduled_datetime(scheduled_ts) -> datetime:
+        if isinstance(scheduled_ts, datetime):
+            return scheduled_ts
+        return datetime.fromisoformat(str(scheduled_ts))
+
+    @staticmethod
+    def _scheduled_date(scheduled_ts) -> str:
+        return AssignmentController._scheduled_datetime(scheduled_ts).date().isoformat()
+
+    def optimize_shift(
+        self, date_str: str, dry_run: bool = False, llm_provider: str = "template"
+    ) -> dict:
+        # Imported lazily: the optimizer needs scipy, the greedy path does not.
+        from services.api.app.services.shift_optimizer import optimize_shift
+
+        return optimize_shift(date_str, dry_run=dry_run, llm_provider=llm_provider)
+
+    def enqueue_assignment(self, work_id: str, llm_provider: str = "template") -> dict:
+        """
+        Queue `work_id` for the assignment workers (services/worker). An
+        already queued/running job for the same work item is returned as is.
+        """
+        work = WorkRequestsRepo.get_work_by_id(work_id)
+        if not work:
+            raise ValueError(f"work_id {work_id} not found")
+        active = AssignmentJobsRepo.active_for_work(work_id)
+        if active:
+            return active
+        return AssignmentJobsRepo.enqueue(work_id, work["priority"], llm_provider=llm_provider)
+
     def fetch_status(self, work_id: str):
-        return WorkRequestsRepo.get_work_by_id(work_id)
+        work = WorkRequestsRepo.get_work_by_id(work_id)
+        if work:
+            work.update(explanation_fields(ExplanationsRepo.get(work_id)))
+        return work
 
     def run_pipeline_verbose(self, work_id: str, llm_provider: str = "template"):
         analysis, found, scored = self._run_pipeline_until_scoring(work_id)
@@ -53,3 +214,16 @@ class AssignmentController:
             "assignment": assignment,
         }
 
+
+def explanation_fields(row) -> dict:
+    """
+    explanation / explanation_status for /status; None when the explanation
+    was generated inline (it is returned with the assignment, not stored).
+    """
+    if not row:
+        return {"explanation_status": None, "explanation": None, "explanation_error": None}
+    return {
+        "explanation_status": row["status"],
+        "explanation": row.get("explanation"),
+        "explanation_error": row.get("error"),
+    }
@@ -0,0 +1,178 @@
+import asyncio
+
+from services.api.app.agents import resource_finder_agent
+from services.api.app.agents.add_work_agent import AddWorkAgent
+from services.api.app.controllers.assignment_controller import (
+    AssignmentController,
+    explanation_fields,
+)
+from services.api.app.db.async_repositories import (
+    AsyncAssignmentJobsRepo,
+    AsyncAssignmentRepo,
+    AsyncExplanationsRepo,
+    AsyncResourceCalendarRepo,
+    AsyncResourcesRepo,
+    AsyncUnitOfWork,
+    AsyncWorkRequestsRepo,
+)
+from services.api.app.db.calendar_index import ShiftIndex
+from services.api.app.services.explanation_queue import schedule_explanation
+
+
+class AsyncAssignmentController:
+    """
+    Async variant of AssignmentController for the async routes.
+
+    All DB reads/writes are awaited through the async repositories; the
+    agents are reused through their pure entry points (analyze, in-memory
+    roster/calendars, commit=False). CPU/model-bound steps (semantic search,
+    HF explanations, the shift optimizer) run in worker threads.
+    """
+
+    def __init__(self, sync_controller: AssignmentController = None):
+        self.sync = sync_controller or AssignmentController()
+
+    async def add_work(self, payload: dict) -> dict:
+        record = AddWorkAgent.build_record(payload)
+        await AsyncWorkRequestsRepo.create_work_request(record)
+        return AddWorkAgent.serialize(record)
+
+    async def add_work_many(self, payloads) -> list:
+        """Insert already validated work payloads in one transaction; returns their ids."""
+        records = [AddWorkAgent.build_record(p) for p in payloads]
+        await AsyncWorkRequestsRepo.create_work_requests(records)
+        return [r["work_id"] for r in records]
+
+    async def _score(self, work_id: str):
+        work = await AsyncWorkRequestsRepo.get_work_by_id(work_id)
+        if not work:
+            raise ValueError(f"work_id {work_id} not found")
+        analysis = self.sync.analyzer.analyze(work)
+        roster = await AsyncResourcesRepo.cached_by_specialty(
+            [analysis["required_specialty"], analysis["alternate_specialty"]]
+        )
+        scheduled_dt = self.sync._scheduled_datetime(analysis["scheduled_timestamp"])
+        scheduled_date = scheduled_dt.date().isoformat()
+        # loaded first so the finder's on-duty filter is served from memory
+        await AsyncResourceCalendarRepo.ensure_indexed(scheduled_date)
+        found = await self._find(analysis, roster)
+        # fetched here (fresh workloads) so the checker makes no sync DB call
+        entries = await AsyncResourceCalendarRepo.first_entries_covering(
+            [c["resource_id"] for c in found["candidates"]], scheduled_date, scheduled_dt.time()
+        )
+        scored = self.sync.checker.run(found, entries=entries)
+        return analysis, found, scored
+
+    async def _find(self, analysis: dict, roster):
+        if resource_finder_agent.FAISS_AVAILABLE:
+            # semantic expansion may embed the query; keep it off the loop
+            return await asyncio.to_thread(self.sync.finder.run, analysis, roster)
+        return self.sync.finder.run(analysis, roster=roster)
+
+    async def _explain(self, assignment_input: dict, llm_provider: str, defer: bool) -> dict:
+        if defer or llm_provider == "template":
+            return self.sync.assigner.run(
+                assignment_input, llm_provider=llm_provider, commit=False, defer_explanation=defer
+            )
+        return await asyncio.to_thread(
+            self.sync.assigner.run, assignment_input, llm_provider, False
+        )
+
+    async def assign(
+        self,
+        work_id: str,
+        llm_provider: str = "template",
+        defer_explanation: bool = False,
+        verbose: bool = False,
+    ):
+        analysis, found, scored = await self._score(work_id)
+        assignment_input = {
+            **scored,
+            "work_type": analysis["work_type"],
+            "priority": analysis["priority"],
+            "scheduled_timestamp": analysis["scheduled_timestamp"],
+        }
+        assignment = await self._explain(assignment_input, llm_provider, defer_explanation)
+        resource_id = assignment.get("assigned_to")
+        if resource_id:
+            calendar_id = assignment["selected"].get("calendar_id")
+            async with AsyncUnitOfWork() as uow:
+                await AsyncWorkRequestsRepo.assign_work(work_id, resource_id, uow=uow)
+                if calendar_id:
+                    await AsyncResourceCalendarRepo.increment_workload(calendar_id, uow=uow)
+                await AsyncResourcesRepo.increment_cases_handled(resource_id, uow=uow)
+                if defer_explanation:
+                    llm_input = self.sync.assigner.build_explanation_input(
+                        assignment_input, assignment["selected"]
+                    )
+                    await AsyncExplanationsRepo.create_pending(
+                        work_id, resource_id, llm_provider, llm_input, uow=uow
+                    )
+                    uow.after_commit(schedule_explanation, work_id, llm_input, llm_provider)
+        if verbose:
+            return {"analysis": analysis, "candidates": found, "scored": scored, "assignment": assignment}
+        return assignment
+
+    async def run_pipeline_verbose(self, work_id: str, llm_provider: str = "template"):
+        return await self.assign(work_id, llm_provider=llm_provider, verbose=True)
+
+    async def assign_many(self, work_ids, llm_provider: str = "template") -> dict:
+        """
+        Same semantics as AssignmentController.assign_many: prefetch with
+        async queries, plan in memory, commit once.
+        """
+        work_ids = list(dict.fromkeys(work_ids))
+        works = await AsyncWorkRequestsRepo.get_works_by_ids(work_ids)
+        analyses, results = self.sync.analyze_batch(work_ids, works)
+        roster = await AsyncResourcesRepo.cached_by_specialty(
+            self.sync.batch_specialties(analyses)
+        )
+        shifts = {}
+        for analysis in analyses.values():
+            try:
+                scheduled_date = self.sync._scheduled_date(analysis["scheduled_timestamp"])
+            except Exception:
+                continue  # reported per item by plan_batch
+            if scheduled_date not in shifts:
+                shifts[scheduled_date] = ShiftIndex(
+                    await AsyncResourceCalendarRepo.on_duty_at(scheduled_date)
+                )
+
+        # the finder may embed queries (FAISS) and read the roster cache
+        # through the sync repositories, so planning stays off the loop
+        pending = await asyncio.to_thread(
+            self.sync.plan_batch, analyses, results, roster, shifts.__getitem__, llm_provider
+        )
+        await AsyncAssignmentRepo.commit_assignments(pending)
+        return self.sync.batch_response(work_ids, results, pending)
+
+    async def optimize_shift(
+        self, date_str: str, dry_run: bool = False, llm_provider: str = "template"
+    ) -> dict:
+        # LP solve is CPU-bound and uses the sync repositories.
+        return await asyncio.to_thread(
+            self.sync.optimize_shift, date_str, dry_run, llm_provider
+        )
+
+    async def enqueue_assignment(self, work_id: str, llm_provider: str = "template") -> dict:
+        work = await AsyncWorkRequestsRepo.get_work_by_id(work_id)
+        if not work:
+            raise ValueError(f"work_id {work_id} not found")
+        active = await AsyncAssignmentJobsRepo.active_for_work(work_id)
+        if active:
+            return active
+        return await AsyncAssignmentJobsRepo.enqueue(
+            work_id, work["priority"], llm_provider=llm_provider
+        )
+
+    async def fetch_job(self, job_id: str):
+        return await AsyncAssignmentJobsRepo.get(job_id)
+
+    async def fetch_status(self, work_id: str):
+        work = await AsyncWorkRequestsRepo.get_work_by_id(work_id)
+        if work:
+            work.update(explanation_fields(await AsyncExplanationsRepo.get(work_id)))
+        return work
+
+    async def list_work(self, limit: int = 25, status=None):
+        return await AsyncWorkRequestsRepo.list_work_requests(limit=limit, status=status)
@@ -0,0 +1,543 @@
+# services/api/app/db/async_repositories.py
+"""
+Async mirror of db/repositories.py used by the async routes/controller.
+
+Queries run on aiosqlite / aiomysql when the driver is installed, so awaiting
+the database does not hold a Starlette threadpool slot. Without the driver
+each statement falls back to the sync connection pool in a worker thread.
+SQL, row shapes and the cache/index write-through hooks are shared with the
+sync repositories, which remain the API for scripts and tests.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from datetime import datetime, timedelta
+
+from services.api.app.config import (
+    DB_DIALECT,
+    DB_HOST,
+    DB_NAME,
+    DB_PASSWORD,
+    DB_POOL_HEALTH_CHECK_SECONDS,
+    DB_POOL_SIZE,
+    DB_POOL_TIMEOUT_SECONDS,
+    DB_PORT,
+    DB_USER,
+    JOB_MAX_ATTEMPTS,
+)
+from services.api.app.db import repositories as sync_repos
+from services.api.app.db.mysql import get_connection, init_db, sqlite_path
+from services.api.app.db.pool import AsyncConnectionPool
+from services.api.app.db.repositories import (
+    EXPLANATION_COLUMNS,
+    JOB_COLUMNS,
+    PLACEHOLDER,
+    AssignmentJobsRepo,
+    ExplanationsRepo,
+    WorkRequestsRepo,
+    _adapt_sql,
+    _chunks,
+    _explanation_row,
+    _job_row,
+    _placeholders,
+    _row_to_dict,
+    _rows_to_dicts,
+    _with_workloads,
+    assignment_cache_updates,
+    assignment_statements,
+)
+
+logger = logging.getLogger(__name__)
+
+try:
+    import aiosqlite  # type: ignore
+
+    AIOSQLITE_AVAILABLE = True
+except Exception:
+    AIOSQLITE_AVAILABLE = False
+
+try:
+    import aiomysql  # type: ignore
+
+    AIOMYSQL_AVAILABLE = True
+except Exception:
+    AIOMYSQL_AVAILABLE = False
+
+
+async def _rollback_open_transaction(conn):
+    if getattr(conn, "in_transaction", True):
+        await conn.rollback()
+
+
+async def _ping(conn):
+    if DB_DIALECT == "mysql":
+        await conn.ping(reconnect=False)
+    else:
+        await (await conn.execute("SELECT 1")).close()
+
+
+async def _connect():
+    if DB_DIALECT == "mysql":
+        return await aiomysql.connect(
+            host=DB_HOST,
+            user=DB_USER,
+            password=DB_PASSWORD,
+            db=DB_NAME,
+            port=DB_PORT,
+            autocommit=False,
+        )
+    init_db()
+    conn = await aiosqlite.connect(sqlite_path())
+    conn.row_factory = aiosqlite.Row
+    return conn
+
+
+_async_pool = None
+if (DB_DIALECT == "mysql" and AIOMYSQL_AVAILABLE) or (DB_DIALECT != "mysql" and AIOSQLITE_AVAILABLE):
+    _async_pool = AsyncConnectionPool(
+        _connect,
+        max_size=DB_POOL_SIZE,
+        timeout=DB_POOL_TIMEOUT_SECONDS,
+        health_check=_ping,
+        health_check_after=DB_POOL_HEALTH_CHECK_SECONDS,
+        reset=_rollback_open_transaction,
+        name=f"{DB_DIALECT}-async",
+    )
+else:
+    logger.info("No async %s driver installed; async repositories use worker threads", DB_DIALECT)
+
+
+def native_async() -> bool:
+    return _async_pool is not None
+
+
+def async_pool_stats() -> dict:
+    return _async_pool.stats() if _async_pool is not None else {}
+
+
+async def close_async_pool():
+    """
+    Close idle pooled connections (app shutdown). They belong to the
+    closing event loop, and aiosqlite's connection threads would otherwise
+    keep the process alive.
+    """
+    if _async_pool is not None:
+        await _async_pool.close_all()
+
+
+async def _acursor(conn):
+    if DB_DIALECT == "mysql":
+        return await conn.cursor(aiomysql.DictCursor)
+    return await conn.cursor()
+
+
+def _sync_fetch(sql, params, one):
+    conn = get_connection()
+    cur = sync_repos._cursor(conn, dictionary=True)
+    try:
+        cur.execute(sql, params)
+        return cur.fetchone() if one else cur.fetchall()
+    finally:
+        cur.close()
+        conn.close()
+
+
+async def _fetch(sql, params=(), one=False):
+    if _async_pool is None:
+        return await asyncio.to_thread(_sync_fetch, sql, tuple(params), one)
+    async with _async_pool.connection() as conn:
+        cur = await _acursor(conn)
+        try:
+            await cur.execute(sql, tuple(params))
+            return await (cur.fetchone() if one else cur.fetchall())
+        finally:
+            await cur.close()
+
+
+async def _fetchall(sql, params=()):
+    return _rows_to_dicts(list(await _fetch(sql, params)))
+
+
+async def _fetchone(sql, params=()):
+    return _row_to_dict(await _fetch(sql, params, one=True))
+
+
+class AsyncUnitOfWork:
+    """
+    Async counterpart of UnitOfWork. Writes are buffered and applied on exit
+    in one transaction on one connection, so the connection is only held for
+    the commit itself; after_commit() callbacks run once it succeeded.
+
+        async with AsyncUnitOfWork() as uow:
+            await AsyncWorkRequestsRepo.assign_work(work_id, resource_id, uow=uow)
+    """
+
+    def __init__(self):
+        self._statements = []
+        self._after_commit = []
+
+    async def __aenter__(self):
+        return self
+
+    def execute(self, sql, params):
+        self._statements.append((sql, [tuple(params)]))
+
+    def executemany(self, sql, params_seq):
+        self._statements.append((sql, [tuple(p) for p in params_seq]))
+
+    def after_commit(self, callback, *args):
+        self._after_commit.append((callback, args))
+
+    async def __aexit__(self, exc_type, exc, tb):
+        statements, self._statements = self._statements, []
+        if exc_type is not None or not statements:
+            return False
+        if _async_pool is None:
+            await asyncio.to_thread(_flush_sync, statements)
+        else:
+            await _flush_async(statements)
+        hooks, self._after_commit = self._after_commit, []
+        for callback, args in hooks:
+            callback(*args)
+        return False
+
+
+def _flush_sync(statements):
+    with sync_repos.UnitOfWork() as uow:
+        cur = uow.cursor()
+        for sql, params_seq in statements:
+            cur.executemany(sql, params_seq)
+        cur.close()
+
+
+async def _flush_async(statements):
+    async with _async_pool.connection() as conn:
+        cur = await _acursor(conn)
+        try:
+            for sql, params_seq in statements:
+                await cur.executemany(sql, params_seq)
+            await conn.commit()
+        except BaseException:
+            await conn.rollback()
+            raise
+        finally:
+            await cur.close()
+
+
+async def _execute_write(sql, params, uow=None, after_commit=None, *args):
+    if uow is None:
+        async with AsyncUnitOfWork() as own:
+            await _execute_write(sql, params, own, after_commit, *args)
+        return
+    uow.execute(sql, params)
+    if after_commit is not None:
+        uow.after_commit(after_commit, *args)
+
+
+class AsyncResourcesRepo:
+    @staticmethod
+    async def list_resources():
+        return await _fetchall(
+            "SELECT resource_id, name, specialty, skill_level, total_cases_handled FROM resources"
+        )
+
+    @staticmethod
+    async def get_by_specialty(specialties):
+        specialties = [s for s in (specialties or []) if s]
+        if not specialties:
+            return []
+        sql = f"""SELECT resource_id, name, specialty, skill_level, total_cases_handled
+                  FROM resources WHERE specialty IN ({_placeholders(len(specialties))})"""
+        return await _fetchall(sql, specialties)
+
+    @staticmethod
+    async def get_by_ids(ids_list):
+        if not ids_list:
+            return []
+        sql = f"""SELECT resource_id, name, specialty, skill_level, total_cases_handled
+                  FROM resources WHERE resource_id IN ({_placeholders(len(ids_list))})"""
+        return await _fetchall(sql, ids_list)
+
+    @staticmethod
+    async def cached_by_specialty(specialties):
+        """
+        Roster rows for `specialties` through the shared roster cache; only
+        cache misses are queried.
+        """
+        cache = sync_repos.ResourcesRepo.roster_cache()
+        rows, missing = cache.peek_specialties(specialties)
+        if not missing:
+            return rows
+        loaded = await AsyncResourcesRepo.get_by_specialty(missing)
+        cache.fill_specialties(missing, loaded)
+        merged = {r["resource_id"]: r for r in rows}
+        merged.update((r["resource_id"], dict(r)) for r in loaded)
+        return sorted(merged.values(), key=lambda r: r["resource_id"])
+
+    @staticmethod
+    async def cached_list_resources():
+        cache = sync_repos.ResourcesRepo.roster_cache()
+        rows = cache.peek_all()
+        if rows is None:
+            rows = await AsyncResourcesRepo.list_resources()
+            cache.fill_all(rows)
+            rows = sorted((dict(r) for r in rows), key=lambda r: r["resource_id"])
+        return rows
+
+    @staticmethod
+    async def increment_cases_handled(resource_id, delta=1, uow=None):
+        sql = _adapt_sql(
+            "UPDATE resources SET total_cases_handled = COALESCE(total_cases_handled,0) + %s WHERE resource_id=%s"
+        )
+        await _execute_write(
+            sql, (delta, resource_id), uow, sync_repos._apply_cases_delta, resource_id, delta
+        )
+
+
+class AsyncResourceCalendarRepo:
+    @staticmethod
+    async def get_calendars_for_resources_on_date(resource_ids, date_str):
+        if not resource_ids:
+            return {}
+        sql = f"""SELECT resource_id, calendar_id, date, available_from, available_to, current_workload
+                  FROM resource_calendar
+                  WHERE resource_id IN ({_placeholders(len(resource_ids))}) AND date={PLACEHOLDER}
+                  ORDER BY available_from"""
+        rows = await _fetchall(sql, tuple(resource_ids) + (date_str,))
+        mapping = {}
+        for row in rows:
+            mapping.setdefault(row["resource_id"], []).append(row)
+        return mapping
+
+    @staticmethod
+    async def get_calendars_on_date(date_str):
+        sql = _adapt_sql(
+            """SELECT resource_id, calendar_id, date, available_from, available_to, current_workload
+               FROM resource_calendar
+               WHERE date=%s
+               ORDER BY available_from"""
+        )
+        mapping = {}
+        for row in await _fetchall(sql, (date_str,)):
+            mapping.setdefault(row["resource_id"], []).append(row)
+        return mapping
+
+    @staticmethod
+    async def get_on_duty(date_str):
+        sql = _adapt_sql(
+            """SELECT rc.calendar_id, rc.resource_id, rc.date, rc.available_from,
+                      rc.available_to, rc.current_workload,
+                      r.name, r.specialty, r.skill_level, r.total_cases_handled
+               FROM resource_calendar rc
+               INNER JOIN resources r ON rc.resource_id = r.resource_id
+               WHERE rc.date=%s
+               ORDER BY rc.available_from"""
+        )
+        return await _fetchall(sql, (date_str,))
+
+    @staticmethod
+    async def ensure_indexed(date_str):
+        """
+        Make sure the shared calendar index holds a fresh copy of `date_str`,
+        loading it with an async query if needed.
+        """
+        index = sync_repos.ResourceCalendarRepo.calendar_index()
+        if index.peek(date_str) is None:
+            index.prime(date_str, await AsyncResourceCalendarRepo.get_on_duty(date_str))
+        return index
+
+    @staticmethod
+    async def on_duty_at(date_str, at_time=None):
+        index = await AsyncResourceCalendarRepo.ensure_indexed(date_str)
+        return index.on_duty(date_str, at_time)
+
+    @staticmethod
+    async def first_entries_covering(resource_ids, date_str, at_time):
+        if not resource_ids:
+            return {}
+        index = await AsyncResourceCalendarRepo.ensure_indexed(date_str)
+        entries = index.first_covering(date_str, at_time, resource_ids)
+        workloads = await AsyncResourceCalendarRepo.get_workloads(
+            [e["calendar_id"] for e in entries.values()]
+        )
+        return _with_workloads(entries, workloads)
+
+    @staticmethod
+    async def get_workloads(calendar_ids):
+        if not calendar_ids:
+            return {}
+        sql = f"""SELECT calendar_id, current_workload
+                  FROM resource_calendar WHERE calendar_id IN ({_placeholders(len(calendar_ids))})"""
+        rows = await _fetchall(sql, list(calendar_ids))
+        return {row["calendar_id"]: row["current_workload"] for row in rows}
+
+    @staticmethod
+    async def increment_workload(calendar_id, delta=1, uow=None):
+        sql = _adapt_sql(
+            "UPDATE resource_calendar SET current_workload = COALESCE(current_workload,0) + %s WHERE calendar_id=%s"
+        )
+        index = sync_repos.ResourceCalendarRepo.calendar_index()
+        await _execute_write(
+            sql, (delta, calendar_id), uow, index.apply_workload_delta, calendar_id, delta
+        )
+
+
+class AsyncSpecialtyMappingRepo:
+    @staticmethod
+    async def get_by_work_type(work_type):
+        sql = _adapt_sql(
+            "SELECT work_type, required_specialty, alternate_specialty FROM specialty_mapping WHERE work_type=%s"
+        )
+        return await _fetchone(sql, (work_type,))
+
+    @staticmethod
+    async def list_mappings():
+        return await _fetchall(
+            "SELECT work_type, required_specialty, alternate_specialty FROM specialty_mapping"
+        )
+
+
+class AsyncWorkRequestsRepo:
+    @staticmethod
+    async def create_work_request(record: dict, uow=None):
+        await _execute_write(
+            WorkRequestsRepo.insert_sql(), WorkRequestsRepo.insert_params(record), uow
+        )
+
+    @staticmethod
+    async def create_work_requests(records, uow=None):
+        """Insert many work requests with one executemany (one transaction without `uow`)."""
+        if uow is None:
+            async with AsyncUnitOfWork() as own:
+                await AsyncWorkRequestsRepo.create_work_requests(records, uow=own)
+            return
+        uow.executemany(
+            WorkRequestsRepo.insert_sql(), [WorkRequestsRepo.insert_params(r) for r in records]
+        )
+
+    @staticmethod
+    async def get_work_by_id(work_id):
+        sql = _adapt_sql(
+            """SELECT work_id, work_type, description, priority,
+                      scheduled_timestamp, status, assigned_to
+               FROM work_requests WHERE work_id=%s"""
+        )
+        return await _fetchone(sql, (work_id,))
+
+    @staticmethod
+    async def get_works_by_ids(work_ids):
+        works = {}
+        for chunk in _chunks(dict.fromkeys(work_ids or [])):
+            sql = f"""SELECT work_id, work_type, description, priority,
+                             scheduled_timestamp, status, assigned_to
+                      FROM work_requests WHERE work_id IN ({_placeholders(len(chunk))})"""
+            for row in await _fetchall(sql, chunk):
+                works[row["work_id"]] = row
+        return works
+
+    @staticmethod
+    async def assign_work(work_id, resource_id, uow=None):
+        sql = _adapt_sql("UPDATE work_requests SET assigned_to=%s, status=%s WHERE work_id=%s")
+        await _execute_write(sql, (resource_id, "assigned", work_id), uow)
+
+    @staticmethod
+    async def list_pending_on_date(date_str):
+        next_day = (datetime.strptime(date_str, "%Y-%m-%d") + timedelta(days=1)).strftime(
+            "%Y-%m-%d"
+        )
+        sql = _adapt_sql(
+            """SELECT work_id, work_type, description, priority,
+                      scheduled_timestamp, status, assigned_to
+               FROM work_requests
+               WHERE status=%s AND scheduled_timestamp >= %s AND scheduled_timestamp < %s
+               ORDER BY priority DESC, scheduled_timestamp, work_id"""
+        )
+        return await _fetchall(sql, ("pending", date_str, next_day))
+
+    @staticmethod
+    async def list_work_requests(limit=50, status=None):
+        params = []
+        sql = """SELECT work_id, work_type, description, priority,
+                        scheduled_timestamp, status, assigned_to
+                 FROM work_requests"""
+        if status:
+            sql += " WHERE status=%s"
+            params.append(status)
+        sql += " ORDER BY scheduled_timestamp DESC LIMIT %s"
+        params.append(int(limit))
+        return await _fetchall(_adapt_sql(sql), params)
+
+
+class AsyncAssignmentRepo:
+    @staticmethod
+    async def commit_assignments(assignments, uow=None):
+        if not assignments:
+            return
+        if uow is None:
+            async with AsyncUnitOfWork() as own:
+                await AsyncAssignmentRepo.commit_assignments(assignments, uow=own)
+            return
+        for sql, params_seq in assignment_statements(assignments):
+            uow.executemany(sql, params_seq)
+        for callback, args in assignment_cache_updates(assignments):
+            uow.after_commit(callback, *args)
+
+
+class AsyncAssignmentJobsRepo:
+    """
+    Enqueue/inspect side of AssignmentJobsRepo for the async routes; claiming
+    and completing jobs is done by the (sync) worker processes.
+    """
+
+    @staticmethod
+    async def enqueue(work_id, priority, llm_provider="template", max_attempts=JOB_MAX_ATTEMPTS, uow=None):
+        job = AssignmentJobsRepo.new_job(work_id, priority, llm_provider, max_attempts)
+        await _execute_write(
+            AssignmentJobsRepo.insert_sql(), AssignmentJobsRepo.insert_params(job), uow
+        )
+        return job
+
+    @staticmethod
+    async def get(job_id):
+        return _job_row(
+            await _fetchone(
+                _adapt_sql(f"SELECT {JOB_COLUMNS} FROM assignment_jobs WHERE job_id=%s"),
+                (job_id,),
+            )
+        )
+
+    @staticmethod
+    async def active_for_work(work_id):
+        return _job_row(
+            await _fetchone(
+                _adapt_sql(
+                    f"""SELECT {JOB_COLUMNS} FROM assignment_jobs
+                        WHERE work_id=%s AND status IN ('queued', 'running')
+                        ORDER BY created_at DESC LIMIT 1"""
+                ),
+                (work_id,),
+            )
+        )
+
+
+class AsyncExplanationsRepo:
+    @staticmethod
+    async def create_pending(work_id, resource_id, provider, llm_input, uow=None):
+        await _execute_write(
+            ExplanationsRepo.pending_sql(),
+            ExplanationsRepo.pending_params(work_id, resource_id, provider, llm_input),
+            uow,
+        )
+
+    @staticmethod
+    async def get(work_id):
+        return _explanation_row(
+            await _fetchone(
+                _adapt_sql(
+                    f"SELECT {EXPLANATION_COLUMNS} FROM assignment_explanations WHERE work_id=%s"
+                ),
+                (work_id,),
+            )
+        )
@@ -0,0 +1,296 @@
+# services/api/app/db/bulk_load.py
+"""
+Bulk (re-)seeding of the database from the fixture CSVs.
+
+Usage:
+    python -m services.api.app.db.bulk_load --sqlite /tmp/staging.db [--csv-dir DIR]
+    python -m services.api.app.db.bulk_load --mysql [--csv-dir DIR] [--truncate]
+
+SQLite: the database is built in a temp file next to the target and then
+renamed over it, so the load can run with journal_mode=OFF and
+synchronous=OFF (a crash leaves the old file untouched). Tables are created
+first, the CSVs are streamed into them in `chunk_size` executemany batches
+inside one transaction per table, and only then are the secondary indexes
+of schema.sql created and ANALYZE run.
+
+MySQL (DB_* settings): each CSV is sent with LOAD DATA LOCAL INFILE, with
+unique/foreign key checks off and the schema.sql secondary indexes dropped
+during the load and rebuilt afterwards, followed by ANALYZE TABLE. The
+tables themselves must already exist (the MySQL schema is managed
+externally); --truncate empties them first.
+
+Both print one JSON report with rows, seconds and rows/sec per table.
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import json
+import logging
+import os
+import re
+import sqlite3
+import time
+from itertools import islice
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+MYSQL_INIT_DIR = Path(__file__).resolve().parents[4] / "infra" / "mysql_init"
+SCHEMA_PATH = MYSQL_INIT_DIR / "schema.sql"
+CHUNK_SIZE = 10000
+
+# load order respects the foreign keys
+TABLE_COLUMNS = {
+    "resources": ["resource_id", "name", "specialty", "skill_level", "total_cases_handled"],
+    "resource_calendar": [
+        "calendar_id",
+        "resource_id",
+        "date",
+        "available_from",
+        "available_to",
+        "current_workload",
+    ],
+    "specialty_mapping": ["work_type", "required_specialty", "alternate_specialty"],
+    "work_requests": [
+        "work_id",
+        "work_type",
+        "description",
+        "priority",
+        "scheduled_timestamp",
+        "status",
+        "assigned_to",
+    ],
+}
+
+_INDEX_RE = re.compile(
+    r"CREATE\s+INDEX\s+(?:IF\s+NOT\s+EXISTS\s+)?(\w+)\s+ON\s+(\w+)", re.IGNORECASE
+)
+
+
+def csv_sources(csv_dir: Optional[Path] = None) -> Dict[str, Path]:
+    directory = Path(csv_dir) if csv_dir else MYSQL_INIT_DIR
+    return {table: directory / f"{table}.csv" for table in TABLE_COLUMNS}
+
+
+def split_schema(schema_path: Path = SCHEMA_PATH) -> Tuple[List[str], List[str]]:
+    """(table statements, secondary index statements) of schema.sql."""
+    with open(schema_path, "r", encoding="utf-8") as f:
+        sql = "\n".join(
+            line
+            for line in f.readlines()
+            if not line.strip().upper().startswith("USE ") and not line.strip().startswith("--")
+        )
+    tables, indexes = [], []
+    for statement in (s.strip() for s in sql.split(";")):
+        if not statement:
+            continue
+        (indexes if _INDEX_RE.match(statement) else tables).append(statement)
+    return tables, indexes
+
+
+def read_rows(csv_path: Path, columns: List[str]) -> Iterator[tuple]:
+    """Stream `columns` of a CSV as tuples, empty fields as None."""
+    with open(csv_path, "r", encoding="utf-8", newline="") as f:
+        reader = csv.reader(f)
+        header = next(reader, None) or []
+        positions = [header.index(col) for col in columns]
+        for row in reader:
+            yield tuple(row[i] if row[i] != "" else None for i in positions)
+
+
+def _table_report(table: str, rows: int, seconds: float) -> dict:
+    logger.info("Loaded %d rows into %s in %.2fs", rows, table, seconds)
+    return {
+        "table": table,
+        "rows": rows,
+        "seconds": round(seconds, 3),
+        "rows_per_sec": round(rows / seconds, 1) if seconds else None,
+    }
+
+
+def load_sqlite(
+    path: Path,
+    sources: Optional[Dict[str, Path]] = None,
+    schema_path: Path = SCHEMA_PATH,
+    chunk_size: int = CHUNK_SIZE,
+) -> dict:
+    """
+    Build a SQLite database at `path` from `sources` (table -> CSV path;
+    missing files leave the table empty), replacing any existing file.
+    """
+    path = Path(path)
+    sources = sources if sources is not None else csv_sources()
+    table_sql, index_sql = split_schema(schema_path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.loading")
+    tmp.unlink(missing_ok=True)
+
+    started = time.perf_counter()
+    report = {"target": str(path), "tables": []}
+    conn = sqlite3.connect(tmp, isolation_level=None)  # explicit BEGIN/COMMIT
+    try:
+        # the temp file is thrown away on failure, so durability is not needed
+        conn.execute("PRAGMA journal_mode=OFF")
+        conn.execute("PRAGMA synchronous=OFF")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn.execute("PRAGMA cache_size=-65536")  # 64 MiB
+        for statement in table_sql:
+            conn.execute(statement)
+
+        for table, columns in TABLE_COLUMNS.items():
+            csv_path = sources.get(table)
+            if not csv_path or not Path(csv_path).exists():
+                continue
+            t0 = time.perf_counter()
+            sql = (
+                f"INSERT INTO {table} ({','.join(columns)}) "
+                f"VALUES ({','.join(['?'] * len(columns))})"
+            )
+            rows = read_rows(Path(csv_path), columns)
+            count = 0
+            conn.execute("BEGIN")
+            while True:
+                chunk = list(islice(rows, chunk_size))
+                if not chunk:
+                    break
+                conn.executemany(sql, chunk)
+                count += len(chunk)
+            conn.execute("COMMIT")
+            report["tables"].append(_table_report(table, count, time.perf_counter() - t0))
+
+        t0 = time.perf_counter()
+        conn.execute("BEGIN")
+        for statement in index_sql:
+            conn.execute(statement)
+        conn.execute("COMMIT")
+        report["index_seconds"] = round(time.perf_counter() - t0, 3)
+
+        t0 = time.perf_counter()
+        conn.execute("ANALYZE")
+        report["analyze_seconds"] = round(time.perf_counter() - t0, 3)
+        # the default rollback journal for the connections that use the file
+        conn.execute("PRAGMA journal_mode=DELETE")
+    except BaseException:
+        conn.close()
+        tmp.unlink(missing_ok=True)
+        raise
+    conn.close()
+
+    for suffix in ("-wal", "-shm", "-journal"):
+        Path(f"{path}{suffix}").unlink(missing_ok=True)
+    os.replace(tmp, path)
+    report["total_seconds"] = round(time.perf_counter() - started, 3)
+    return report
+
+
+def _mysql_load_sql(table: str, columns: List[str], csv_path: Path, header: List[str]) -> str:
+    # read every CSV column into a variable, then map by name: the column
+    # order of the file does not matter and empty fields become NULL
+    variables = [f"@c{i}" for i in range(len(header))]
+    assignments = ", ".join(
+        f"{col} = NULLIF(@c{header.index(col)}, '')" for col in columns
+    )
+    path = str(Path(csv_path).resolve()).replace("\\", "\\\\").replace("'", "\\'")
+    return (
+        f"LOAD DATA LOCAL INFILE '{path}' INTO TABLE {table} "
+        "CHARACTER SET utf8mb4 "
+        "FIELDS TERMINATED BY ',' OPTIONALLY ENCLOSED BY '\"' "
+        "LINES TERMINATED BY '\\n' IGNORE 1 LINES "
+        f"({', '.join(variables)}) SET {assignments}"
+    )
+
+
+def load_mysql(
+    sources: Optional[Dict[str, Path]] = None,
+    schema_path: Path = SCHEMA_PATH,
+    truncate: bool = False,
+) -> dict:
+    import mysql.connector  # type: ignore
+
+    from services.api.app.config import DB_HOST, DB_NAME, DB_PASSWORD, DB_PORT, DB_USER
+
+    sources = sources if sources is not None else csv_sources()
+    _, index_sql = split_schema(schema_path)
+    indexes = [(_INDEX_RE.match(s).groups(), s) for s in index_sql]
+    started = time.perf_counter()
+    report = {"target": f"mysql://{DB_HOST}:{DB_PORT}/{DB_NAME}", "tables": []}
+    conn = mysql.connector.connect(
+        host=DB_HOST,
+        user=DB_USER,
+        password=DB_PASSWORD,
+        database=DB_NAME,
+        port=DB_PORT,
+        autocommit=False,
+        allow_local_infile=True,
+    )
+    try:
+        cur = conn.cursor()
+        cur.execute("SET SESSION unique_checks = 0")
+        cur.execute("SET SESSION foreign_key_checks = 0")
+        loaded = [t for t in TABLE_COLUMNS if sources.get(t) and Path(sources[t]).exists()]
+        if truncate:
+            for table in reversed(list(TABLE_COLUMNS)):
+                cur.execute(f"TRUNCATE TABLE {table}")
+        # drop secondary indexes of the tables being loaded, rebuild after
+        for (name, table), _ in indexes:
+            if table in loaded:
+                try:
+                    cur.execute(f"DROP INDEX {name} ON {table}")
+                except mysql.connector.Error:
+                    pass  # not there yet
+
+        for table in loaded:
+            csv_path = Path(sources[table])
+            with open(csv_path, "r", encoding="utf-8", newline="") as f:
+                header = next(csv.reader(f), [])
+            t0 = time.perf_counter()
+            cur.execute(_mysql_load_sql(table, TABLE_COLUMNS[table], csv_path, header))
+            rows = cur.rowcount
+            conn.commit()
+            report["tables"].append(_table_report(table, rows, time.perf_counter() - t0))
+
+        t0 = time.perf_counter()
+        for (name, table), statement in indexes:
+            if table in loaded:
+                cur.execute(re.sub(r"IF\s+NOT\s+EXISTS\s+", "", statement, flags=re.IGNORECASE))
+        report["index_seconds"] = round(time.perf_counter() - t0, 3)
+
+        t0 = time.perf_counter()
+        if loaded:
+            cur.execute(f"ANALYZE TABLE {', '.join(loaded)}")
+            cur.fetchall()
+        report["analyze_seconds"] = round(time.perf_counter() - t0, 3)
+        cur.execute("SET SESSION foreign_key_checks = 1")
+        cur.execute("SET SESSION unique_checks = 1")
+        cur.close()
+    finally:
+        conn.close()
+    report["total_seconds"] = round(time.perf_counter() - started, 3)
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Bulk-load the fixture CSVs into a database.")
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--sqlite", help="SQLite file to (re)create")
+    target.add_argument("--mysql", action="store_true", help="Load into the DB_* MySQL database")
+    parser.add_argument("--csv-dir", help=f"Directory with <table>.csv (default: {MYSQL_INIT_DIR})")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE, help="SQLite executemany batch")
+    parser.add_argument("--truncate", action="store_true", help="MySQL: empty the tables first")
+    args = parser.parse_args(argv)
+
+    sources = csv_sources(args.csv_dir)
+    if args.sqlite:
+        report = load_sqlite(Path(args.sqlite), sources, chunk_size=args.chunk_size)
+    else:
+        report = load_mysql(sources, truncate=args.truncate)
+    print(json.dumps(report, indent=2))
+    return report
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    main()
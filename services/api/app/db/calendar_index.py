@@ -0,0 +1,182 @@
+# services/api/app/db/calendar_index.py
+"""
+In-memory interval index over resource_calendar.
+
+Each date gets a ShiftIndex: its calendar rows plus an IntervalTree keyed on
+seconds since midnight, answering "who is on shift at T" in O(log n + k)
+without re-parsing time strings. CalendarIndex keeps one ShiftIndex per date,
+loads dates lazily through a loader (ResourceCalendarRepo.get_on_duty) and
+applies this process's workload / case-count deltas. The app never writes
+calendar rows themselves, so there is no per-row refresh: dates older than
+`ttl_seconds` are reloaded, which is how changes from outside (other
+processes, a bulk_load re-seed) are picked up; invalidate() forces it.
+
+Shift windows rarely change, but current_workload changes with every
+assignment in any process, so the shared scoring lookup
+(ResourceCalendarRepo.first_entries_covering) re-reads it from the DB for
+the matched rows and feeds it back through `set_workloads`.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Iterable, List, Optional
+
+from services.api.app.utils.interval_index import IntervalTree
+from services.api.app.utils.time_utils import time_to_seconds
+
+
+class ShiftIndex:
+    """
+    Calendar rows of a single date with an interval tree over their windows.
+    Rows are held by reference; use CalendarIndex for a shared, copy-on-read
+    view.
+    """
+
+    def __init__(self, rows: Iterable[dict]):
+        self.rows: Dict[str, dict] = {}
+        self._starts: Dict[str, float] = {}
+        self._by_resource: Dict[str, set] = {}
+        for row in rows:
+            self.rows[row["calendar_id"]] = row
+            self._starts[row["calendar_id"]] = time_to_seconds(row["available_from"])
+            self._by_resource.setdefault(row["resource_id"], set()).add(row["calendar_id"])
+        # one balanced build instead of a tree insert per row
+        self._tree = IntervalTree(
+            (self._starts[cid], time_to_seconds(row["available_to"]), cid)
+            for cid, row in self.rows.items()
+        )
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def all_rows(self) -> List[dict]:
+        return sorted(self.rows.values(), key=lambda r: self._starts[r["calendar_id"]])
+
+    def covering(self, at_seconds: float, resource_ids=None) -> List[dict]:
+        """
+        Rows whose window contains `at_seconds`, ordered by available_from.
+        """
+        rows = [self.rows[cid] for cid in self._tree.stab(at_seconds)]
+        if resource_ids is not None:
+            wanted = set(resource_ids)
+            rows = [r for r in rows if r["resource_id"] in wanted]
+        return rows
+
+    def first_covering(self, at_seconds: float, resource_ids=None) -> Dict[str, dict]:
+        """
+        The earliest-starting covering row per resource_id.
+        """
+        matches: Dict[str, dict] = {}
+        for row in self.covering(at_seconds, resource_ids):
+            matches.setdefault(row["resource_id"], row)
+        return matches
+
+    def apply_workload_delta(self, calendar_id: str, delta: int) -> bool:
+        row = self.rows.get(calendar_id)
+        if row is None:
+            return False
+        row["current_workload"] = (row.get("current_workload") or 0) + delta
+        return True
+
+    def set_workload(self, calendar_id: str, workload) -> bool:
+        row = self.rows.get(calendar_id)
+        if row is None:
+            return False
+        row["current_workload"] = workload
+        return True
+
+    def apply_cases_delta(self, resource_id: str, delta: int):
+        for calendar_id in self._by_resource.get(resource_id, ()):
+            row = self.rows[calendar_id]
+            if "total_cases_handled" in row:
+                row["total_cases_handled"] = (row.get("total_cases_handled") or 0) + delta
+
+
+class CalendarIndex:
+    def __init__(
+        self,
+        loader: Callable[[str], List[dict]],
+        ttl_seconds: float = 60.0,
+        max_dates: int = 64,
+    ):
+        self._loader = loader
+        self._ttl = ttl_seconds
+        self._max_dates = max_dates
+        self._dates: "OrderedDict[str, tuple]" = OrderedDict()  # date -> (loaded_at, ShiftIndex)
+        self._lock = threading.RLock()
+
+    def _get(self, date_str: str) -> ShiftIndex:
+        shift = self.peek(date_str)
+        if shift is None:
+            shift = self.prime(date_str, self._loader(date_str))
+        return shift
+
+    def peek(self, date_str: str) -> Optional[ShiftIndex]:
+        """The loaded, still-fresh ShiftIndex for a date (None if it needs loading)."""
+        with self._lock:
+            cached = self._dates.get(date_str)
+            if cached and (self._ttl <= 0 or time.monotonic() - cached[0] < self._ttl):
+                self._dates.move_to_end(date_str)
+                return cached[1]
+        return None
+
+    def prime(self, date_str: str, rows: Iterable[dict]) -> ShiftIndex:
+        """Install rows loaded by the caller (e.g. an async query) for a date."""
+        shift = ShiftIndex(rows)
+        with self._lock:
+            self._dates[date_str] = (time.monotonic(), shift)
+            self._dates.move_to_end(date_str)
+            while len(self._dates) > self._max_dates:
+                self._dates.popitem(last=False)
+        return shift
+
+    def on_duty(self, date_str: str, at_time=None) -> List[dict]:
+        """
+        Calendar (+ profile) rows for a date, optionally only those whose
+        window contains `at_time`. Returns copies ordered by available_from.
+        """
+        shift = self._get(date_str)
+        with self._lock:
+            if at_time is None:
+                rows = shift.all_rows()
+            else:
+                rows = shift.covering(time_to_seconds(at_time))
+            return [dict(r) for r in rows]
+
+    def first_covering(self, date_str: str, at_time, resource_ids=None) -> Dict[str, dict]:
+        shift = self._get(date_str)
+        with self._lock:
+            matches = shift.first_covering(time_to_seconds(at_time), resource_ids)
+            return {rid: dict(row) for rid, row in matches.items()}
+
+    def _loaded(self):
+        return [shift for _, shift in self._dates.values()]
+
+    def apply_workload_delta(self, calendar_id: str, delta: int = 1):
+        with self._lock:
+            for shift in self._loaded():
+                if shift.apply_workload_delta(calendar_id, delta):
+                    return
+
+    def set_workloads(self, workloads: Dict[str, int]):
+        """Overwrite current_workload with values read from the DB."""
+        with self._lock:
+            for calendar_id, workload in workloads.items():
+                for shift in self._loaded():
+                    if shift.set_workload(calendar_id, workload):
+                        break
+
+    def apply_cases_delta(self, resource_id: str, delta: int = 1):
+        with self._lock:
+            for shift in self._loaded():
+                shift.apply_cases_delta(resource_id, delta)
+
+    def invalidate(self, date_str: Optional[str] = None):
+        with self._lock:
+            if date_str is None:
+                self._dates.clear()
+            else:
+                self._dates.pop(date_str, None)
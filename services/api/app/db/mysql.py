@@ -6,28 +6,40 @@ The original specification mandates MySQL with connection pooling. To ease local
 development and automated testing, we also support SQLite by switching the
 `DB_DIALECT` environment variable (defaults to `mysql`). This module exposes a
 single `get_connection()` helper consumed by all repositories.
+
+Both dialects are served from the same bounded `ConnectionPool` (see
+db/pool.py); callers keep calling `conn.close()`, which returns the connection
+to the pool. The SQLite schema/template check runs once per process
+(`init_db()`, called at startup or on the first connect).
 """
 
 from __future__ import annotations
 
-import csv
 import shutil
 import sqlite3
+import threading
 from pathlib import Path
-from typing import Iterable, Optional
+from typing import Optional
 
 from services.api.app.config import (
     DB_DIALECT,
     DB_HOST,
     DB_NAME,
     DB_PASSWORD,
+    DB_POOL_HEALTH_CHECK_SECONDS,
+    DB_POOL_SIZE,
+    DB_POOL_TIMEOUT_SECONDS,
     DB_PORT,
     DB_USER,
     SQLITE_PATH as CONFIG_SQLITE_PATH,
 )
+from services.api.app.db.bulk_load import csv_sources, load_sqlite
+from services.api.app.db.pool import ConnectionPool
 
-_pool = None  # type: ignore[assignment]
+_pool: Optional[ConnectionPool] = None
 _SQLITE_PATH = CONFIG_SQLITE_PATH
+_schema_lock = threading.Lock()
+_schema_checked = False
 ROOT_DIR = Path(__file__).resolve().parents[4]
 _SQLITE_TEMPLATE_CANDIDATES = [
     ROOT_DIR / "infra" / "mysql_init" / "work_allocation.db",
@@ -42,20 +54,39 @@ CSV_SOURCES = {
     "work_requests": ROOT_DIR / "infra" / "mysql_init" / "work_requests.csv",
 }
 
+
+def _rollback_open_transaction(conn):
+    # Never hand the next borrower a connection with uncommitted work.
+    if getattr(conn, "in_transaction", True):
+        conn.rollback()
+
+
 if DB_DIALECT == "mysql":
     import mysql.connector  # type: ignore
-    from mysql.connector import pooling  # type: ignore
-
-    # Create a reusable connection pool for the API+agents
-    _pool = pooling.MySQLConnectionPool(
-        pool_name="work_pool",
-        pool_size=6,
-        host=DB_HOST,
-        user=DB_USER,
-        password=DB_PASSWORD,
-        database=DB_NAME,
-        port=DB_PORT,
-        autocommit=False,
+
+    def _mysql_connect():
+        return mysql.connector.connect(
+            host=DB_HOST,
+            user=DB_USER,
+            password=DB_PASSWORD,
+            database=DB_NAME,
+            port=DB_PORT,
+            autocommit=False,
+        )
+
+    def _mysql_ping(conn):
+        conn.ping(reconnect=False)
+
+    # Reusable connection pool for the API+agents; waits instead of raising
+    # when all connections are busy.
+    _pool = ConnectionPool(
+        _mysql_connect,
+        max_size=DB_POOL_SIZE,
+        timeout=DB_POOL_TIMEOUT_SECONDS,
+        health_check=_mysql_ping,
+        health_check_after=DB_POOL_HEALTH_CHECK_SECONDS,
+        reset=_rollback_open_transaction,
+        name="mysql",
     )
 else:
     # Lazy import only when needed to avoid sqlite dependency for strict MySQL environments
@@ -64,6 +95,47 @@ else:
     if not _SQLITE_PATH:
         _SQLITE_PATH = os.path.join("infra", "mysql_init", "work_allocation.db")
 
+    def _sqlite_connect():
+        init_db()
+        # Pooled connections move between request threads, but the pool
+        # guarantees a single borrower at a time.
+        conn = sqlite3.connect(_SQLITE_PATH, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def _sqlite_ping(conn):
+        conn.execute("SELECT 1").fetchone()
+
+    _pool = ConnectionPool(
+        _sqlite_connect,
+        max_size=DB_POOL_SIZE,
+        timeout=DB_POOL_TIMEOUT_SECONDS,
+        health_check=_sqlite_ping,
+        health_check_after=DB_POOL_HEALTH_CHECK_SECONDS,
+        reset=_rollback_open_transaction,
+        name="sqlite",
+    )
+
+
+def init_db():
+    """
+    One-time database preparation. For SQLite this validates (or creates /
+    copies) the database file; for MySQL the schema is managed externally.
+    Safe to call repeatedly and from several threads.
+    """
+    global _schema_checked
+    if _schema_checked or DB_DIALECT == "mysql":
+        return
+    with _schema_lock:
+        if not _schema_checked:
+            _ensure_sqlite_db()
+            conn = sqlite3.connect(_SQLITE_PATH)
+            try:
+                _apply_schema(conn)
+            finally:
+                conn.close()
+            _schema_checked = True
+
 
 def _ensure_sqlite_db():
     path = Path(_SQLITE_PATH)
@@ -95,91 +167,46 @@ def _sqlite_schema_current(path: Path) -> bool:
         return False
 
 
-def _bootstrap_sqlite_db(path: Path):
+def _apply_schema(conn):
+    """
+    Run schema.sql against a SQLite connection. Every statement is
+    CREATE ... IF NOT EXISTS, so this also adds tables introduced after an
+    existing database file was created.
+    """
+    with open(SCHEMA_PATH, "r", encoding="utf-8") as f:
+        schema_sql = "\n".join(
+            line for line in f.readlines() if not line.strip().upper().startswith("USE ")
+        )
+    conn.executescript(schema_sql)
+
+
+def _bootstrap_sqlite_db(path: Path, csv_dir: Optional[Path] = None):
     """
     Create a SQLite database from schema + CSV fixtures when a template DB is missing.
     Ensures tests/dev setups always have a consistent dataset.
+
+    `csv_dir` loads <table>.csv files from another directory instead, e.g.
+    a large synthetic dataset (see db/synthetic_data.py). The load itself is
+    db/bulk_load.py: CSVs are streamed in chunks and indexes built last.
     """
     if not SCHEMA_PATH.exists():
         raise FileNotFoundError(f"Schema file not found at {SCHEMA_PATH}")
-
-    conn = sqlite3.connect(path)
-    try:
-        with open(SCHEMA_PATH, "r", encoding="utf-8") as f:
-            schema_sql = "\n".join(
-                line
-                for line in f.readlines()
-                if not line.strip().upper().startswith("USE ")
-            )
-            conn.executescript(schema_sql)
-
-        def load_csv(table: str, columns: Iterable[str]):
-            csv_path = CSV_SOURCES.get(table)
-            if not csv_path or not csv_path.exists():
-                return
-            with open(csv_path, "r", encoding="utf-8") as cf:
-                reader = csv.DictReader(cf)
-                rows = [
-                    tuple(row[col] if row[col] != "" else None for col in columns)
-                    for row in reader
-                ]
-                if not rows:
-                    return
-                placeholders = ",".join(["?"] * len(columns))
-                conn.executemany(
-                    f"INSERT INTO {table} ({','.join(columns)}) VALUES ({placeholders})",
-                    rows,
-                )
-
-        load_csv(
-            "resources",
-            ["resource_id", "name", "specialty", "skill_level", "total_cases_handled"],
-        )
-        load_csv(
-            "resource_calendar",
-            [
-                "calendar_id",
-                "resource_id",
-                "date",
-                "available_from",
-                "available_to",
-                "current_workload",
-            ],
-        )
-        load_csv(
-            "specialty_mapping",
-            ["work_type", "required_specialty", "alternate_specialty"],
-        )
-        load_csv(
-            "work_requests",
-            [
-                "work_id",
-                "work_type",
-                "description",
-                "priority",
-                "scheduled_timestamp",
-                "status",
-                "assigned_to",
-            ],
-        )
-
-        conn.commit()
-    finally:
-        conn.close()
+    sources = csv_sources(csv_dir) if csv_dir else CSV_SOURCES
+    return load_sqlite(path, sources, schema_path=SCHEMA_PATH)
 
 
 def get_connection():
     """
-    Returns a database connection object.
+    Returns a pooled database connection; close() returns it to the pool.
     """
-    if DB_DIALECT == "mysql":
-        if _pool is None:
-            raise RuntimeError("MySQL pool not initialized")
-        return _pool.get_connection()
-
-    # SQLite fallback (mostly for development/unit tests). We open a new
-    # connection per call and rely on sqlite's lightweight nature.
-    _ensure_sqlite_db()
-    conn = sqlite3.connect(_SQLITE_PATH)
-    conn.row_factory = sqlite3.Row
-    return conn
+    if _pool is None:
+        raise RuntimeError("Database pool not initialized")
+    return _pool.acquire()
+
+
+def sqlite_path() -> str:
+    return _SQLITE_PATH
+
+
+def pool_stats() -> dict:
+    return _pool.stats() if _pool is not None else {}
@@ -0,0 +1,424 @@
+# services/api/app/db/pool.py
+"""
+Dialect-agnostic, thread-safe connection pool.
+
+`ConnectionPool` hands out `PooledConnection` proxies; calling `close()` on a
+proxy (as every repository method already does) returns the underlying
+connection to the pool instead of closing it. When the pool is exhausted,
+callers wait on a queue for up to `timeout` seconds instead of failing
+immediately, and the wait-queue is instrumented (waits, wait time, peak queue
+length, timeouts). Idle connections are health-checked before reuse and
+replaced when the check fails.
+
+`AsyncConnectionPool` offers the same contract for asyncio drivers.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import collections
+import contextlib
+import logging
+import threading
+import time
+from typing import Any, Callable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class PoolTimeout(RuntimeError):
+    """Raised when no connection becomes available within the timeout."""
+
+
+class PooledConnection:
+    """
+    Thin proxy around a DB-API connection. Attribute access is delegated;
+    close() hands the connection back to its pool.
+    """
+
+    __slots__ = ("_pool", "_raw", "_broken")
+
+    def __init__(self, pool: "ConnectionPool", raw):
+        self._pool = pool
+        self._raw = raw
+        self._broken = False
+
+    def __getattr__(self, name):
+        raw = object.__getattribute__(self, "_raw")
+        if raw is None:
+            raise RuntimeError("connection already returned to the pool")
+        return getattr(raw, name)
+
+    @property
+    def raw(self):
+        return self._raw
+
+    def invalidate(self):
+        """Mark the connection unusable so the pool discards it on close()."""
+        self._broken = True
+
+    def close(self):
+        raw, self._raw = self._raw, None
+        if raw is not None:
+            self._pool._release(raw, broken=self._broken)
+
+    def __del__(self):
+        # Safety net for code paths that raise before calling close().
+        try:
+            self.close()
+        except Exception:
+            pass
+
+
+class _Slot:
+    __slots__ = ("raw", "idle_since")
+
+    def __init__(self, raw):
+        self.raw = raw
+        self.idle_since = time.monotonic()
+
+
+class ConnectionPool:
+    def __init__(
+        self,
+        factory: Callable[[], Any],
+        max_size: int = 8,
+        timeout: float = 10.0,
+        health_check: Optional[Callable[[Any], None]] = None,
+        health_check_after: float = 30.0,
+        reset: Optional[Callable[[Any], None]] = None,
+        name: str = "db",
+    ):
+        if max_size < 1:
+            raise ValueError("max_size must be >= 1")
+        self.name = name
+        self._factory = factory
+        self._max_size = max_size
+        self._timeout = timeout
+        self._health_check = health_check
+        self._health_check_after = health_check_after
+        self._reset = reset
+        self._idle: List[_Slot] = []
+        self._size = 0
+        self._cond = threading.Condition()
+        self._closed = False
+        # metrics
+        self._waiting = 0
+        self._max_waiting = 0
+        self._acquires = 0
+        self._waits = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+        self._timeouts = 0
+        self._created = 0
+        self._discarded = 0
+        self._health_failures = 0
+
+    def acquire(self, timeout: Optional[float] = None) -> PooledConnection:
+        timeout = self._timeout if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+        started = time.monotonic()
+        waited = False
+        with self._cond:
+            while True:
+                if self._closed:
+                    raise RuntimeError(f"pool {self.name} is closed")
+                if self._idle:
+                    slot = self._idle.pop()
+                    break
+                if self._size < self._max_size:
+                    self._size += 1
+                    slot = None
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._timeouts += 1
+                    raise PoolTimeout(
+                        f"pool {self.name}: no connection available after {timeout:.1f}s "
+                        f"({self._max_size} in use)"
+                    )
+                if not waited:
+                    waited = True
+                    self._waits += 1
+                self._waiting += 1
+                self._max_waiting = max(self._max_waiting, self._waiting)
+                try:
+                    self._cond.wait(remaining)
+                finally:
+                    self._waiting -= 1
+            self._acquires += 1
+            if waited:
+                wait = time.monotonic() - started
+                self._total_wait += wait
+                self._max_wait = max(self._max_wait, wait)
+
+        # Connect / health-check outside the lock.
+        try:
+            if slot is None:
+                raw = self._connect()
+            else:
+                raw = self._checked(slot)
+        except Exception:
+            with self._cond:
+                self._size -= 1
+                self._cond.notify()
+            raise
+        return PooledConnection(self, raw)
+
+    def _connect(self):
+        raw = self._factory()
+        with self._cond:
+            self._created += 1
+        return raw
+
+    def _checked(self, slot: _Slot):
+        if self._health_check is None:
+            return slot.raw
+        if time.monotonic() - slot.idle_since < self._health_check_after:
+            return slot.raw
+        try:
+            self._health_check(slot.raw)
+            return slot.raw
+        except Exception as exc:
+            logger.warning("pool %s: discarding unhealthy connection (%s)", self.name, exc)
+            with self._cond:
+                self._health_failures += 1
+                self._discarded += 1
+            _quiet_close(slot.raw)
+            return self._connect()
+
+    def _release(self, raw, broken: bool = False):
+        if not broken and self._reset is not None:
+            try:
+                self._reset(raw)
+            except Exception as exc:
+                logger.warning("pool %s: reset failed, discarding connection (%s)", self.name, exc)
+                broken = True
+        with self._cond:
+            if broken or self._closed:
+                self._size -= 1
+                self._discarded += 1
+                _quiet_close(raw)
+            else:
+                self._idle.append(_Slot(raw))
+            self._cond.notify()
+
+    def close_all(self):
+        with self._cond:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._size -= len(idle)
+            self._cond.notify_all()
+        for slot in idle:
+            _quiet_close(slot.raw)
+
+    def stats(self) -> dict:
+        with self._cond:
+            return {
+                "name": self.name,
+                "max_size": self._max_size,
+                "size": self._size,
+                "idle": len(self._idle),
+                "in_use": self._size - len(self._idle),
+                "waiting": self._waiting,
+                "max_waiting": self._max_waiting,
+                "acquires": self._acquires,
+                "waits": self._waits,
+                "avg_wait_ms": round(1000 * self._total_wait / self._waits, 3) if self._waits else 0.0,
+                "max_wait_ms": round(1000 * self._max_wait, 3),
+                "timeouts": self._timeouts,
+                "created": self._created,
+                "discarded": self._discarded,
+                "health_check_failures": self._health_failures,
+            }
+
+
+def _quiet_close(raw):
+    try:
+        raw.close()
+    except Exception:
+        pass
+
+
+class AsyncConnectionPool:
+    """
+    asyncio counterpart of ConnectionPool for native async drivers
+    (aiosqlite, aiomysql). `connect`, `reset` and `health_check` are
+    coroutine functions. Waiters are plain futures created on the caller's
+    running loop, so the pool is not tied to one event loop.
+    """
+
+    def __init__(
+        self,
+        connect: Callable[[], Any],
+        max_size: int = 8,
+        timeout: float = 10.0,
+        health_check: Optional[Callable[[Any], Any]] = None,
+        health_check_after: float = 30.0,
+        reset: Optional[Callable[[Any], Any]] = None,
+        name: str = "db-async",
+    ):
+        if max_size < 1:
+            raise ValueError("max_size must be >= 1")
+        self.name = name
+        self._connect = connect
+        self._max_size = max_size
+        self._timeout = timeout
+        self._health_check = health_check
+        self._health_check_after = health_check_after
+        self._reset = reset
+        self._idle: List[_Slot] = []
+        self._size = 0
+        self._waiters: "collections.deque" = collections.deque()
+        self._acquires = 0
+        self._waits = 0
+        self._max_waiting = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+        self._timeouts = 0
+        self._created = 0
+        self._discarded = 0
+        self._health_failures = 0
+
+    async def acquire(self, timeout: Optional[float] = None):
+        timeout = self._timeout if timeout is None else timeout
+        self._acquires += 1
+        if self._idle:
+            return await self._checked(self._idle.pop())
+        if self._size < self._max_size:
+            self._size += 1
+            try:
+                return await self._new_connection()
+            except BaseException:
+                self._size -= 1
+                raise
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        self._waits += 1
+        self._max_waiting = max(self._max_waiting, len(self._waiters))
+        started = time.monotonic()
+        try:
+            slot = await asyncio.wait_for(waiter, timeout)
+        except asyncio.TimeoutError:
+            self._timeouts += 1
+            raise PoolTimeout(
+                f"pool {self.name}: no connection available after {timeout:.1f}s "
+                f"({self._max_size} in use)"
+            ) from None
+        finally:
+            if waiter in self._waiters:
+                self._waiters.remove(waiter)
+        wait = time.monotonic() - started
+        self._total_wait += wait
+        self._max_wait = max(self._max_wait, wait)
+        return await self._checked(slot)
+
+    async def _new_connection(self):
+        raw = await self._connect()
+        self._created += 1
+        return raw
+
+    async def _checked(self, slot: _Slot):
+        if self._health_check is None or time.monotonic() - slot.idle_since < self._health_check_after:
+            return slot.raw
+        try:
+            await self._health_check(slot.raw)
+            return slot.raw
+        except Exception as exc:
+            logger.warning("pool %s: discarding unhealthy connection (%s)", self.name, exc)
+            self._health_failures += 1
+            self._discarded += 1
+            await _quiet_aclose(slot.raw)
+            try:
+                return await self._new_connection()
+            except BaseException:
+                self._size -= 1
+                self._wake_next()
+                raise
+
+    async def release(self, raw, broken: bool = False):
+        if not broken and self._reset is not None:
+            try:
+                await self._reset(raw)
+            except Exception as exc:
+                logger.warning("pool %s: reset failed, discarding connection (%s)", self.name, exc)
+                broken = True
+        if broken:
+            self._size -= 1
+            self._discarded += 1
+            await _quiet_aclose(raw)
+            self._wake_next()
+            return
+        slot = _Slot(raw)
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(slot)
+                return
+        self._idle.append(slot)
+
+    def _wake_next(self):
+        # A slot was freed without a connection to hand over: let the next
+        # waiter open a fresh one.
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                self._size += 1
+                waiter.get_loop().create_task(self._hand_over_new(waiter))
+                return
+
+    async def _hand_over_new(self, waiter):
+        try:
+            raw = await self._new_connection()
+        except Exception as exc:
+            self._size -= 1
+            if not waiter.done():
+                waiter.set_exception(exc)
+            return
+        if waiter.done():
+            await self.release(raw)
+        else:
+            waiter.set_result(_Slot(raw))
+
+    @contextlib.asynccontextmanager
+    async def connection(self):
+        raw = await self.acquire()
+        try:
+            yield raw
+        finally:
+            await self.release(raw)
+
+    async def close_all(self):
+        idle, self._idle = self._idle, []
+        self._size -= len(idle)
+        for slot in idle:
+            await _quiet_aclose(slot.raw)
+
+    def stats(self) -> dict:
+        return {
+            "name": self.name,
+            "max_size": self._max_size,
+            "size": self._size,
+            "idle": len(self._idle),
+            "in_use": self._size - len(self._idle),
+            "waiting": len(self._waiters),
+            "max_waiting": self._max_waiting,
+            "acquires": self._acquires,
+            "waits": self._waits,
+            "avg_wait_ms": round(1000 * self._total_wait / self._waits, 3) if self._waits else 0.0,
+            "max_wait_ms": round(1000 * self._max_wait, 3),
+            "timeouts": self._timeouts,
+            "created": self._created,
+            "discarded": self._discarded,
+            "health_check_failures": self._health_failures,
+        }
+
+
+async def _quiet_aclose(raw):
+    try:
+        result = raw.close()
+        if asyncio.iscoroutine(result):
+            await result
+    except Exception:
+        pass
@@ -1,10 +1,24 @@
 # services/api/app/db/repositories.py
-from datetime import datetime
+import json
+import uuid
+from datetime import datetime, timedelta
 
-from services.api.app.config import DB_DIALECT
+from services.api.app.config import (
+    CALENDAR_INDEX_TTL_SECONDS,
+    DB_DIALECT,
+    JOB_LEASE_SECONDS,
+    JOB_MAX_ATTEMPTS,
+    ROSTER_CACHE_MAX_BUCKETS,
+    ROSTER_CACHE_MAX_ROWS,
+    ROSTER_CACHE_TTL_SECONDS,
+)
+from services.api.app.db.calendar_index import CalendarIndex
 from services.api.app.db.mysql import get_connection
+from services.api.app.db.roster_cache import RosterCache
 
 PLACEHOLDER = "%s" if DB_DIALECT == "mysql" else "?"
+# Keep IN (...) lists well below SQLite's bound-parameter limit.
+IN_CLAUSE_CHUNK = 500
 
 
 def _adapt_sql(sql: str) -> str:
@@ -38,6 +52,77 @@ def _row_to_dict(row):
     return dict(row)
 
 
+def _chunks(values, size=IN_CLAUSE_CHUNK):
+    values = list(values)
+    for start in range(0, len(values), size):
+        yield values[start : start + size]
+
+
+class UnitOfWork:
+    """
+    Groups repository writes into one transaction on one pooled connection.
+
+        with UnitOfWork() as uow:
+            WorkRequestsRepo.assign_work(work_id, resource_id, uow=uow)
+            ResourcesRepo.increment_cases_handled(resource_id, uow=uow)
+
+    Commits on a clean exit and rolls back if the block raises. Callbacks
+    registered with after_commit() (in-memory cache/index updates) run only
+    once the commit has succeeded.
+    """
+
+    def __init__(self):
+        self.conn = None
+        self._after_commit = []
+
+    def __enter__(self):
+        self.conn = get_connection()
+        return self
+
+    def cursor(self, dictionary: bool = False):
+        if self.conn is None:
+            raise RuntimeError("UnitOfWork used outside of its 'with' block")
+        return _cursor(self.conn, dictionary=dictionary)
+
+    def after_commit(self, callback, *args):
+        self._after_commit.append((callback, args))
+
+    def __exit__(self, exc_type, exc, tb):
+        conn, self.conn = self.conn, None
+        try:
+            if exc_type is None:
+                conn.commit()
+            else:
+                conn.rollback()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+        if exc_type is None:
+            hooks, self._after_commit = self._after_commit, []
+            for callback, args in hooks:
+                callback(*args)
+        return False
+
+
+def _execute_write(sql, params, uow=None, after_commit=None, *args):
+    """
+    Run one write statement inside `uow`, or in its own transaction when no
+    unit of work is given. Returns the affected row count.
+    """
+    if uow is None:
+        with UnitOfWork() as own:
+            return _execute_write(sql, params, own, after_commit, *args)
+    cur = uow.cursor()
+    cur.execute(sql, params)
+    rowcount = cur.rowcount
+    cur.close()
+    if after_commit is not None:
+        uow.after_commit(after_commit, *args)
+    return rowcount
+
+
 def _as_db_datetime(value):
     if isinstance(value, datetime):
         return value.strftime("%Y-%m-%d %H:%M:%S")
@@ -94,19 +179,30 @@ class ResourcesRepo:
         return rows
 
     @staticmethod
-    def increment_cases_handled(resource_id, delta=1):
-        conn = get_connection()
-        cur = _cursor(conn)
+    def increment_cases_handled(resource_id, delta=1, uow=None):
         sql = _adapt_sql(
             "UPDATE resources SET total_cases_handled = COALESCE(total_cases_handled,0) + %s WHERE resource_id=%s"
         )
-        cur.execute(
-            sql,
-            (delta, resource_id),
-        )
-        conn.commit()
-        cur.close()
-        conn.close()
+        _execute_write(sql, (delta, resource_id), uow, _apply_cases_delta, resource_id, delta)
+
+    @staticmethod
+    def roster_cache():
+        return _roster_cache
+
+
+def _apply_cases_delta(resource_id, delta):
+    _roster_cache.apply_cases_delta(resource_id, delta)
+    _calendar_index.apply_cases_delta(resource_id, delta)
+
+
+_roster_cache = RosterCache(
+    load_by_specialty=ResourcesRepo.get_by_specialty,
+    load_by_ids=ResourcesRepo.get_by_ids,
+    load_all=ResourcesRepo.list_resources,
+    ttl_seconds=ROSTER_CACHE_TTL_SECONDS,
+    max_buckets=ROSTER_CACHE_MAX_BUCKETS,
+    max_rows=ROSTER_CACHE_MAX_ROWS,
+)
 
 
 class ResourceCalendarRepo:
@@ -133,19 +229,37 @@ class ResourceCalendarRepo:
         return mapping
 
     @staticmethod
-    def increment_workload(calendar_id, delta=1):
+    def get_calendars_on_date(date_str):
+        """
+        Return every calendar entry for a date grouped by resource_id, ordered
+        by available_from (same shape as get_calendars_for_resources_on_date).
+        """
         conn = get_connection()
-        cur = _cursor(conn)
+        cur = _cursor(conn, dictionary=True)
         sql = _adapt_sql(
-            "UPDATE resource_calendar SET current_workload = COALESCE(current_workload,0) + %s WHERE calendar_id=%s"
-        )
-        cur.execute(
-            sql,
-            (delta, calendar_id),
+            """SELECT resource_id, calendar_id, date, available_from, available_to, current_workload
+               FROM resource_calendar
+               WHERE date=%s
+               ORDER BY available_from"""
         )
-        conn.commit()
+        cur.execute(sql, (date_str,))
+        rows = cur.fetchall()
+        rows = _rows_to_dicts(rows)
         cur.close()
         conn.close()
+        mapping = {}
+        for row in rows:
+            mapping.setdefault(row["resource_id"], []).append(row)
+        return mapping
+
+    @staticmethod
+    def increment_workload(calendar_id, delta=1, uow=None):
+        sql = _adapt_sql(
+            "UPDATE resource_calendar SET current_workload = COALESCE(current_workload,0) + %s WHERE calendar_id=%s"
+        )
+        _execute_write(
+            sql, (delta, calendar_id), uow, _calendar_index.apply_workload_delta, calendar_id, delta
+        )
 
     @staticmethod
     def get_on_duty(date_str):
@@ -170,6 +284,63 @@ class ResourceCalendarRepo:
         conn.close()
         return rows
 
+    @staticmethod
+    def on_duty_at(date_str, at_time=None):
+        """
+        Same rows as get_on_duty, served from the in-memory interval index and
+        optionally restricted to shifts covering `at_time`.
+        """
+        return _calendar_index.on_duty(date_str, at_time)
+
+    @staticmethod
+    def first_entries_covering(resource_ids, date_str, at_time):
+        """
+        For each resource, the earliest-starting calendar entry on `date_str`
+        whose window contains `at_time` (resources without one are omitted).
+        """
+        if not resource_ids:
+            return {}
+        entries = _calendar_index.first_covering(date_str, at_time, resource_ids)
+        workloads = ResourceCalendarRepo.get_workloads([e["calendar_id"] for e in entries.values()])
+        return _with_workloads(entries, workloads)
+
+    @staticmethod
+    def get_workloads(calendar_ids):
+        """current_workload by calendar_id, read from the DB (not the index)."""
+        if not calendar_ids:
+            return {}
+        conn = get_connection()
+        cur = _cursor(conn, dictionary=True)
+        sql = f"""SELECT calendar_id, current_workload
+                  FROM resource_calendar WHERE calendar_id IN ({_placeholders(len(calendar_ids))})"""
+        cur.execute(sql, list(calendar_ids))
+        rows = _rows_to_dicts(cur.fetchall())
+        cur.close()
+        conn.close()
+        return {row["calendar_id"]: row["current_workload"] for row in rows}
+
+    @staticmethod
+    def calendar_index():
+        return _calendar_index
+
+
+_calendar_index = CalendarIndex(
+    loader=ResourceCalendarRepo.get_on_duty, ttl_seconds=CALENDAR_INDEX_TTL_SECONDS
+)
+
+
+def _with_workloads(entries, workloads):
+    """
+    Put fresh current_workload values into `entries` (copies from the
+    index) and the index itself: other processes' assignments only reach
+    the index on its TTL reload, and scoring depends on the workload.
+    """
+    _calendar_index.set_workloads(workloads)
+    for entry in entries.values():
+        if entry["calendar_id"] in workloads:
+            entry["current_workload"] = workloads[entry["calendar_id"]]
+    return entries
+
 
 class SpecialtyMappingRepo:
     @staticmethod
@@ -186,32 +357,44 @@ class SpecialtyMappingRepo:
         conn.close()
         return row
 
+    @staticmethod
+    def list_mappings():
+        conn = get_connection()
+        cur = _cursor(conn, dictionary=True)
+        cur.execute(
+            "SELECT work_type, required_specialty, alternate_specialty FROM specialty_mapping"
+        )
+        rows = cur.fetchall()
+        rows = _rows_to_dicts(rows)
+        cur.close()
+        conn.close()
+        return rows
+
 
 class WorkRequestsRepo:
     @staticmethod
-    def create_work_request(record: dict):
-        conn = get_connection()
-        cur = _cursor(conn)
-        sql = _adapt_sql(
+    def create_work_request(record: dict, uow=None):
+        _execute_write(WorkRequestsRepo.insert_sql(), WorkRequestsRepo.insert_params(record), uow)
+
+    @staticmethod
+    def insert_sql():
+        return _adapt_sql(
             """INSERT INTO work_requests
                  (work_id, work_type, description, priority, scheduled_timestamp, status, assigned_to)
                  VALUES (%s,%s,%s,%s,%s,%s,%s)"""
         )
-        cur.execute(
-            sql,
-            (
-                record["work_id"],
-                record["work_type"],
-                record["description"],
-                record["priority"],
-                _as_db_datetime(record["scheduled_timestamp"]),
-                record.get("status", "pending"),
-                record.get("assigned_to"),
-            ),
+
+    @staticmethod
+    def insert_params(record):
+        return (
+            record["work_id"],
+            record["work_type"],
+            record["description"],
+            record["priority"],
+            _as_db_datetime(record["scheduled_timestamp"]),
+            record.get("status", "pending"),
+            record.get("assigned_to"),
         )
-        conn.commit()
-        cur.close()
-        conn.close()
 
     @staticmethod
     def get_work_by_id(work_id):
@@ -230,19 +413,57 @@ class WorkRequestsRepo:
         return row
 
     @staticmethod
-    def assign_work(work_id, resource_id):
+    def get_works_by_ids(work_ids):
+        """
+        Fetch several work requests with one connection. Returns a dict keyed
+        by work_id; unknown ids are simply absent.
+        """
+        if not work_ids:
+            return {}
         conn = get_connection()
-        cur = _cursor(conn)
+        cur = _cursor(conn, dictionary=True)
+        works = {}
+        for chunk in _chunks(dict.fromkeys(work_ids)):
+            sql = f"""SELECT work_id, work_type, description, priority,
+                             scheduled_timestamp, status, assigned_to
+                      FROM work_requests WHERE work_id IN ({_placeholders(len(chunk))})"""
+            cur.execute(sql, tuple(chunk))
+            for row in _rows_to_dicts(cur.fetchall()):
+                works[row["work_id"]] = row
+        cur.close()
+        conn.close()
+        return works
+
+    @staticmethod
+    def assign_work(work_id, resource_id, uow=None):
         sql = _adapt_sql(
             "UPDATE work_requests SET assigned_to=%s, status=%s WHERE work_id=%s"
         )
-        cur.execute(
-            sql,
-            (resource_id, "assigned", work_id),
+        _execute_write(sql, (resource_id, "assigned", work_id), uow)
+
+    @staticmethod
+    def list_pending_on_date(date_str):
+        """
+        Pending work requests scheduled on a given date (YYYY-MM-DD).
+        """
+        next_day = (datetime.strptime(date_str, "%Y-%m-%d") + timedelta(days=1)).strftime(
+            "%Y-%m-%d"
+        )
+        conn = get_connection()
+        cur = _cursor(conn, dictionary=True)
+        sql = _adapt_sql(
+            """SELECT work_id, work_type, description, priority,
+                      scheduled_timestamp, status, assigned_to
+               FROM work_requests
+               WHERE status=%s AND scheduled_timestamp >= %s AND scheduled_timestamp < %s
+               ORDER BY priority DESC, scheduled_timestamp, work_id"""
         )
-        conn.commit()
+        cur.execute(sql, ("pending", date_str, next_day))
+        rows = cur.fetchall()
+        rows = _rows_to_dicts(rows)
         cur.close()
         conn.close()
+        return rows
 
     @staticmethod
     def list_work_requests(limit=50, status=None):
@@ -264,3 +485,423 @@ class WorkRequestsRepo:
         cur.close()
         conn.close()
         return rows
+
+
+class AssignmentRepo:
+    @staticmethod
+    def commit_assignments(assignments, uow=None):
+        """
+        Persist many assignments in a single transaction (the caller's `uow`
+        if given). Each item needs work_id and resource_id; calendar_id is
+        optional.
+        """
+        if not assignments:
+            return
+        if uow is None:
+            with UnitOfWork() as own:
+                AssignmentRepo.commit_assignments(assignments, uow=own)
+            return
+
+        cur = uow.cursor()
+        for sql, params in assignment_statements(assignments):
+            cur.executemany(sql, params)
+        cur.close()
+        for callback, args in assignment_cache_updates(assignments):
+            uow.after_commit(callback, *args)
+
+
+def _assignment_deltas(assignments):
+    workload_deltas = {}
+    case_deltas = {}
+    for item in assignments:
+        if item.get("calendar_id"):
+            workload_deltas[item["calendar_id"]] = workload_deltas.get(item["calendar_id"], 0) + 1
+        case_deltas[item["resource_id"]] = case_deltas.get(item["resource_id"], 0) + 1
+    return workload_deltas, case_deltas
+
+
+def assignment_statements(assignments):
+    """
+    (sql, params_seq) pairs persisting a set of assignments. Workload/case
+    counters are aggregated so each row is updated once.
+    """
+    workload_deltas, case_deltas = _assignment_deltas(assignments)
+    statements = [
+        (
+            _adapt_sql("UPDATE work_requests SET assigned_to=%s, status=%s WHERE work_id=%s"),
+            [(a["resource_id"], "assigned", a["work_id"]) for a in assignments],
+        )
+    ]
+    if workload_deltas:
+        statements.append(
+            (
+                _adapt_sql(
+                    "UPDATE resource_calendar SET current_workload = COALESCE(current_workload,0) + %s WHERE calendar_id=%s"
+                ),
+                [(delta, cid) for cid, delta in workload_deltas.items()],
+            )
+        )
+    statements.append(
+        (
+            _adapt_sql(
+                "UPDATE resources SET total_cases_handled = COALESCE(total_cases_handled,0) + %s WHERE resource_id=%s"
+            ),
+            [(delta, rid) for rid, delta in case_deltas.items()],
+        )
+    )
+    return statements
+
+
+def assignment_cache_updates(assignments):
+    """
+    In-memory write-through callbacks to run once the assignments committed.
+    """
+    workload_deltas, case_deltas = _assignment_deltas(assignments)
+    updates = [
+        (_calendar_index.apply_workload_delta, (cid, delta))
+        for cid, delta in workload_deltas.items()
+    ]
+    updates += [(_apply_cases_delta, (rid, delta)) for rid, delta in case_deltas.items()]
+    return updates
+
+
+JOB_COLUMNS = """job_id, work_id, priority, status, llm_provider, attempts, max_attempts,
+                 available_at, lease_owner, lease_expires_at, last_error, result,
+                 created_at, updated_at"""
+# A job can be claimed when it is queued and due, or when the worker holding
+# it let its lease run out (crashed / killed mid-job).
+_CLAIMABLE = """((status='queued' AND available_at <= %s)
+                 OR (status='running' AND lease_expires_at < %s))"""
+
+
+def _job_row(row):
+    job = _row_to_dict(row)
+    if job and job.get("result"):
+        job["result"] = json.loads(job["result"])
+    return job
+
+
+class AssignmentJobsRepo:
+    """
+    Durable queue of assignment jobs (table assignment_jobs).
+
+    Workers claim jobs by taking a lease; a job whose lease expires is
+    claimable again, so a crashed worker's job is retried. Claims are
+    ordered by the work request's priority (copied onto the job at enqueue
+    time) and then by due time.
+    """
+
+    @staticmethod
+    def new_job(work_id, priority, llm_provider="template", max_attempts=JOB_MAX_ATTEMPTS):
+        now = _as_db_datetime(datetime.now())
+        return {
+            "job_id": uuid.uuid4().hex,
+            "work_id": work_id,
+            "priority": int(priority),
+            "status": "queued",
+            "llm_provider": llm_provider,
+            "attempts": 0,
+            "max_attempts": int(max_attempts),
+            "available_at": now,
+            "created_at": now,
+        }
+
+    @staticmethod
+    def insert_sql():
+        return _adapt_sql(
+            """INSERT INTO assignment_jobs
+                 (job_id, work_id, priority, status, llm_provider, attempts, max_attempts,
+                  available_at, created_at, updated_at)
+                 VALUES (%s,%s,%s,%s,%s,%s,%s,%s,%s,%s)"""
+        )
+
+    @staticmethod
+    def insert_params(job):
+        return (
+            job["job_id"],
+            job["work_id"],
+            job["priority"],
+            job["status"],
+            job["llm_provider"],
+            job["attempts"],
+            job["max_attempts"],
+            job["available_at"],
+            job["created_at"],
+            job["created_at"],
+        )
+
+    @staticmethod
+    def enqueue(work_id, priority, llm_provider="template", max_attempts=JOB_MAX_ATTEMPTS, uow=None):
+        job = AssignmentJobsRepo.new_job(work_id, priority, llm_provider, max_attempts)
+        _execute_write(AssignmentJobsRepo.insert_sql(), AssignmentJobsRepo.insert_params(job), uow)
+        return job
+
+    @staticmethod
+    def get(job_id):
+        conn = get_connection()
+        cur = _cursor(conn, dictionary=True)
+        cur.execute(
+            _adapt_sql(f"SELECT {JOB_COLUMNS} FROM assignment_jobs WHERE job_id=%s"), (job_id,)
+        )
+        row = cur.fetchone()
+        cur.close()
+        conn.close()
+        return _job_row(row)
+
+    @staticmethod
+    def active_for_work(work_id):
+        """
+        The newest queued/running job for a work request, if any.
+        """
+        conn = get_connection()
+        cur = _cursor(conn, dictionary=True)
+        cur.execute(
+            _adapt_sql(
+                f"""SELECT {JOB_COLUMNS} FROM assignment_jobs
+                    WHERE work_id=%s AND status IN ('queued', 'running')
+                    ORDER BY created_at DESC LIMIT 1"""
+            ),
+            (work_id,),
+        )
+        row = cur.fetchone()
+        cur.close()
+        conn.close()
+        return _job_row(row)
+
+    @staticmethod
+    def claim(worker_id, lease_seconds=JOB_LEASE_SECONDS, limit=1):
+        """
+        Lease up to `limit` due jobs to `worker_id`, highest priority first.
+        Each claim is a conditional UPDATE, so concurrent workers never get
+        the same job.
+        """
+        now = datetime.now()
+        now_s = _as_db_datetime(now)
+        lease_until = _as_db_datetime(now + timedelta(seconds=lease_seconds))
+        conn = get_connection()
+        cur = _cursor(conn, dictionary=True)
+        claimed = []
+        try:
+            # Jobs whose last allowed attempt lost its lease are given up on.
+            # (On SQLite this first write also takes the write lock, which
+            # serialises concurrent claimers.)
+            cur.execute(
+                _adapt_sql(
+                    """UPDATE assignment_jobs
+                       SET status='failed', lease_owner=NULL, lease_expires_at=NULL, updated_at=%s,
+                           last_error=COALESCE(last_error, 'lease expired')
+                       WHERE status='running' AND lease_expires_at < %s AND attempts >= max_attempts"""
+                ),
+                (now_s, now_s),
+            )
+            cur.execute(
+                _adapt_sql(
+                    f"""SELECT job_id FROM assignment_jobs
+                        WHERE {_CLAIMABLE} AND attempts < max_attempts
+                        ORDER BY priority DESC, available_at, created_at
+                        LIMIT %s"""
+                ),
+                (now_s, now_s, int(limit) * 4),
+            )
+            candidates = [row["job_id"] for row in _rows_to_dicts(cur.fetchall())]
+            for job_id in candidates:
+                cur.execute(
+                    _adapt_sql(
+                        f"""UPDATE assignment_jobs
+                            SET status='running', lease_owner=%s, lease_expires_at=%s,
+                                attempts=attempts+1, updated_at=%s
+                            WHERE job_id=%s AND {_CLAIMABLE}"""
+                    ),
+                    (worker_id, lease_until, now_s, job_id, now_s, now_s),
+                )
+                if cur.rowcount == 1:
+                    claimed.append(job_id)
+                    if len(claimed) >= limit:
+                        break
+            conn.commit()
+            if not claimed:
+                return []
+            cur.execute(
+                f"SELECT {JOB_COLUMNS} FROM assignment_jobs WHERE job_id IN ({_placeholders(len(claimed))})",
+                tuple(claimed),
+            )
+            rows = {row["job_id"]: _job_row(row) for row in _rows_to_dicts(cur.fetchall())}
+            return [rows[job_id] for job_id in claimed]
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            cur.close()
+            conn.close()
+
+    @staticmethod
+    def extend_lease(job_id, worker_id, lease_seconds=JOB_LEASE_SECONDS):
+        now = datetime.now()
+        return _execute_write(
+            _adapt_sql(
+                """UPDATE assignment_jobs SET lease_expires_at=%s, updated_at=%s
+                   WHERE job_id=%s AND lease_owner=%s AND status='running'"""
+            ),
+            (
+                _as_db_datetime(now + timedelta(seconds=lease_seconds)),
+                _as_db_datetime(now),
+                job_id,
+                worker_id,
+            ),
+        ) == 1
+
+    @staticmethod
+    def complete(job_id, worker_id, result=None):
+        """
+        Mark a leased job done. Returns False if the lease was lost meanwhile.
+        """
+        return _execute_write(
+            _adapt_sql(
+                """UPDATE assignment_jobs
+                   SET status='done', result=%s, last_error=NULL, lease_owner=NULL,
+                       lease_expires_at=NULL, updated_at=%s
+                   WHERE job_id=%s AND lease_owner=%s AND status='running'"""
+            ),
+            (
+                json.dumps(result, default=str) if result is not None else None,
+                _as_db_datetime(datetime.now()),
+                job_id,
+                worker_id,
+            ),
+        ) == 1
+
+    @staticmethod
+    def fail(job_id, worker_id, error, retry_in_seconds=None):
+        """
+        Record a failed attempt: requeue after `retry_in_seconds`, or mark the
+        job failed for good when it is None.
+        """
+        now = datetime.now()
+        if retry_in_seconds is None:
+            status, available_at = "failed", now
+        else:
+            status, available_at = "queued", now + timedelta(seconds=retry_in_seconds)
+        return _execute_write(
+            _adapt_sql(
+                """UPDATE assignment_jobs
+                   SET status=%s, available_at=%s, last_error=%s, lease_owner=NULL,
+                       lease_expires_at=NULL, updated_at=%s
+                   WHERE job_id=%s AND lease_owner=%s AND status='running'"""
+            ),
+            (
+                status,
+                _as_db_datetime(available_at),
+                str(error)[:2000],
+                _as_db_datetime(now),
+                job_id,
+                worker_id,
+            ),
+        ) == 1
+
+    @staticmethod
+    def counts_by_status():
+        conn = get_connection()
+        cur = _cursor(conn, dictionary=True)
+        cur.execute("SELECT status, COUNT(*) AS jobs FROM assignment_jobs GROUP BY status")
+        rows = _rows_to_dicts(cur.fetchall())
+        cur.close()
+        conn.close()
+        return {row["status"]: row["jobs"] for row in rows}
+
+
+EXPLANATION_COLUMNS = """work_id, resource_id, provider, status, llm_input, explanation, error,
+                         requested_at, completed_at"""
+
+
+def _explanation_row(row):
+    row = _row_to_dict(row)
+    if row and row.get("llm_input"):
+        row["llm_input"] = json.loads(row["llm_input"])
+    return row
+
+
+class ExplanationsRepo:
+    """
+    Assignment explanations generated off the request path (one row per
+    work request; re-assigning a work item replaces it).
+    """
+
+    @staticmethod
+    def pending_sql():
+        return _adapt_sql(
+            """REPLACE INTO assignment_explanations
+                 (work_id, resource_id, provider, status, llm_input, explanation, error,
+                  requested_at, completed_at)
+                 VALUES (%s,%s,%s,'pending',%s,NULL,NULL,%s,NULL)"""
+        )
+
+    @staticmethod
+    def pending_params(work_id, resource_id, provider, llm_input):
+        return (
+            work_id,
+            resource_id,
+            provider,
+            json.dumps(llm_input, default=str),
+            _as_db_datetime(datetime.now()),
+        )
+
+    @staticmethod
+    def create_pending(work_id, resource_id, provider, llm_input, uow=None):
+        _execute_write(
+            ExplanationsRepo.pending_sql(),
+            ExplanationsRepo.pending_params(work_id, resource_id, provider, llm_input),
+            uow,
+        )
+
+    @staticmethod
+    def store(work_id, explanation):
+        _execute_write(
+            _adapt_sql(
+                """UPDATE assignment_explanations
+                   SET status='ready', explanation=%s, error=NULL, completed_at=%s
+                   WHERE work_id=%s"""
+            ),
+            (explanation, _as_db_datetime(datetime.now()), work_id),
+        )
+
+    @staticmethod
+    def mark_failed(work_id, error):
+        _execute_write(
+            _adapt_sql(
+                """UPDATE assignment_explanations
+                   SET status='failed', error=%s, completed_at=%s
+                   WHERE work_id=%s"""
+            ),
+            (str(error)[:2000], _as_db_datetime(datetime.now()), work_id),
+        )
+
+    @staticmethod
+    def get(work_id):
+        conn = get_connection()
+        cur = _cursor(conn, dictionary=True)
+        cur.execute(
+            _adapt_sql(
+                f"SELECT {EXPLANATION_COLUMNS} FROM assignment_explanations WHERE work_id=%s"
+            ),
+            (work_id,),
+        )
+        row = cur.fetchone()
+        cur.close()
+        conn.close()
+        return _explanation_row(row)
+
+    @staticmethod
+    def list_pending(limit=500):
+        conn = get_connection()
+        cur = _cursor(conn, dictionary=True)
+        cur.execute(
+            _adapt_sql(
+                f"""SELECT {EXPLANATION_COLUMNS} FROM assignment_explanations
+                    WHERE status='pending' ORDER BY requested_at LIMIT %s"""
+            ),
+            (int(limit),),
+        )
+        rows = cur.fetchall()
+        cur.close()
+        conn.close()
+        return [_explanation_row(r) for r in rows]
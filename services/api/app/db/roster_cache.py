@@ -0,0 +1,199 @@
+# services/api/app/db/roster_cache.py
+"""
+Write-through cache of resource (radiologist) profiles.
+
+Rows are cached per resource_id and grouped into per-specialty buckets (plus
+an "all resources" bucket for /resources). Both tiers are LRU-bounded and
+expire after `ttl_seconds`. The only frequently changing column,
+total_cases_handled, is updated in place by ResourcesRepo write paths so
+cached rows stay current without a reload. Callers always receive copies.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+ALL_RESOURCES = ("__all__",)
+
+
+class RosterCache:
+    def __init__(
+        self,
+        load_by_specialty: Callable[[List[str]], List[dict]],
+        load_by_ids: Callable[[List[str]], List[dict]],
+        load_all: Callable[[], List[dict]],
+        ttl_seconds: float = 300.0,
+        max_buckets: int = 128,
+        max_rows: int = 10000,
+    ):
+        self._load_by_specialty = load_by_specialty
+        self._load_by_ids = load_by_ids
+        self._load_all = load_all
+        self._ttl = ttl_seconds
+        self._max_buckets = max_buckets
+        self._max_rows = max_rows
+        self._rows: "OrderedDict[str, Tuple[float, dict]]" = OrderedDict()
+        self._buckets: "OrderedDict[tuple, Tuple[float, List[str]]]" = OrderedDict()
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    # -- internals -----------------------------------------------------------
+    def _fresh(self, loaded_at: float) -> bool:
+        return self._ttl <= 0 or time.monotonic() - loaded_at < self._ttl
+
+    def _row(self, resource_id: str) -> Optional[dict]:
+        cached = self._rows.get(resource_id)
+        if cached is None or not self._fresh(cached[0]):
+            return None
+        self._rows.move_to_end(resource_id)
+        return cached[1]
+
+    def _store_rows(self, rows: Iterable[dict]) -> List[str]:
+        now = time.monotonic()
+        ids = []
+        for row in rows:
+            row = dict(row)
+            self._rows[row["resource_id"]] = (now, row)
+            self._rows.move_to_end(row["resource_id"])
+            ids.append(row["resource_id"])
+        while len(self._rows) > self._max_rows:
+            self._rows.popitem(last=False)
+            self.evictions += 1
+        return ids
+
+    def _bucket(self, key: tuple) -> Optional[List[dict]]:
+        cached = self._buckets.get(key)
+        if cached is None or not self._fresh(cached[0]):
+            return None
+        rows = [self._row(rid) for rid in cached[1]]
+        if any(r is None for r in rows):
+            return None
+        self._buckets.move_to_end(key)
+        return rows
+
+    def _store_bucket(self, key: tuple, ids: List[str]):
+        self._buckets[key] = (time.monotonic(), ids)
+        self._buckets.move_to_end(key)
+        while len(self._buckets) > self._max_buckets:
+            self._buckets.popitem(last=False)
+            self.evictions += 1
+
+    @staticmethod
+    def _copies(rows: Iterable[dict]) -> List[dict]:
+        return sorted((dict(r) for r in rows), key=lambda r: r["resource_id"])
+
+    # -- reads ---------------------------------------------------------------
+    def get_by_specialty(self, specialties) -> List[dict]:
+        with self._lock:
+            rows, missing = self.peek_specialties(specialties)
+            if not missing:
+                return rows
+            loaded = self._load_by_specialty(missing)
+            self.fill_specialties(missing, loaded)
+            merged = {r["resource_id"]: r for r in rows}
+            merged.update((r["resource_id"], r) for r in loaded)
+            return self._copies(merged.values())
+
+    def peek_specialties(self, specialties) -> Tuple[List[dict], List[str]]:
+        """
+        Cached rows for `specialties` plus the specialties that still need
+        loading; used by callers that load misses themselves (async path).
+        """
+        wanted = list(dict.fromkeys(s for s in (specialties or []) if s))
+        found: Dict[str, dict] = {}
+        missing = []
+        with self._lock:
+            for specialty in wanted:
+                rows = self._bucket(("specialty", specialty))
+                if rows is None:
+                    missing.append(specialty)
+                    self.misses += 1
+                    continue
+                self.hits += 1
+                found.update((r["resource_id"], r) for r in rows)
+            return self._copies(found.values()), missing
+
+    def fill_specialties(self, specialties, rows: List[dict]):
+        with self._lock:
+            ids = self._store_rows(rows)
+            for specialty in specialties:
+                self._store_bucket(
+                    ("specialty", specialty),
+                    [rid for rid, row in zip(ids, rows) if row.get("specialty") == specialty],
+                )
+
+    def get_by_ids(self, ids_list) -> List[dict]:
+        if not ids_list:
+            return []
+        found: Dict[str, dict] = {}
+        with self._lock:
+            missing = []
+            for rid in dict.fromkeys(ids_list):
+                row = self._row(rid)
+                if row is None:
+                    missing.append(rid)
+                    self.misses += 1
+                else:
+                    self.hits += 1
+                    found[rid] = row
+            if missing:
+                loaded = self._load_by_ids(missing)
+                self._store_rows(loaded)
+                found.update((row["resource_id"], row) for row in loaded)
+            return self._copies(found.values())
+
+    def list_resources(self) -> List[dict]:
+        with self._lock:
+            rows = self.peek_all()
+            if rows is None:
+                rows = self._load_all()
+                self.fill_all(rows)
+                rows = self._copies(rows)
+            return rows
+
+    def peek_all(self) -> Optional[List[dict]]:
+        with self._lock:
+            rows = self._bucket(ALL_RESOURCES)
+            if rows is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            return self._copies(rows)
+
+    def fill_all(self, rows: List[dict]):
+        with self._lock:
+            self._store_bucket(ALL_RESOURCES, self._store_rows(rows))
+
+    # -- write-through / maintenance ------------------------------------------
+    def apply_cases_delta(self, resource_id: str, delta: int = 1):
+        with self._lock:
+            cached = self._rows.get(resource_id)
+            if cached is not None:
+                row = cached[1]
+                row["total_cases_handled"] = (row.get("total_cases_handled") or 0) + delta
+
+    def invalidate(self, resource_id: Optional[str] = None):
+        with self._lock:
+            if resource_id is None:
+                self._rows.clear()
+                self._buckets.clear()
+            else:
+                self._rows.pop(resource_id, None)
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else None,
+                "evictions": self.evictions,
+                "rows": len(self._rows),
+                "buckets": len(self._buckets),
+                "ttl_seconds": self._ttl,
+            }
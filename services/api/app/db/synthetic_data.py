@@ -0,0 +1,335 @@
+# services/api/app/db/synthetic_data.py
+"""
+Seeded, reproducible generator for the infra/mysql_init CSV fixtures at any
+scale.
+
+Usage:
+    python -m services.api.app.db.synthetic_data --out /tmp/bigdata \
+        --resources 10000 --days 90 --work-requests 1000000 --seed 7 \
+        [--sqlite /tmp/bigdata/work_allocation.db]
+
+Writes resources.csv, resource_calendar.csv, specialty_mapping.csv and
+work_requests.csv with the same columns as the checked-in fixtures. Rows are
+streamed straight to disk, so memory stays constant in the number of
+calendar rows and work requests (only per-specialty resource ids are kept).
+With --sqlite the files are loaded into a fresh SQLite database through the
+regular bootstrap loader.
+
+Distributions are configurable as "key=weight,..." lists:
+    --specialty-weights   specialty mix of the radiologists
+    --work-type-weights   work type mix of the requests
+    --priority-weights    priority (1-5) mix of the requests
+    --shift-weights       shift templates ("HH:MM-HH:MM") worked on a day
+    --shift-probability   chance a radiologist works on a given day
+"""
+
+from __future__ import annotations
+
+import argparse
+import bisect
+import csv
+import itertools
+import logging
+import random
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+SPECIALTY_MAPPING = {
+    "CT_Scan_Brain": ("Neurologist", "General_Radiologist"),
+    "CT_Scan_Chest": ("General_Radiologist", None),
+    "MRI_Brain": ("Neurologist", "General_Radiologist"),
+    "MRI_Cardiac": ("Cardiologist", "General_Radiologist"),
+    "X_Ray_Chest": ("General_Radiologist", None),
+    "X_Ray_Bone": ("Musculoskeletal_Specialist", "General_Radiologist"),
+    "Ultrasound_Abdomen": ("General_Radiologist", None),
+    "Mammography": ("Breast_Imaging_Specialist", "General_Radiologist"),
+}
+
+DESCRIPTIONS = {
+    "CT_Scan_Brain": ["Head trauma assessment", "Post-surgery follow-up", "Headache workup"],
+    "CT_Scan_Chest": ["Lung nodule", "Cancer staging", "COVID complications"],
+    "MRI_Brain": ["Acute stroke evaluation", "Neurological symptoms", "Stroke protocol"],
+    "MRI_Cardiac": ["Post-heart attack", "Cardiomyopathy assessment"],
+    "X_Ray_Chest": ["Annual checkup", "Cough and fever", "Follow-up pneumonia"],
+    "X_Ray_Bone": ["Arthritis follow-up", "Joint pain evaluation", "Suspected fracture"],
+    "Ultrasound_Abdomen": ["Kidney stone suspected", "Right upper quadrant pain"],
+    "Mammography": ["Annual screening", "Follow-up abnormal mammogram"],
+}
+PRIORITY_SUFFIX = {4: " - URGENT", 5: " - CRITICAL"}
+
+DEFAULT_SPECIALTY_WEIGHTS = {
+    "General_Radiologist": 4,
+    "Neurologist": 4,
+    "Cardiologist": 3,
+    "Musculoskeletal_Specialist": 2,
+    "Breast_Imaging_Specialist": 2,
+}
+DEFAULT_WORK_TYPE_WEIGHTS = {
+    "CT_Scan_Chest": 4,
+    "MRI_Brain": 4,
+    "X_Ray_Bone": 4,
+    "X_Ray_Chest": 3,
+    "Mammography": 3,
+    "CT_Scan_Brain": 2,
+    "MRI_Cardiac": 1,
+    "Ultrasound_Abdomen": 1,
+}
+DEFAULT_PRIORITY_WEIGHTS = {1: 2, 2: 6, 3: 7, 4: 4, 5: 2}
+DEFAULT_SHIFT_WEIGHTS = {
+    "09:00-17:00": 5,
+    "08:00-13:00": 2,
+    "13:00-19:00": 2,
+    "07:00-19:00": 1,
+    "19:00-23:59": 1,
+    "00:00-07:00": 1,
+}
+
+FIRST_NAMES = [
+    "John", "Emily", "Michael", "Sarah", "David", "Laura", "James", "Anna", "Robert",
+    "Maria", "William", "Linda", "Richard", "Susan", "Thomas", "Karen", "Daniel",
+    "Priya", "Wei", "Fatima", "Carlos", "Yuki", "Omar", "Elena",
+]
+LAST_NAMES = [
+    "Smith", "Brown", "Davis", "Wilson", "Taylor", "Anderson", "Thomas", "Moore",
+    "Martin", "Lee", "Walker", "Hall", "Young", "King", "Wright", "Lopez", "Hill",
+    "Patel", "Chen", "Khan", "Garcia", "Sato", "Haddad", "Petrova",
+]
+
+RESOURCE_COLUMNS = ["resource_id", "name", "specialty", "skill_level", "total_cases_handled"]
+CALENDAR_COLUMNS = [
+    "calendar_id", "resource_id", "date", "available_from", "available_to", "current_workload",
+]
+MAPPING_COLUMNS = ["work_type", "required_specialty", "alternate_specialty"]
+WORK_COLUMNS = [
+    "work_id", "work_type", "description", "priority", "scheduled_timestamp", "status",
+    "assigned_to",
+]
+
+
+class WeightedChoice:
+    """O(log n) weighted sampling from a fixed table."""
+
+    def __init__(self, weights: Dict):
+        items = [(k, float(w)) for k, w in weights.items() if float(w) > 0]
+        if not items:
+            raise ValueError("at least one positive weight is required")
+        self.keys = [k for k, _ in items]
+        self._cumulative = list(itertools.accumulate(w for _, w in items))
+
+    def __call__(self, rng: random.Random):
+        x = rng.random() * self._cumulative[-1]
+        return self.keys[bisect.bisect_right(self._cumulative, x)]
+
+
+def parse_weights(spec: Optional[str], default: Dict, key_type=str) -> Dict:
+    """Parse "a=3,b=1" into {"a": 3.0, "b": 1.0}; None keeps `default`."""
+    if not spec:
+        return dict(default)
+    weights = {}
+    for part in spec.split(","):
+        key, sep, weight = part.strip().rpartition("=")
+        if not sep or not key:
+            raise ValueError(f"expected key=weight, got {part!r}")
+        weights[key_type(key)] = float(weight)
+    return weights
+
+
+def _id(prefix: str, n: int, width: int) -> str:
+    return f"{prefix}{n:0{width}d}"
+
+
+def _width(count: int) -> int:
+    return max(3, len(str(count)))
+
+
+def _hms(value: str) -> str:
+    return value if value.count(":") == 2 else f"{value}:00"
+
+
+def _shift_times(template: str) -> Tuple[str, str]:
+    start, end = template.split("-")
+    return _hms(start), _hms(end)
+
+
+class DatasetGenerator:
+    def __init__(
+        self,
+        resources: int,
+        days: int,
+        work_requests: int,
+        start_date: date,
+        seed: int = 0,
+        specialty_weights: Optional[Dict] = None,
+        work_type_weights: Optional[Dict] = None,
+        priority_weights: Optional[Dict] = None,
+        shift_weights: Optional[Dict] = None,
+        shift_probability: float = 0.7,
+        pending_ratio: float = 0.8,
+    ):
+        self.resources = resources
+        self.days = days
+        self.work_requests = work_requests
+        self.start_date = start_date
+        self.seed = seed
+        self.specialty = WeightedChoice(specialty_weights or DEFAULT_SPECIALTY_WEIGHTS)
+        self.work_type = WeightedChoice(work_type_weights or DEFAULT_WORK_TYPE_WEIGHTS)
+        self.priority = WeightedChoice(priority_weights or DEFAULT_PRIORITY_WEIGHTS)
+        self.shift = WeightedChoice(shift_weights or DEFAULT_SHIFT_WEIGHTS)
+        self.shift_probability = shift_probability
+        self.pending_ratio = pending_ratio
+        self._resource_width = _width(resources)
+        self._by_specialty: Dict[str, List[int]] = {}
+
+    def _rng(self, stream: str) -> random.Random:
+        # one independent stream per file, so changing --work-requests does
+        # not change the resources or calendars generated for the same seed
+        return random.Random(f"{self.seed}:{stream}")
+
+    def resource_rows(self) -> Iterator[Sequence]:
+        rng = self._rng("resources")
+        self._by_specialty = {}
+        for n in range(1, self.resources + 1):
+            specialty = self.specialty(rng)
+            self._by_specialty.setdefault(specialty, []).append(n)
+            skill = rng.choices((1, 2, 3, 4, 5), weights=(1, 2, 4, 4, 2))[0]
+            yield (
+                _id("R", n, self._resource_width),
+                f"Dr. {rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+                specialty,
+                skill,
+                max(0, int(rng.gauss(60 * skill, 25))),
+            )
+
+    def calendar_rows(self) -> Iterator[Sequence]:
+        rng = self._rng("calendar")
+        width = _width(self.resources * self.days)
+        counter = itertools.count(1)
+        for day in range(self.days):
+            date_str = (self.start_date + timedelta(days=day)).isoformat()
+            for n in range(1, self.resources + 1):
+                if rng.random() >= self.shift_probability:
+                    continue
+                available_from, available_to = _shift_times(self.shift(rng))
+                yield (
+                    _id("C", next(counter), width),
+                    _id("R", n, self._resource_width),
+                    date_str,
+                    available_from,
+                    available_to,
+                    rng.randint(0, 10),
+                )
+
+    @staticmethod
+    def mapping_rows() -> Iterator[Sequence]:
+        for work_type, (required, alternate) in SPECIALTY_MAPPING.items():
+            yield work_type, required, alternate or ""
+
+    def work_rows(self) -> Iterator[Sequence]:
+        if not self._by_specialty:
+            # resources were not generated in this run; rebuild the id table
+            for _ in self.resource_rows():
+                pass
+        rng = self._rng("work")
+        width = _width(self.work_requests)
+        start = datetime.combine(self.start_date, datetime.min.time())
+        span_minutes = max(self.days, 1) * 24 * 60
+        for n in range(1, self.work_requests + 1):
+            work_type = self.work_type(rng)
+            priority = int(self.priority(rng))
+            description = rng.choice(DESCRIPTIONS.get(work_type, ["Routine study"]))
+            description += PRIORITY_SUFFIX.get(priority, "")
+            scheduled = start + timedelta(minutes=rng.randrange(span_minutes))
+            assigned_to = ""
+            status = "pending"
+            if rng.random() >= self.pending_ratio:
+                required, alternate = SPECIALTY_MAPPING.get(work_type, (None, None))
+                pool = self._by_specialty.get(required) or self._by_specialty.get(alternate)
+                if pool:
+                    status = "completed"
+                    assigned_to = _id("R", rng.choice(pool), self._resource_width)
+            yield (
+                _id("W", n, width),
+                work_type,
+                description,
+                priority,
+                scheduled.strftime("%Y-%m-%d %H:%M:%S"),
+                status,
+                assigned_to,
+            )
+
+    def write(self, out_dir: Path) -> Dict[str, int]:
+        out_dir = Path(out_dir)
+        out_dir.mkdir(parents=True, exist_ok=True)
+        counts = {}
+        for name, columns, rows in (
+            ("resources", RESOURCE_COLUMNS, self.resource_rows()),
+            ("resource_calendar", CALENDAR_COLUMNS, self.calendar_rows()),
+            ("specialty_mapping", MAPPING_COLUMNS, self.mapping_rows()),
+            ("work_requests", WORK_COLUMNS, self.work_rows()),
+        ):
+            counts[name] = _write_csv(out_dir / f"{name}.csv", columns, rows)
+            logger.info("Wrote %d rows to %s.csv", counts[name], name)
+        return counts
+
+
+def _write_csv(path: Path, columns: Sequence[str], rows: Iterator[Sequence]) -> int:
+    tmp = path.with_suffix(".csv.tmp")
+    count = 0
+    with open(tmp, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f, lineterminator="\n")
+        writer.writerow(columns)
+        for row in rows:
+            writer.writerow(row)
+            count += 1
+    tmp.replace(path)
+    return count
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate synthetic fixture CSVs.")
+    parser.add_argument("--out", required=True, help="Output directory for the CSV files")
+    parser.add_argument("--resources", type=int, default=1000)
+    parser.add_argument("--days", type=int, default=30)
+    parser.add_argument("--work-requests", type=int, default=100000)
+    parser.add_argument("--start-date", type=date.fromisoformat, default=date(2024, 11, 10))
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--specialty-weights")
+    parser.add_argument("--work-type-weights")
+    parser.add_argument("--priority-weights")
+    parser.add_argument("--shift-weights")
+    parser.add_argument("--shift-probability", type=float, default=0.7)
+    parser.add_argument("--pending-ratio", type=float, default=0.8)
+    parser.add_argument("--sqlite", help="Also load the CSVs into a new SQLite database here")
+    args = parser.parse_args(argv)
+
+    generator = DatasetGenerator(
+        resources=args.resources,
+        days=args.days,
+        work_requests=args.work_requests,
+        start_date=args.start_date,
+        seed=args.seed,
+        specialty_weights=parse_weights(args.specialty_weights, DEFAULT_SPECIALTY_WEIGHTS),
+        work_type_weights=parse_weights(args.work_type_weights, DEFAULT_WORK_TYPE_WEIGHTS),
+        priority_weights=parse_weights(args.priority_weights, DEFAULT_PRIORITY_WEIGHTS, int),
+        shift_weights=parse_weights(args.shift_weights, DEFAULT_SHIFT_WEIGHTS),
+        shift_probability=args.shift_probability,
+        pending_ratio=args.pending_ratio,
+    )
+    counts = generator.write(Path(args.out))
+    if args.sqlite:
+        from services.api.app.db.mysql import _bootstrap_sqlite_db
+
+        target = Path(args.sqlite)
+        if target.exists():
+            target.unlink()
+        _bootstrap_sqlite_db(target, csv_dir=Path(args.out))
+        logger.info("Loaded into %s", target)
+    return counts
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    main()
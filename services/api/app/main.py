@@ -1,20 +1,54 @@
 # services/api/app/main.py
+import logging
+from contextlib import asynccontextmanager
 from pathlib import Path
 
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Response
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import FileResponse
 from fastapi.staticfiles import StaticFiles
 
+from services.api.app.config import MODEL_WARMUP
+from services.api.app.db.async_repositories import close_async_pool
+from services.api.app.db.mysql import init_db
+from services.api.app.routes.admin_routes import router as admin_router
 from services.api.app.routes.resource_routes import router as resource_router
 from services.api.app.routes.work_routes import router as work_router
+from services.api.app.services.explanation_queue import explanation_queue
+from services.api.app.services.inference_server import shutdown_inference_server
+from services.api.app.services.model_registry import model_registry, start_warmup
+from services.api.app.services.specialty_routing import reload_routing_table
 
 APP_ROOT = Path(__file__).resolve().parent
 STATIC_DIR = APP_ROOT / "static"
+logger = logging.getLogger(__name__)
+
+
+@asynccontextmanager
+async def lifespan(_app: FastAPI):
+    try:
+        init_db()
+        reload_routing_table()
+    except Exception as exc:
+        # Analysis loads the table lazily if the DB is not reachable yet.
+        logger.warning("Database / routing table not ready at startup: %s", exc)
+    try:
+        explanation_queue().resume_pending()
+    except Exception as exc:
+        logger.warning("Pending explanations not resumed: %s", exc)
+    # Loads in the background; /healthz stays 503 until the models are ready.
+    start_warmup(MODEL_WARMUP)
+    yield
+    # Unfinished explanations stay pending and are resumed on next start.
+    explanation_queue().shutdown(wait=False)
+    shutdown_inference_server()
+    await close_async_pool()
+
 
 app = FastAPI(
     title="Work Allocation API",
     description="Agentic pipeline for radiology work assignment with UI helpers.",
+    lifespan=lifespan,
 )
 
 app.add_middleware(
@@ -27,6 +61,7 @@ app.add_middleware(
 # Routers
 app.include_router(work_router)
 app.include_router(resource_router)
+app.include_router(admin_router)
 
 # Static assets
 if STATIC_DIR.exists():
@@ -47,5 +82,9 @@ def serve_ui():
 
 
 @app.get("/healthz")
-def healthcheck():
-    return {"status": "ok"}
+def healthcheck(response: Response):
+    models = model_registry().status()
+    if not models["ready"]:
+        response.status_code = 503
+        return {"status": "warming_up", "models": models}
+    return {"status": "ok", "models": models}
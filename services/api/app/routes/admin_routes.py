@@ -0,0 +1,52 @@
+from fastapi import APIRouter
+
+from services.api.app.db.async_repositories import async_pool_stats
+from services.api.app.db.mysql import pool_stats
+from services.api.app.db.repositories import ResourcesRepo
+from services.api.app.services.explanation_cache import explanation_cache
+from services.api.app.services.explanation_queue import explanation_queue
+from services.api.app.services.inference_server import inference_server
+from services.api.app.services.query_cache import query_cache
+from services.api.app.services.specialty_routing import (
+    reload_routing_table,
+    routing_table_info,
+)
+
+router = APIRouter(prefix="/admin", tags=["admin"])
+
+
+@router.get("/routing")
+def routing_table():
+    return {"status": "ok", "routing": routing_table_info()}
+
+
+@router.post("/routing/reload")
+def reload_routing():
+    """Rebuild the in-memory specialty routing table after mapping edits."""
+    return {"status": "ok", "routing": reload_routing_table()}
+
+
+@router.get("/cache")
+def cache_stats():
+    return {
+        "status": "ok",
+        "roster": ResourcesRepo.roster_cache().stats(),
+        "explanations": explanation_cache().stats(),
+        "queries": query_cache().stats(),
+    }
+
+
+@router.get("/db")
+def db_pool_stats():
+    return {"status": "ok", "pool": pool_stats(), "async_pool": async_pool_stats()}
+
+
+@router.get("/explanations")
+def explanation_queue_stats():
+    return {"status": "ok", "explanations": explanation_queue().stats()}
+
+
+@router.get("/inference")
+def inference_stats():
+    """Micro-batching stats of the HF inference process (LLM_INFERENCE_SERVER=1)."""
+    return {"status": "ok", "inference": inference_server().stats()}
@@ -1,14 +1,15 @@
+import json
 from datetime import date, time as time_type
-from typing import Optional
+from typing import List, Optional
 
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, HTTPException, Query, Request, Response
 from pydantic import BaseModel
 
-from services.api.app.controllers.assignment_controller import AssignmentController
-from services.api.app.db.repositories import WorkRequestsRepo
+from services.api.app.config import WORK_INTAKE_CHUNK_SIZE
+from services.api.app.controllers.async_assignment_controller import AsyncAssignmentController
 
 router = APIRouter(tags=["work-management"])
-controller = AssignmentController()
+controller = AsyncAssignmentController()
 
 
 class AddWorkRequest(BaseModel):
@@ -20,46 +21,201 @@ class AddWorkRequest(BaseModel):
 
 
 @router.post("/add_work")
-def add_work(req: AddWorkRequest):
-    result = controller.add_work(req.dict())
+async def add_work(req: AddWorkRequest):
+    result = await controller.add_work(req.dict())
     return {"status": "ok", "result": result}
 
 
+NDJSON_MEDIA_TYPES = {"application/x-ndjson", "application/ndjson", "application/jsonl"}
+
+
+async def _ndjson_items(request: Request):
+    """Parsed lines of a streamed NDJSON body (a ValueError for a bad line)."""
+    buffer = b""
+    async for chunk in request.stream():
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            if line.strip():
+                yield _parse_line(line)
+    if buffer.strip():
+        yield _parse_line(buffer)
+
+
+def _parse_line(line: bytes):
+    try:
+        return json.loads(line)
+    except ValueError as exc:
+        return ValueError(f"invalid JSON: {exc}")
+
+
+async def _batch_items(request: Request):
+    media_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
+    if media_type in NDJSON_MEDIA_TYPES:
+        async for item in _ndjson_items(request):
+            yield item
+        return
+    try:
+        body = await request.json()
+    except ValueError:
+        raise HTTPException(status_code=400, detail="body must be a JSON array or NDJSON")
+    if not isinstance(body, list):
+        raise HTTPException(status_code=400, detail="body must be a JSON array or NDJSON")
+    for item in body:
+        yield item
+
+
+def _validate(item) -> dict:
+    if isinstance(item, Exception):
+        raise item
+    if not isinstance(item, dict):
+        raise ValueError("expected a JSON object")
+    return AddWorkRequest(**item).dict()
+
+
+@router.post("/add_work/batch")
+async def add_work_batch(request: Request):
+    """
+    Add many work requests from a JSON array or an NDJSON stream
+    (Content-Type: application/x-ndjson, read incrementally). Each row is
+    validated like /add_work; valid rows are inserted in transactions of
+    WORK_INTAKE_CHUNK_SIZE rows, invalid ones are reported by index.
+    """
+    work_ids, errors, chunk = [], [], []
+
+    async def flush():
+        try:
+            work_ids.extend(await controller.add_work_many([payload for _, payload in chunk]))
+        except Exception as exc:
+            errors.extend({"index": index, "error": str(exc)} for index, _ in chunk)
+        chunk.clear()
+
+    index = -1
+    async for item in _batch_items(request):
+        index += 1
+        try:
+            chunk.append((index, _validate(item)))
+        except ValueError as exc:
+            errors.append({"index": index, "error": str(exc)})
+            continue
+        if len(chunk) >= WORK_INTAKE_CHUNK_SIZE:
+            await flush()
+    if chunk:
+        await flush()
+    return {
+        "status": "ok",
+        "received": index + 1,
+        "accepted": len(work_ids),
+        "rejected": len(errors),
+        "work_ids": work_ids,
+        "errors": sorted(errors, key=lambda e: e["index"]),
+    }
+
+
+class AssignBatchRequest(BaseModel):
+    work_ids: List[str]
+
+
+@router.post("/assign/batch")
+async def assign_batch(
+    req: AssignBatchRequest,
+    use_background_llm: bool = Query(
+        default=True,
+        description="If true, use lightweight template provider; false attempts HF provider.",
+    ),
+):
+    if not req.work_ids:
+        raise HTTPException(status_code=400, detail="work_ids must not be empty")
+    try:
+        llm_provider = "template" if use_background_llm else "hf"
+        result = await controller.assign_many(req.work_ids, llm_provider=llm_provider)
+        return {"status": "ok", **result}
+    except Exception as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
+
+@router.post("/assign/optimize")
+async def optimize_shift(
+    target_date: date = Query(..., description="Shift date to allocate (YYYY-MM-DD)"),
+    dry_run: bool = Query(default=False, description="Compute the allocation without saving it."),
+    use_background_llm: bool = Query(
+        default=True,
+        description="If true, use lightweight template provider; false attempts HF provider.",
+    ),
+):
+    try:
+        llm_provider = "template" if use_background_llm else "hf"
+        result = await controller.optimize_shift(
+            target_date.isoformat(), dry_run=dry_run, llm_provider=llm_provider
+        )
+        return {"status": "ok", **result}
+    except Exception as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
+
 @router.post("/assign/{work_id}")
-def assign_work(
+async def assign_work(
     work_id: str,
+    response: Response,
     use_background_llm: bool = Query(
         default=True,
         description="If true, use lightweight template provider; false attempts HF provider.",
     ),
+    enqueue: bool = Query(
+        default=False,
+        description="If true, queue the work for the assignment workers and return immediately.",
+    ),
+    defer_explanation: Optional[bool] = Query(
+        default=None,
+        description=(
+            "Commit the assignment and generate the explanation in the background "
+            "(see /status). Defaults to true for the HF provider."
+        ),
+    ),
 ):
     try:
         llm_provider = "template" if use_background_llm else "hf"
-        assignment = controller.assign(work_id, llm_provider=llm_provider)
+        if enqueue:
+            job = await controller.enqueue_assignment(work_id, llm_provider=llm_provider)
+            response.status_code = 202
+            return {"status": "queued", "job": job}
+        if defer_explanation is None:
+            defer_explanation = llm_provider != "template"
+        assignment = await controller.assign(
+            work_id, llm_provider=llm_provider, defer_explanation=defer_explanation
+        )
         return {"status": "ok", "assignment": assignment}
     except Exception as exc:
         raise HTTPException(status_code=400, detail=str(exc))
 
 
+@router.get("/jobs/{job_id}")
+async def job_status(job_id: str):
+    job = await controller.fetch_job(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="job not found")
+    return {"status": "ok", "job": job}
+
+
 @router.get("/status/{work_id}")
-def status(work_id: str):
-    work = controller.fetch_status(work_id)
+async def status(work_id: str):
+    work = await controller.fetch_status(work_id)
     if not work:
         raise HTTPException(status_code=404, detail="work not found")
     return {"status": "ok", "work": work}
 
 
 @router.get("/work")
-def list_work(limit: int = 25, status: Optional[str] = None):
-    rows = WorkRequestsRepo.list_work_requests(limit=limit, status=status)
+async def list_work(limit: int = 25, status: Optional[str] = None):
+    rows = await controller.list_work(limit=limit, status=status)
     return {"status": "ok", "work_requests": rows}
 
 
 @router.get("/pipeline/{work_id}")
-def pipeline_details(work_id: str, use_background_llm: bool = True):
+async def pipeline_details(work_id: str, use_background_llm: bool = True):
     try:
         llm_provider = "template" if use_background_llm else "hf"
-        data = controller.run_pipeline_verbose(work_id, llm_provider=llm_provider)
+        data = await controller.run_pipeline_verbose(work_id, llm_provider=llm_provider)
         return {"status": "ok", "pipeline": data}
     except Exception as exc:
         raise HTTPException(status_code=400, detail=str(exc))
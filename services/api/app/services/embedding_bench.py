@@ -0,0 +1,95 @@
+# services/api/app/services/embedding_bench.py
+"""
+Throughput and parity check of the embedding backends.
+
+Usage:
+    python -m services.api.app.services.embedding_bench \
+        [--backends torch-fp32,torch-int8,onnx] [--texts 2000] [--batch-size 64]
+
+Encodes the resource profiles from the DB plus typical work queries
+(repeated up to --texts) with each backend and prints one JSON report:
+texts/sec per backend and the cosine drift of every backend against
+torch-fp32. Backends whose dependencies are missing are reported with
+their error instead of aborting the run.
+"""
+
+import argparse
+import json
+import logging
+import time
+from typing import List
+
+from services.api.app.config import EMB_BACKENDS, EMB_BATCH_SIZE
+from services.api.app.services.embeddings import (
+    EMB_MODEL_NAME,
+    build_resource_profiles,
+    embed_texts,
+    get_model,
+    parity_report,
+)
+
+logger = logging.getLogger(__name__)
+
+SAMPLE_QUERIES = [
+    "MRI_Brain Acute stroke evaluation - URGENT",
+    "CT_Scan_Chest Suspected pulmonary embolism",
+    "X_Ray_Bone Wrist fracture follow-up",
+    "Mammography Routine screening",
+    "Ultrasound_Abdomen Right upper quadrant pain",
+    "MRI_Cardiac Cardiomyopathy assessment",
+]
+
+
+def sample_texts(count: int) -> List[str]:
+    texts = list(SAMPLE_QUERIES)
+    try:
+        from services.api.app.db.repositories import ResourcesRepo
+
+        texts += build_resource_profiles(ResourcesRepo.list_resources())[1]
+    except Exception as exc:
+        logger.warning("Resource profiles unavailable (%s); using sample queries only", exc)
+    return [texts[i % len(texts)] for i in range(count)]
+
+
+def bench_backend(backend: str, texts: List[str], batch_size: int) -> dict:
+    started = time.perf_counter()
+    get_model(backend)
+    load_seconds = time.perf_counter() - started
+    embed_texts(texts[:batch_size], batch_size=batch_size, backend=backend)  # warm up
+    started = time.perf_counter()
+    embed_texts(texts, batch_size=batch_size, backend=backend)
+    seconds = time.perf_counter() - started
+    return {
+        "backend": backend,
+        "texts": len(texts),
+        "batch_size": batch_size,
+        "load_seconds": round(load_seconds, 3),
+        "seconds": round(seconds, 3),
+        "texts_per_second": round(len(texts) / seconds, 1) if seconds else None,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark embedding backends.")
+    parser.add_argument("--backends", default=",".join(EMB_BACKENDS))
+    parser.add_argument("--texts", type=int, default=2000)
+    parser.add_argument("--batch-size", type=int, default=EMB_BATCH_SIZE)
+    args = parser.parse_args(argv)
+
+    texts = sample_texts(args.texts)
+    report = {"model": EMB_MODEL_NAME, "results": []}
+    for backend in [b.strip() for b in args.backends.split(",") if b.strip()]:
+        try:
+            result = bench_backend(backend, texts, args.batch_size)
+            if backend != "torch-fp32":
+                result["parity"] = parity_report(sorted(set(texts)), backend)
+        except Exception as exc:
+            result = {"backend": backend, "error": repr(exc)}
+        report["results"].append(result)
+    print(json.dumps(report, indent=2))
+    return report
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    main()
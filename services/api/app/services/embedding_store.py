@@ -0,0 +1,164 @@
+# services/api/app/services/embedding_store.py
+"""
+Compact on-disk store of resource embeddings, one per index version.
+
+    vectors.npy    float32 (N, dim) matrix, opened with mmap_mode="r"
+    ids.npy        fixed-width unicode resource ids, row-aligned with vectors
+    labels.npy     int64 FAISS ids (IndexIDMap2 labels), row-aligned
+    hashes.npy     fixed-width profile content hashes, row-aligned
+    manifest.json  model, backend, dim, count, normalized, built_at, next_label
+
+Arrays are memory-mapped read-only, so every API worker process maps the
+same files and shares their pages through the OS page cache instead of
+holding private copies; the stored vectors also let a re-index reuse
+unchanged rows instead of re-embedding them (see `plan_update`).
+"""
+
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+VECTORS_FILE = "vectors.npy"
+IDS_FILE = "ids.npy"
+LABELS_FILE = "labels.npy"
+HASHES_FILE = "hashes.npy"
+MANIFEST_FILE = "manifest.json"
+
+
+@dataclass
+class EmbeddingStore:
+    manifest: dict
+    ids: np.ndarray
+    labels: np.ndarray
+    hashes: np.ndarray
+    vectors: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @property
+    def model(self) -> Optional[str]:
+        return self.manifest.get("model")
+
+    @property
+    def next_label(self) -> int:
+        return int(self.manifest.get("next_label", 0))
+
+    def rows_by_id(self) -> Dict[str, int]:
+        return {str(rid): i for i, rid in enumerate(self.ids)}
+
+    def ids_by_label(self) -> Dict[int, str]:
+        return {int(label): str(rid) for label, rid in zip(self.labels, self.ids)}
+
+    def hash_by_id(self) -> Dict[str, str]:
+        return {str(rid): str(h) for rid, h in zip(self.ids, self.hashes)}
+
+    @classmethod
+    def exists(cls, directory: Optional[Path]) -> bool:
+        return directory is not None and (Path(directory) / MANIFEST_FILE).exists()
+
+    @classmethod
+    def open(cls, directory: Path, mmap: bool = True) -> "EmbeddingStore":
+        directory = Path(directory)
+        with open(directory / MANIFEST_FILE, encoding="utf-8") as f:
+            manifest = json.load(f)
+        mode = "r" if mmap else None
+        vectors = np.load(directory / VECTORS_FILE, mmap_mode=mode)
+        ids = np.load(directory / IDS_FILE, mmap_mode=mode)
+        if vectors.shape != (manifest["count"], manifest["dim"]) or len(ids) != manifest["count"]:
+            raise ValueError(f"embedding store in {directory} does not match its manifest")
+        return cls(
+            manifest=manifest,
+            ids=ids,
+            labels=np.load(directory / LABELS_FILE, mmap_mode=mode),
+            hashes=np.load(directory / HASHES_FILE, mmap_mode=mode),
+            vectors=vectors,
+        )
+
+    @staticmethod
+    def write(
+        directory: Path,
+        ids: Sequence[str],
+        labels: Sequence[int],
+        hashes: Sequence[str],
+        vectors: np.ndarray,
+        model: str,
+        normalized: bool,
+        next_label: int,
+        backend: Optional[str] = None,
+    ) -> dict:
+        directory = Path(directory)
+        vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+        if vectors.ndim != 2 or len(vectors) != len(ids):
+            raise ValueError("vectors must be (len(ids), dim)")
+        width = max((len(str(i)) for i in ids), default=1)
+        np.save(directory / VECTORS_FILE, vectors)
+        np.save(directory / IDS_FILE, np.asarray(ids, dtype=f"<U{width}"))
+        np.save(directory / LABELS_FILE, np.asarray(labels, dtype=np.int64))
+        np.save(directory / HASHES_FILE, np.asarray(hashes, dtype="<U16"))
+        manifest = {
+            "model": model,
+            "backend": backend,
+            "dim": int(vectors.shape[1]),
+            "count": int(vectors.shape[0]),
+            "normalized": bool(normalized),
+            "built_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "next_label": int(next_label),
+            "id_dtype": f"<U{width}",
+        }
+        with open(directory / MANIFEST_FILE, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=2)
+        return manifest
+
+
+@dataclass
+class UpdatePlan:
+    """
+    Incremental update of an ID-mapped index. `stale_labels` are removed
+    from the index; `to_embed` are (re-)embedded and added under their
+    entry in `labels`, the resource_id -> label mapping after the update.
+    """
+
+    removed: List[str]
+    changed: List[str]
+    added: List[str]
+    stale_labels: List[int]
+    labels: Dict[str, int]
+    next_label: int
+
+    @property
+    def to_embed(self) -> List[str]:
+        return self.changed + self.added
+
+    @property
+    def up_to_date(self) -> bool:
+        return not (self.removed or self.changed or self.added)
+
+
+def plan_update(
+    ids: Sequence[str],
+    hashes: Dict[str, str],
+    old_labels: Dict[str, int],
+    old_hashes: Dict[str, str],
+    next_label: int,
+) -> UpdatePlan:
+    """
+    Compare the current profiles (`ids` in order, `hashes` by id) with the
+    previous version. Labels are never reused: a changed profile gets a new
+    one, so a stale vector can not be returned under the new label.
+    """
+    removed = [rid for rid in old_labels if rid not in hashes]
+    changed = [rid for rid in ids if rid in old_labels and old_hashes.get(rid) != hashes[rid]]
+    added = [rid for rid in ids if rid not in old_labels]
+    labels = dict(old_labels)
+    stale_labels = [labels.pop(rid) for rid in removed + changed]
+    for rid in changed + added:
+        labels[rid] = next_label
+        next_label += 1
+    return UpdatePlan(removed, changed, added, stale_labels, labels, next_label)
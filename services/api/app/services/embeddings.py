@@ -4,19 +4,36 @@ Embeddings utilities using sentence-transformers and FAISS.
 
 Functions:
  - embed_texts(list[str]) -> ndarray
- - build_faiss_index(resource_profiles: List[dict], model_name=...) -> (index, ids_list)
- - save/load index & cache
+ - build_faiss_index(resources: List[dict], rebuild=False) -> (index, {faiss_id: resource_id})
+ - save/load index & embedding store
  - query_faiss(index, query_embedding, top_k=5) -> (scores, ids)
+
+Built indexes are published as versions under CACHE_DIR/faiss (see
+index_store.py). Queries use a resident, memory-mapped copy that is swapped
+for the new version when a rebuild (possibly in another process) publishes
+one.
 """
+import hashlib
 import logging
 import os
 import pickle
 from pathlib import Path
-from typing import Any, Dict, List, Tuple
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 
 import faiss
 import numpy as np
 
+from services.api.app.config import (
+    EMB_BACKEND,
+    EMB_BACKENDS,
+    EMB_BATCH_SIZE,
+    FAISS_RELOAD_CHECK_SECONDS,
+)
+from services.api.app.services.embedding_store import EmbeddingStore, plan_update
+from services.api.app.services.index_store import IndexStore, ResidentIndex
+from services.api.app.services.model_registry import EMBEDDING_MODEL, model_registry
+from services.api.app.services.query_cache import query_cache
+
 logger = logging.getLogger(__name__)
 
 # optional heavy imports
@@ -32,35 +49,85 @@ except Exception:
 EMB_MODEL_NAME = os.getenv("EMB_MODEL", "all-MiniLM-L6-v2")
 CACHE_DIR = Path(os.getenv("EMB_CACHE_DIR", "infra/mysql_init/embeddings_cache"))
 CACHE_DIR.mkdir(parents=True, exist_ok=True)
-INDEX_PATH = CACHE_DIR / "faiss.index"
-IDS_PATH = CACHE_DIR / "ids.pkl"
-EMB_CACHE_PATH = CACHE_DIR / "embeddings.pkl"
+INDEX_FILE = "faiss.index"
+# legacy pickled ids; versions now carry an EmbeddingStore (embedding_store.py)
+IDS_FILE = "ids.pkl"
+# flat pre-versioning layout, still read if nothing has been published
+INDEX_PATH = CACHE_DIR / INDEX_FILE
+IDS_PATH = CACHE_DIR / IDS_FILE
+INDEX_STORE = IndexStore(CACHE_DIR / "faiss")
+
+
+def _load_model(backend: str):
+    """
+    torch-fp32: plain SentenceTransformer on CPU; torch-int8: the same with
+    nn.Linear layers dynamically quantized to int8; onnx: ONNX Runtime
+    (sentence-transformers >= 3.2 with optimum/onnxruntime installed).
+    """
+    if backend == "torch-fp32":
+        return SentenceTransformer(EMB_MODEL_NAME, device="cpu")
+    if backend == "torch-int8":
+        import torch
 
+        model = SentenceTransformer(EMB_MODEL_NAME, device="cpu")
+        return torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+    if backend == "onnx":
+        return SentenceTransformer(EMB_MODEL_NAME, device="cpu", backend="onnx")
+    raise ValueError(f"unknown embedding backend {backend!r}; expected one of {EMB_BACKENDS}")
 
-def _get_model():
+
+def get_model(backend: Optional[str] = None):
+    """The process-wide SentenceTransformer for `backend`, loaded on first use."""
     if not ST_AVAILABLE:
         raise RuntimeError("sentence-transformers or faiss not installed")
-    model = SentenceTransformer(EMB_MODEL_NAME)
-    return model
+    backend = backend or EMB_BACKEND
+    name = EMBEDDING_MODEL if backend == EMB_BACKEND else f"{EMBEDDING_MODEL}:{backend}"
+    return model_registry().get(name, lambda: _load_model(backend))
 
 
-def embed_texts(texts: List[str]) -> np.ndarray:
+def embed_texts(
+    texts: List[str], batch_size: int = EMB_BATCH_SIZE, backend: Optional[str] = None
+) -> np.ndarray:
     """
     Compute embeddings for a list of texts and return a (N, D) numpy array.
     """
-    model = _get_model()
-    emb = model.encode(texts, show_progress_bar=False, convert_to_numpy=True)
+    model = get_model(backend)
+    emb = model.encode(
+        texts, batch_size=batch_size, show_progress_bar=False, convert_to_numpy=True
+    )
     # ensure dtype float32 for faiss
     if emb.dtype != np.float32:
         emb = emb.astype(np.float32)
     return emb
 
 
+def _normalized(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.maximum(norms, 1e-12)
+
+
+def parity_report(texts: List[str], backend: str, reference: str = "torch-fp32") -> dict:
+    """Cosine agreement of `backend` embeddings with the `reference` backend."""
+    ref = _normalized(embed_texts(texts, backend=reference))
+    got = _normalized(embed_texts(texts, backend=backend))
+    cosine = np.sum(ref * got, axis=1)
+    return {
+        "backend": backend,
+        "reference": reference,
+        "texts": len(texts),
+        "mean_cosine": round(float(cosine.mean()), 6),
+        "min_cosine": round(float(cosine.min()), 6),
+        "max_drift": round(float(1.0 - cosine.min()), 6),
+    }
+
+
 def build_resource_profiles(
     resources: List[Dict[str, Any]],
 ) -> Tuple[List[str], List[str]]:
     """
-    Convert resource dicts into profile strings and return (ids, profile_texts)
+    Convert resource dicts into profile strings and return (ids, profile_texts).
+    Only stable attributes go into the text; volatile counters such as
+    total_cases_handled would force a re-embed on every assignment.
     """
     ids = []
     texts = []
@@ -71,69 +138,207 @@ def build_resource_profiles(
             r.get("name", ""),
             r.get("specialty", ""),
             f"skill:{r.get('skill_level','')}",
-            f"cases:{r.get('total_cases_handled','')}",
         ]
         texts.append(" | ".join(parts))
     return ids, texts
 
 
+def profile_hash(text: str) -> str:
+    return hashlib.sha256(f"{EMB_MODEL_NAME}\n{text}".encode("utf-8")).hexdigest()[:16]
+
+
+def _previous_store(directory: Optional[Path]) -> Optional[EmbeddingStore]:
+    if not EmbeddingStore.exists(directory):
+        return None
+    store = EmbeddingStore.open(directory)
+    # vectors from another model or backend are not comparable
+    if store.model != EMB_MODEL_NAME or store.manifest.get("backend") != EMB_BACKEND:
+        return None
+    return store
+
+
 def build_faiss_index(
     resources: List[Dict[str, Any]], rebuild: bool = False
-) -> Tuple[Any, List[str]]:
+) -> Tuple[Any, Dict[int, str]]:
     """
-    Build or update a FAISS index from resource profiles.
-    Returns (index, ids_list)
-    Index and ids are saved to CACHE_DIR.
+    Build or update the ID-mapped FAISS index from resource profiles.
+    Returns (index, {faiss_id: resource_id}).
+
+    With rebuild=False the current published version is updated in place:
+    only resources whose profile hash is new or changed are embedded, and
+    resources no longer present are removed. Falls back to a full build
+    when nothing compatible has been published. Each build is published as
+    a new version under CACHE_DIR/faiss (index + embedding store); an
+    unchanged roster publishes nothing.
     """
     if not ST_AVAILABLE:
         raise RuntimeError("sentence-transformers or faiss not installed")
 
-    ids, texts = build_resource_profiles(resources)
-    embeddings = embed_texts(texts)  # (N, D)
-    dim = embeddings.shape[1]
-
-    # create index
-    index = faiss.IndexFlatIP(
-        dim
-    )  # inner product (cosine-like if embeddings normalized)
-    # normalize for IP similarity (optional)
-    faiss.normalize_L2(embeddings)
-    index.add(embeddings)
-
-    # persist
-    faiss.write_index(index, str(INDEX_PATH))
-    with open(IDS_PATH, "wb") as f:
-        pickle.dump(ids, f)
-    with open(EMB_CACHE_PATH, "wb") as f:
-        pickle.dump(
-            {"ids": ids, "texts": texts, "embeddings_shape": embeddings.shape}, f
+    rids, texts = build_resource_profiles(resources)
+    hashes = {rid: profile_hash(text) for rid, text in zip(rids, texts)}
+    text_by_id = dict(zip(rids, texts))
+
+    current = None if rebuild else INDEX_STORE.current_dir()
+    previous = _previous_store(current)
+    if previous is not None:
+        # a private copy: the update mutates it (the resident one is mmapped)
+        index = faiss.read_index(str(current / INDEX_FILE))
+        old_rows = previous.rows_by_id()
+        old_hashes = previous.hash_by_id()
+        labels = {rid: int(previous.labels[row]) for rid, row in old_rows.items()}
+        next_label = previous.next_label
+    else:
+        index, old_rows, old_hashes, labels, next_label = None, {}, {}, {}, 0
+
+    plan = plan_update(rids, hashes, labels, old_hashes, next_label)
+    if index is not None and plan.up_to_date:
+        logger.info("FAISS index is up to date (%d resources)", len(labels))
+        return index, previous.ids_by_label()
+
+    if index is not None and plan.stale_labels:
+        index.remove_ids(np.asarray(plan.stale_labels, dtype=np.int64))
+
+    labels, next_label = plan.labels, plan.next_label
+    to_embed = plan.to_embed
+    new_rows = {rid: i for i, rid in enumerate(to_embed)}
+    if to_embed:
+        embeddings = embed_texts([text_by_id[rid] for rid in to_embed])  # (N, D)
+        # normalize for IP similarity (cosine)
+        faiss.normalize_L2(embeddings)
+        if index is None:
+            # inner product over normalized vectors, addressable by label
+            index = faiss.IndexIDMap2(faiss.IndexFlatIP(embeddings.shape[1]))
+        index.add_with_ids(
+            embeddings, np.asarray([labels[rid] for rid in to_embed], dtype=np.int64)
         )
+        dim = embeddings.shape[1]
+    else:
+        dim = previous.manifest["dim"]
+    logger.info(
+        "FAISS index: %d added, %d updated, %d removed (%s build)",
+        len(plan.added),
+        len(plan.changed),
+        len(plan.removed),
+        "incremental" if previous is not None else "full",
+    )
 
-    return index, ids
+    # unchanged rows are copied from the previous store, not re-embedded
+    vectors = np.empty((len(rids), dim), dtype=np.float32)
+    for i, rid in enumerate(rids):
+        if rid in new_rows:
+            vectors[i] = embeddings[new_rows[rid]]
+        else:
+            vectors[i] = previous.vectors[old_rows[rid]]
+
+    def write(directory: Path):
+        faiss.write_index(index, str(directory / INDEX_FILE))
+        EmbeddingStore.write(
+            directory,
+            ids=rids,
+            labels=[labels[rid] for rid in rids],
+            hashes=[hashes[rid] for rid in rids],
+            vectors=vectors,
+            model=EMB_MODEL_NAME,
+            normalized=True,
+            next_label=next_label,
+            backend=EMB_BACKEND,
+        )
+
+    version = INDEX_STORE.publish(write)
+    logger.info("Published FAISS index version %s", version)
+    _resident.invalidate()  # this process picks it up on the next query
+    return index, {labels[rid]: rid for rid in rids}
+
+
+def _mmap_index(path: Path):
+    """
+    Read a published (immutable) index memory-mapped, so worker processes
+    share its pages through the OS page cache instead of each holding a
+    private copy. IO_FLAG_MMAP_IFC (faiss >= 1.10) maps flat codes in place;
+    builds without mmap support for the index type get a regular read.
+    """
+    flag = getattr(faiss, "IO_FLAG_MMAP_IFC", faiss.IO_FLAG_MMAP)
+    try:
+        return faiss.read_index(str(path), flag)
+    except RuntimeError as exc:
+        logger.warning("Memory-mapped read of %s failed (%s); reading it into memory", path, exc)
+        return faiss.read_index(str(path))
+
+
+def _read_index(directory: Optional[Path]):
+    """(index, {faiss_id: resource_id}, {resource_id: faiss_id}) of a version."""
+    if EmbeddingStore.exists(directory):
+        index = _mmap_index(directory / INDEX_FILE)
+        ids = EmbeddingStore.open(directory).ids_by_label()
+    else:
+        # pre-store layouts: pickled id list/map next to the index
+        index_path = directory / INDEX_FILE if directory else INDEX_PATH
+        ids_path = directory / IDS_FILE if directory else IDS_PATH
+        if not index_path.exists() or not ids_path.exists():
+            raise FileNotFoundError("FAISS index or ids file not found. Build index first.")
+        index = faiss.read_index(str(index_path))
+        with open(ids_path, "rb") as f:
+            ids = pickle.load(f)
+    pairs = ids.items() if isinstance(ids, dict) else enumerate(ids)
+    return index, ids, {rid: int(label) for label, rid in pairs}
+
+
+_resident = ResidentIndex(INDEX_STORE, _read_index, check_seconds=FAISS_RELOAD_CHECK_SECONDS)
 
 
 def load_faiss_index():
+    """The resident (index, ids) pair; reloaded when a new version is published."""
     if not ST_AVAILABLE:
         raise RuntimeError("sentence-transformers or faiss not installed")
-    if not INDEX_PATH.exists() or not IDS_PATH.exists():
-        raise FileNotFoundError("FAISS index or ids file not found. Build index first.")
-
-    index = faiss.read_index(str(INDEX_PATH))
-    with open(IDS_PATH, "rb") as f:
-        ids = pickle.load(f)
+    index, ids, _ = _resident.get()
     return index, ids
 
 
-def query_faiss_by_text(query: str, top_k: int = 5):
+def index_info() -> dict:
+    return _resident.info()
+
+
+def index_version() -> Optional[str]:
+    """
+    Version of the index the next search will use. Reads CURRENT when the
+    reload check is due, so results cached against an older version (e.g.
+    the finder's negative cache) stop matching once another process
+    publishes a rebuild.
+    """
+    return _resident.fresh_version()
+
+
+def embed_query(query: str) -> np.ndarray:
+    """Normalized (1, D) query embedding, cached by normalized query text."""
+    cache = query_cache()
+    q_emb = cache.get_vector(query)
+    if q_emb is None:
+        q_emb = get_model().encode([query], convert_to_numpy=True)
+        if q_emb.dtype != np.float32:
+            q_emb = q_emb.astype(np.float32)
+        faiss.normalize_L2(q_emb)
+        cache.put_vector(query, q_emb)
+    return q_emb
+
+
+def query_faiss_by_text(query: str, top_k: int = 5, allow_ids: Optional[Iterable[str]] = None):
+    """
+    Top-k resources for `query`. With `allow_ids` the search is restricted
+    to those resource_ids inside FAISS (IDSelectorBatch), so every hit is
+    admissible and no result slot is spent on filtered-out resources.
+    """
     if not ST_AVAILABLE:
         raise RuntimeError("sentence-transformers or faiss not installed")
-    model = _get_model()
-    q_emb = model.encode([query], convert_to_numpy=True)
-    if q_emb.dtype != np.float32:
-        q_emb = q_emb.astype(np.float32)
-    faiss.normalize_L2(q_emb)
-    index, ids = load_faiss_index()
-    D, I = index.search(q_emb, top_k)
+    index, ids, labels_by_id = _resident.get()
+    params = None
+    if allow_ids is not None:
+        labels = [labels_by_id[rid] for rid in allow_ids if rid in labels_by_id]
+        if not labels:
+            return []
+        top_k = min(top_k, len(labels))
+        params = faiss.SearchParameters(sel=faiss.IDSelectorBatch(np.asarray(labels, dtype=np.int64)))
+    q_emb = embed_query(query)
+    D, I = index.search(q_emb, top_k, params=params)
     # I is shape (1, k)
     results = []
     for score, idx in zip(D[0].tolist(), I[0].tolist()):
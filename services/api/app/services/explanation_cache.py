@@ -0,0 +1,218 @@
+# services/api/app/services/explanation_cache.py
+"""
+Content-addressed cache of generated explanations.
+
+The key is a SHA-256 of the canonical JSON of the structured explanation
+input plus provider and model name, so identical assignments (same work
+type, priority, resource, skill, cases, availability, workload) reuse the
+text instead of running the model again.
+
+Two tiers:
+ - memory: LRU of up to `max_entries` texts;
+ - disk: one small file per key under `cache_dir` (shared by API processes
+   and workers), evicted least-recently-used once the total size exceeds
+   `max_disk_bytes`. A disk hit is promoted to memory.
+
+Each process keeps its own index of the disk tier and re-scans the
+directory every `rescan_seconds` to pick up files written (or evicted) by
+the others; between scans the cap is enforced on that process's view only.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Optional
+
+from services.api.app.config import (
+    EXPLANATION_CACHE_DIR,
+    EXPLANATION_CACHE_MAX_BYTES,
+    EXPLANATION_CACHE_MAX_ENTRIES,
+    EXPLANATION_CACHE_RESCAN_SECONDS,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def explanation_key(structured_input: Dict, provider: str, model: str) -> str:
+    canonical = json.dumps(
+        {"provider": provider, "model": model, "input": structured_input},
+        sort_keys=True,
+        separators=(",", ":"),
+        default=str,
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class ExplanationCache:
+    def __init__(
+        self,
+        cache_dir=EXPLANATION_CACHE_DIR,
+        max_entries: int = EXPLANATION_CACHE_MAX_ENTRIES,
+        max_disk_bytes: int = EXPLANATION_CACHE_MAX_BYTES,
+        rescan_seconds: float = EXPLANATION_CACHE_RESCAN_SECONDS,
+    ):
+        self._dir = Path(cache_dir) if cache_dir else None
+        self._max_entries = max_entries
+        self._max_disk_bytes = max_disk_bytes
+        self._rescan_seconds = rescan_seconds
+        self._memory: "OrderedDict[str, str]" = OrderedDict()
+        self._disk: Optional["OrderedDict[str, int]"] = None  # key -> size, LRU order
+        self._disk_bytes = 0
+        self._scanned_at = 0.0
+        self._lock = threading.Lock()
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.memory_evictions = 0
+        self.disk_evictions = 0
+
+    @property
+    def disk_enabled(self) -> bool:
+        return self._dir is not None and self._max_disk_bytes > 0
+
+    # -- disk tier -------------------------------------------------------------
+    def _path(self, key: str) -> Path:
+        return self._dir / key[:2] / f"{key}.txt"
+
+    def _disk_index(self) -> "OrderedDict[str, int]":
+        """Sizes of the files on disk, oldest access first (re-scanned periodically)."""
+        if self._disk is None or time.monotonic() - self._scanned_at >= self._rescan_seconds:
+            found = []
+            if self._dir.exists():
+                for path in self._dir.glob("*/*.txt"):
+                    try:
+                        st = path.stat()
+                    except OSError:
+                        continue
+                    found.append((st.st_mtime, path.stem, st.st_size))
+            found.sort()
+            self._disk = OrderedDict((key, size) for _, key, size in found)
+            self._disk_bytes = sum(self._disk.values())
+            self._scanned_at = time.monotonic()
+        return self._disk
+
+    def _read_disk(self, key: str) -> Optional[str]:
+        path = self._path(key)
+        try:
+            text = path.read_text(encoding="utf-8")
+        except OSError:
+            return None
+        try:
+            os.utime(path)  # LRU order survives restarts via mtime
+        except OSError:
+            pass
+        index = self._disk_index()
+        if key not in index:
+            index[key] = len(text.encode("utf-8"))
+            self._disk_bytes += index[key]
+        index.move_to_end(key)
+        return text
+
+    def _write_disk(self, key: str, text: str):
+        path = self._path(key)
+        data = text.encode("utf-8")
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+            with os.fdopen(fd, "wb") as fh:
+                fh.write(data)
+            os.replace(tmp, path)
+        except OSError as exc:
+            logger.warning("Could not write explanation cache entry %s: %s", key, exc)
+            return
+        index = self._disk_index()
+        self._disk_bytes += len(data) - index.pop(key, 0)
+        index[key] = len(data)
+        while self._disk_bytes > self._max_disk_bytes and len(index) > 1:
+            old_key, size = index.popitem(last=False)
+            self._disk_bytes -= size
+            self.disk_evictions += 1
+            try:
+                self._path(old_key).unlink()
+            except OSError:
+                pass
+
+    # -- public API --------------------------------------------------------------
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            text = self._memory.get(key)
+            if text is not None:
+                self._memory.move_to_end(key)
+                self.memory_hits += 1
+                return text
+            if self.disk_enabled:
+                text = self._read_disk(key)
+                if text is not None:
+                    self.disk_hits += 1
+                    self._remember(key, text)
+                    return text
+            self.misses += 1
+            return None
+
+    def put(self, key: str, text: str):
+        with self._lock:
+            self.stores += 1
+            self._remember(key, text)
+            if self.disk_enabled:
+                self._write_disk(key, text)
+
+    def _remember(self, key: str, text: str):
+        if self._max_entries <= 0:
+            return
+        self._memory[key] = text
+        self._memory.move_to_end(key)
+        while len(self._memory) > self._max_entries:
+            self._memory.popitem(last=False)
+            self.memory_evictions += 1
+
+    def clear(self, disk: bool = False):
+        with self._lock:
+            self._memory.clear()
+            if disk and self.disk_enabled:
+                for key in list(self._disk_index()):
+                    try:
+                        self._path(key).unlink()
+                    except OSError:
+                        pass
+                self._disk.clear()
+                self._disk_bytes = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            hits = self.memory_hits + self.disk_hits
+            lookups = hits + self.misses
+            return {
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": round(hits / lookups, 4) if lookups else None,
+                "stores": self.stores,
+                "memory_entries": len(self._memory),
+                "memory_evictions": self.memory_evictions,
+                "disk_entries": len(self._disk) if self._disk is not None else None,
+                "disk_bytes": self._disk_bytes if self._disk is not None else None,
+                "disk_evictions": self.disk_evictions,
+                "max_entries": self._max_entries,
+                "max_disk_bytes": self._max_disk_bytes,
+            }
+
+
+_cache: Optional[ExplanationCache] = None
+_cache_lock = threading.Lock()
+
+
+def explanation_cache() -> ExplanationCache:
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = ExplanationCache()
+        return _cache
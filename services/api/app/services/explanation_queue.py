@@ -0,0 +1,103 @@
+# services/api/app/services/explanation_queue.py
+"""
+Background generation of assignment explanations.
+
+With deferred explanations the assignment is committed together with a
+`pending` row in assignment_explanations, the API responds immediately and
+the (slow) LLM call runs here on a small thread pool. The result, or the
+error, is written back to the row and surfaced through /status/{work_id}.
+Rows still pending after a restart are picked up again by resume_pending().
+"""
+
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Optional
+
+from services.api.app.config import EXPLANATION_WORKERS
+from services.api.app.db.repositories import ExplanationsRepo
+from services.api.app.services.llm_client import LLMClient
+
+logger = logging.getLogger(__name__)
+
+
+class ExplanationQueue:
+    def __init__(self, max_workers: int = EXPLANATION_WORKERS):
+        self._max_workers = max(1, max_workers)
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._inflight = set()
+        self.completed = 0
+        self.failed = 0
+
+    def _pool(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self._max_workers, thread_name_prefix="explain"
+                )
+            return self._executor
+
+    def submit(self, work_id: str, llm_input: dict, provider: str) -> Optional[Future]:
+        """
+        Schedule generation for a committed pending row. Returns None if the
+        work item is already being explained.
+        """
+        with self._lock:
+            if work_id in self._inflight:
+                return None
+            self._inflight.add(work_id)
+        return self._pool().submit(self._generate, work_id, llm_input, provider)
+
+    def _generate(self, work_id: str, llm_input: dict, provider: str) -> Optional[str]:
+        try:
+            explanation = LLMClient.generate_explanation(llm_input, provider=provider)
+            ExplanationsRepo.store(work_id, explanation)
+            self.completed += 1
+            return explanation
+        except Exception as exc:
+            logger.warning("Explanation for %s failed: %s", work_id, exc)
+            self.failed += 1
+            try:
+                ExplanationsRepo.mark_failed(work_id, exc)
+            except Exception:
+                logger.exception("Could not record explanation failure for %s", work_id)
+            return None
+        finally:
+            with self._lock:
+                self._inflight.discard(work_id)
+
+    def resume_pending(self) -> int:
+        rows = ExplanationsRepo.list_pending()
+        for row in rows:
+            self.submit(row["work_id"], row.get("llm_input") or {}, row["provider"])
+        if rows:
+            logger.info("Resumed %s pending explanations", len(rows))
+        return len(rows)
+
+    def shutdown(self, wait: bool = True):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait)
+
+    def stats(self) -> dict:
+        with self._lock:
+            inflight = len(self._inflight)
+        return {
+            "inflight": inflight,
+            "completed": self.completed,
+            "failed": self.failed,
+            "workers": self._max_workers,
+        }
+
+
+_queue = ExplanationQueue()
+
+
+def explanation_queue() -> ExplanationQueue:
+    return _queue
+
+
+def schedule_explanation(work_id: str, llm_input: dict, provider: str) -> Optional[Future]:
+    return _queue.submit(work_id, llm_input, provider)
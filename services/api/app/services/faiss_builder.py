@@ -2,10 +2,12 @@
 """
 Helper script to build FAISS index for resources.
 Usage:
-    python -m services.api.app.services.faiss_builder
-Or run the functions programmatically.
+    python -m services.api.app.services.faiss_builder [--incremental]
+With --incremental only new or changed resources (by profile hash) are
+embedded and removed ones are dropped from the current index. Or run the functions programmatically.
 """
 
+import argparse
 import logging
 import os
 import sys
@@ -24,16 +26,31 @@ from services.api.app.db.repositories import (
 from services.api.app.services.embeddings import build_faiss_index
 
 
-def build_index_from_db():
+def build_index_from_db(incremental: bool = False):
     logger.info("Fetching resources from DB...")
     resources = ResourcesRepo.list_resources()
     if not resources:
         logger.warning("No resources found in DB to index.")
         return
-    logger.info("Building FAISS index for %d resources...", len(resources))
-    index, ids = build_faiss_index(resources, rebuild=True)
+    logger.info(
+        "%s FAISS index for %d resources...",
+        "Updating" if incremental else "Building",
+        len(resources),
+    )
+    index, ids = build_faiss_index(resources, rebuild=not incremental)
     logger.info("FAISS index built and saved. Indexed IDs: %d", len(ids))
 
 
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build the resource FAISS index.")
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Embed only new/changed resources and update the current index",
+    )
+    args = parser.parse_args(argv)
+    build_index_from_db(incremental=args.incremental)
+
+
 if __name__ == "__main__":
-    build_index_from_db()
+    main()
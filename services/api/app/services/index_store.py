@@ -0,0 +1,167 @@
+# services/api/app/services/index_store.py
+"""
+Versioned on-disk layout for search indexes, plus an in-memory resident copy.
+
+    <root>/CURRENT              name of the live version
+    <root>/versions/<version>/  files of one published build
+
+A build writes into a staging directory, renames it into versions/ and then
+replaces CURRENT (write temp file + os.replace), so readers only ever see a
+complete version. Old versions beyond `keep` are pruned.
+
+ResidentIndex keeps the loaded version in process memory and re-reads
+CURRENT at most every `check_seconds`; when it changes the new version is
+loaded and swapped in with one reference assignment, so concurrent queries
+see either the old or the new index, never a mix.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import shutil
+import tempfile
+import threading
+import time
+import uuid
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+CURRENT_FILE = "CURRENT"
+
+
+class IndexStore:
+    def __init__(self, root, keep: int = 3):
+        self.root = Path(root)
+        self.versions = self.root / "versions"
+        self.keep = max(1, keep)
+
+    def current_version(self) -> Optional[str]:
+        try:
+            version = (self.root / CURRENT_FILE).read_text(encoding="utf-8").strip()
+        except FileNotFoundError:
+            return None
+        return version or None
+
+    def version_dir(self, version: str) -> Path:
+        return self.versions / version
+
+    def current_dir(self) -> Optional[Path]:
+        version = self.current_version()
+        return self.version_dir(version) if version else None
+
+    def publish(self, write: Callable[[Path], None]) -> str:
+        """
+        Call `write(directory)` to fill a fresh version, then make it current.
+        Returns the new version name.
+        """
+        self.versions.mkdir(parents=True, exist_ok=True)
+        version = f"{datetime.utcnow():%Y%m%dT%H%M%S%f}-{uuid.uuid4().hex[:6]}"
+        staging = Path(tempfile.mkdtemp(prefix=".staging-", dir=self.versions))
+        try:
+            write(staging)
+            os.replace(staging, self.version_dir(version))
+        except BaseException:
+            shutil.rmtree(staging, ignore_errors=True)
+            raise
+        self._set_current(version)
+        self._prune(version)
+        return version
+
+    def _set_current(self, version: str):
+        fd, tmp = tempfile.mkstemp(prefix=".CURRENT-", dir=self.root)
+        with os.fdopen(fd, "w", encoding="utf-8") as fh:
+            fh.write(version + "\n")
+            fh.flush()
+            os.fsync(fh.fileno())
+        os.replace(tmp, self.root / CURRENT_FILE)
+
+    def _prune(self, current: str):
+        published = sorted(
+            p.name for p in self.versions.iterdir() if p.is_dir() and not p.name.startswith(".")
+        )
+        for name in published[: -self.keep]:
+            if name != current:
+                shutil.rmtree(self.version_dir(name), ignore_errors=True)
+
+
+class ResidentIndex:
+    """
+    `load(directory)` builds the in-memory value from a version directory;
+    `directory` is None when nothing has been published yet (the loader may
+    then fall back to a legacy layout or raise FileNotFoundError).
+    """
+
+    def __init__(
+        self,
+        store: IndexStore,
+        load: Callable[[Optional[Path]], Any],
+        check_seconds: float = 5.0,
+    ):
+        self._store = store
+        self._load = load
+        self._check_seconds = check_seconds
+        self._loaded: Optional[Tuple[Optional[str], Any]] = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+        self.reloads = 0
+
+    def get(self) -> Any:
+        loaded = self._loaded
+        if loaded is None or time.monotonic() - self._checked_at >= self._check_seconds:
+            loaded = self.refresh()
+        return loaded[1]
+
+    def refresh(self, force: bool = False) -> Tuple[Optional[str], Any]:
+        with self._lock:
+            self._checked_at = time.monotonic()
+            version = self._store.current_version()
+            loaded = self._loaded
+            if loaded is not None and loaded[0] == version and not force:
+                return loaded
+            try:
+                value = self._load(self._store.version_dir(version) if version else None)
+            except Exception:
+                if loaded is None:
+                    raise
+                # e.g. version pruned mid-read; keep serving what we have
+                logger.exception("Reloading index version %s failed", version)
+                return loaded
+            self._loaded = (version, value)
+            self.reloads += 1
+            if loaded is not None:
+                logger.info("Index reloaded: %s -> %s", loaded[0], version)
+            return self._loaded
+
+    def invalidate(self):
+        self._loaded = None
+
+    @property
+    def version(self) -> Optional[str]:
+        """Version currently in memory (no disk access)."""
+        loaded = self._loaded
+        return loaded[0] if loaded else None
+
+    def fresh_version(self) -> Optional[str]:
+        """
+        Version the next get() serves: picks up a newly published version
+        first when a check is due. None if nothing can be loaded.
+        """
+        try:
+            self.get()
+        except Exception:
+            return None
+        return self.version
+
+    def info(self) -> dict:
+        loaded = self._loaded
+        return {
+            "loaded": loaded is not None,
+            "version": loaded[0] if loaded else None,
+            "current": self._store.current_version(),
+            "reloads": self.reloads,
+            "check_seconds": self._check_seconds,
+        }
@@ -0,0 +1,401 @@
+# services/api/app/services/inference_server.py
+"""
+Micro-batching inference for HF explanation generation.
+
+One dedicated process owns the text-generation model. Callers in the API
+process (request threads, the background explanation queue, workers)
+submit prompts and get a Future back; the model process groups requests
+that arrive close together into micro-batches of up to `max_batch_size`,
+waiting at most `max_wait_ms` after the first request of a batch, and runs
+one batched generate call per batch.
+
+Per-batch-size stats (batches, requests, run time, end-to-end latency,
+throughput) are exposed through `stats()` and GET /admin/inference.
+
+Enable with LLM_INFERENCE_SERVER=1; LLMClient then routes HF generation
+through `inference_server().generate(...)`.
+"""
+
+from __future__ import annotations
+
+import importlib
+import itertools
+import logging
+import multiprocessing
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from concurrent.futures import TimeoutError as FutureTimeout
+from typing import Any, Callable, Dict, List, Optional
+
+from services.api.app.config import (
+    LLM_BATCH_MAX_SIZE,
+    LLM_BATCH_MAX_WAIT_MS,
+    LLM_INFERENCE_RESTART_BACKOFF_SECONDS,
+    LLM_INFERENCE_TIMEOUT_SECONDS,
+)
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_FN = "services.api.app.services.llm_client:LLMClient.generate_hf_batch"
+_STOP = object()
+
+
+class BatchStats:
+    """Thread-safe counters keyed by batch size."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._by_size: Dict[int, Dict[str, float]] = {}
+
+    def _bucket(self, size: int) -> Dict[str, float]:
+        return self._by_size.setdefault(
+            size,
+            {"batches": 0, "requests": 0, "run_s": 0.0, "latency_s": 0.0, "max_latency_s": 0.0},
+        )
+
+    def record_batch(self, size: int, run_seconds: float):
+        with self._lock:
+            bucket = self._bucket(size)
+            bucket["batches"] += 1
+            bucket["run_s"] += run_seconds
+
+    def record_request(self, size: int, latency_seconds: float):
+        with self._lock:
+            bucket = self._bucket(size)
+            bucket["requests"] += 1
+            bucket["latency_s"] += latency_seconds
+            bucket["max_latency_s"] = max(bucket["max_latency_s"], latency_seconds)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            by_size = {}
+            for size, b in sorted(self._by_size.items()):
+                by_size[str(size)] = {
+                    "batches": int(b["batches"]),
+                    "requests": int(b["requests"]),
+                    "avg_run_ms": round(1000 * b["run_s"] / b["batches"], 3) if b["batches"] else None,
+                    "avg_latency_ms": round(1000 * b["latency_s"] / b["requests"], 3)
+                    if b["requests"]
+                    else None,
+                    "max_latency_ms": round(1000 * b["max_latency_s"], 3),
+                    "requests_per_second": round(b["batches"] * size / b["run_s"], 3)
+                    if b["run_s"]
+                    else None,
+                }
+            batches = sum(b["batches"] for b in self._by_size.values())
+            requests = sum(b["requests"] for b in self._by_size.values())
+            return {
+                "batches": int(batches),
+                "requests": int(requests),
+                "avg_batch_size": round(requests / batches, 3) if batches else None,
+                "by_batch_size": by_size,
+            }
+
+
+class _Entry:
+    __slots__ = ("payload", "future", "enqueued")
+
+    def __init__(self, payload, future: Future):
+        self.payload = payload
+        self.future = future
+        self.enqueued = time.monotonic()
+
+
+class MicroBatcher:
+    """
+    Groups submitted payloads into batches for `batch_fn(payloads) -> results`
+    (same length, same order) on one background thread. Each resolved future
+    carries `batch_info = (batch_id, batch_size, run_seconds)`.
+    """
+
+    def __init__(
+        self,
+        batch_fn: Callable[[List[Any]], List[Any]],
+        max_batch_size: int = LLM_BATCH_MAX_SIZE,
+        max_wait_ms: float = LLM_BATCH_MAX_WAIT_MS,
+        name: str = "micro-batcher",
+    ):
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be >= 1")
+        self._batch_fn = batch_fn
+        self._max_batch_size = max_batch_size
+        self._max_wait = max(max_wait_ms, 0) / 1000.0
+        self._queue: "queue.Queue" = queue.Queue()
+        self._batch_ids = itertools.count(1)
+        self.stats = BatchStats()
+        self._thread = threading.Thread(target=self._loop, name=name, daemon=True)
+        self._thread.start()
+
+    def submit(self, payload) -> Future:
+        future: Future = Future()
+        self._queue.put(_Entry(payload, future))
+        return future
+
+    def close(self, timeout: Optional[float] = None):
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+
+    def _loop(self):
+        stopping = False
+        while not stopping:
+            first = self._queue.get()
+            if first is _STOP:
+                return
+            batch = [first]
+            deadline = time.monotonic() + self._max_wait
+            while len(batch) < self._max_batch_size:
+                remaining = deadline - time.monotonic()
+                try:
+                    if remaining > 0:
+                        entry = self._queue.get(timeout=remaining)
+                    else:
+                        entry = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if entry is _STOP:
+                    stopping = True
+                    break
+                batch.append(entry)
+            self._run(batch)
+
+    def _run(self, batch: List[_Entry]):
+        started = time.monotonic()
+        try:
+            results = self._batch_fn([entry.payload for entry in batch])
+            if len(results) != len(batch):
+                raise RuntimeError(f"batch_fn returned {len(results)} results for {len(batch)} inputs")
+            error = None
+        except Exception as exc:
+            results, error = None, exc
+        finished = time.monotonic()
+        info = (next(self._batch_ids), len(batch), finished - started)
+        self.stats.record_batch(len(batch), finished - started)
+        for i, entry in enumerate(batch):
+            self.stats.record_request(len(batch), finished - entry.enqueued)
+            entry.future.batch_info = info
+            if error is not None:
+                entry.future.set_exception(error)
+            else:
+                entry.future.set_result(results[i])
+
+
+def _resolve(path: str) -> Callable:
+    module_name, _, attr_path = path.partition(":")
+    target: Any = importlib.import_module(module_name)
+    for attr in attr_path.split("."):
+        target = getattr(target, attr)
+    return target
+
+
+def _serve(request_q, result_q, batch_fn_path: str, max_batch_size: int, max_wait_ms: float):
+    """Model process: batch requests from `request_q`, answer on `result_q`."""
+    logging.basicConfig(level=logging.INFO)
+    try:
+        batcher = MicroBatcher(_resolve(batch_fn_path), max_batch_size, max_wait_ms)
+    except Exception as exc:
+        result_q.put(("fatal", repr(exc)))
+        return
+    result_q.put(("ready", None))
+
+    def reply(request_id, future: Future):
+        batch_id, size, run_seconds = future.batch_info
+        exc = future.exception()
+        if exc is None:
+            result_q.put(("result", request_id, True, future.result(), batch_id, size, run_seconds))
+        else:
+            result_q.put(("result", request_id, False, repr(exc), batch_id, size, run_seconds))
+
+    while True:
+        message = request_q.get()
+        if message is None:
+            batcher.close()
+            return
+        request_id, payload = message
+        batcher.submit(payload).add_done_callback(lambda f, rid=request_id: reply(rid, f))
+
+
+class InferenceServer:
+    """
+    Client side of the model process: submit() returns a Future resolved by a
+    reader thread. The process is started lazily and restarted if it dies;
+    after a failed start or a crash, start() raises the last error instead
+    of respawning until `restart_backoff` seconds have passed.
+    """
+
+    def __init__(
+        self,
+        batch_fn: str = DEFAULT_BATCH_FN,
+        max_batch_size: int = LLM_BATCH_MAX_SIZE,
+        max_wait_ms: float = LLM_BATCH_MAX_WAIT_MS,
+        timeout: float = LLM_INFERENCE_TIMEOUT_SECONDS,
+        restart_backoff: float = LLM_INFERENCE_RESTART_BACKOFF_SECONDS,
+    ):
+        self._batch_fn = batch_fn
+        self._max_batch_size = max_batch_size
+        self._max_wait_ms = max_wait_ms
+        self._timeout = timeout
+        self._restart_backoff = restart_backoff
+        self._ctx = multiprocessing.get_context("spawn")
+        self._lock = threading.Lock()
+        self._process = None
+        self._request_q = None
+        self._result_q = None
+        self._reader = None
+        self._ready = threading.Event()
+        self._error: Optional[str] = None  # why the last process failed
+        self._failed_at: Optional[float] = None
+        self._pending: Dict[int, tuple] = {}
+        self._ids = itertools.count(1)
+        self._last_batch_key = None
+        self._stats = BatchStats()
+
+    def start(self, wait: bool = True):
+        with self._lock:
+            if self._failed_at is not None:
+                # a failed process may still be alive for a moment after reporting
+                if time.monotonic() - self._failed_at < self._restart_backoff:
+                    raise RuntimeError(f"inference process unavailable: {self._error}")
+                if self._process is not None and self._process.is_alive():
+                    self._process.terminate()
+            elif self._process is not None and self._process.is_alive():
+                return
+            self._ready.clear()
+            self._error = self._failed_at = None
+            self._request_q = self._ctx.Queue()
+            self._result_q = self._ctx.Queue()
+            self._process = self._ctx.Process(
+                target=_serve,
+                args=(self._request_q, self._result_q, self._batch_fn, self._max_batch_size, self._max_wait_ms),
+                name="llm-inference",
+                daemon=True,
+            )
+            self._process.start()
+            self._reader = threading.Thread(
+                target=self._read_results,
+                args=(self._process, self._result_q),
+                name="llm-inference-reader",
+                daemon=True,
+            )
+            self._reader.start()
+        if not wait:
+            return
+        if not self._ready.wait(self._timeout):
+            raise RuntimeError("inference process did not become ready")
+        if self._error is not None:
+            raise RuntimeError(f"inference process failed to start: {self._error}")
+
+    def submit(self, structured_input: dict) -> Future:
+        self.start()
+        future: Future = Future()
+        request_id = next(self._ids)
+        future.request_id = request_id
+        with self._lock:
+            self._pending[request_id] = (future, time.monotonic())
+            self._request_q.put((request_id, structured_input))
+        return future
+
+    def generate(self, structured_input: dict) -> str:
+        future = self.submit(structured_input)
+        try:
+            return future.result(timeout=self._timeout)
+        except FutureTimeout:
+            with self._lock:
+                self._pending.pop(future.request_id, None)
+            raise
+
+    def _read_results(self, process, result_q):
+        while True:
+            try:
+                message = result_q.get(timeout=0.5)
+            except queue.Empty:
+                if not process.is_alive():
+                    self._record_failure(process, f"inference process exited ({process.exitcode})")
+                    self._fail_pending(RuntimeError("inference process exited"))
+                    return
+                continue
+            kind = message[0]
+            if kind == "ready":
+                self._ready.set()
+            elif kind == "fatal":
+                logger.error("Inference process failed to start: %s", message[1])
+                self._record_failure(process, message[1])
+                self._fail_pending(RuntimeError(message[1]))
+                self._ready.set()
+                return
+            elif kind == "result":
+                _, request_id, ok, value, batch_id, size, run_seconds = message
+                if (process.pid, batch_id) != self._last_batch_key:
+                    self._last_batch_key = (process.pid, batch_id)
+                    self._stats.record_batch(size, run_seconds)
+                with self._lock:
+                    pending = self._pending.pop(request_id, None)
+                if pending is None:
+                    continue  # caller timed out and gave up
+                future, submitted = pending
+                self._stats.record_request(size, time.monotonic() - submitted)
+                if ok:
+                    future.set_result(value)
+                else:
+                    future.set_exception(RuntimeError(value))
+
+    def _record_failure(self, process, error: str):
+        with self._lock:
+            if process is not self._process:
+                return  # shut down on purpose
+            self._error = error
+            self._failed_at = time.monotonic()
+
+    def _fail_pending(self, exc: Exception):
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        for future, _ in pending.values():
+            if not future.done():
+                future.set_exception(exc)
+
+    def stats(self) -> dict:
+        with self._lock:
+            alive = self._process is not None and self._process.is_alive()
+            inflight = len(self._pending)
+        return {
+            "running": alive,
+            "inflight": inflight,
+            "last_error": self._error,
+            "max_batch_size": self._max_batch_size,
+            "max_wait_ms": self._max_wait_ms,
+            **self._stats.snapshot(),
+        }
+
+    def shutdown(self, timeout: float = 5.0):
+        with self._lock:
+            process, self._process = self._process, None
+            request_q = self._request_q
+        if process is None:
+            return
+        try:
+            request_q.put(None)
+            process.join(timeout)
+        finally:
+            if process.is_alive():
+                process.terminate()
+            self._fail_pending(RuntimeError("inference server shut down"))
+
+
+_server: Optional[InferenceServer] = None
+_server_lock = threading.Lock()
+
+
+def inference_server() -> InferenceServer:
+    global _server
+    with _server_lock:
+        if _server is None:
+            _server = InferenceServer()
+        return _server
+
+
+def shutdown_inference_server():
+    with _server_lock:
+        server = _server
+    if server is not None:
+        server.shutdown()
@@ -2,7 +2,11 @@
 
 import logging
 import os
-from typing import Dict, Optional
+from typing import Dict, List, Optional
+
+from services.api.app.config import EXPLANATION_CACHE_ENABLED, LLM_INFERENCE_SERVER
+from services.api.app.services.explanation_cache import explanation_cache, explanation_key
+from services.api.app.services.model_registry import HF_GENERATOR, model_registry
 
 logger = logging.getLogger(__name__)
 
@@ -15,18 +19,58 @@ except Exception:
 
 
 class LLMClient:
-    _hf_generator = None
     _hf_model_name = os.getenv("HF_LLM_MODEL", "distilgpt2")
 
     @classmethod
     def _init_hf(cls):
         if not HF_AVAILABLE:
             raise RuntimeError("HuggingFace transformers not available")
-        if cls._hf_generator is None:
-            cls._hf_generator = pipeline(
-                "text-generation", model=cls._hf_model_name, max_length=160
-            )
-        return cls._hf_generator
+        return model_registry().get(HF_GENERATOR, cls._load_hf)
+
+    @classmethod
+    def _load_hf(cls):
+        generator = pipeline("text-generation", model=cls._hf_model_name, max_length=160)
+        # GPT-2 style models have no pad token; batched generation needs
+        # one, and left padding keeps every prompt adjacent to its output.
+        tokenizer = generator.tokenizer
+        if tokenizer.pad_token_id is None:
+            tokenizer.pad_token_id = generator.model.config.eos_token_id
+        tokenizer.padding_side = "left"
+        return generator
+
+    @staticmethod
+    def build_prompt(structured_input: Dict) -> str:
+        return (
+            "You are a concise medical workflow allocator. Given the structured data, "
+            "produce a professional 2-3 sentence explanation for the assignment.\n"
+            f"Input: {structured_input}\nExplanation:"
+        )
+
+    @staticmethod
+    def postprocess(text: str) -> str:
+        if "Explanation:" in text:
+            text = text.split("Explanation:", 1)[1].strip()
+        sentences = [s.strip() for s in text.split(".") if s.strip()]
+        if len(sentences) > 2:
+            text = ". ".join(sentences[:2]) + "."
+        return text
+
+    @classmethod
+    def generate_hf_batch(cls, structured_inputs: List[Dict]) -> List[str]:
+        """
+        Generate explanations for several inputs in one batched forward pass.
+        """
+        generator = cls._init_hf()
+        prompts = [cls.build_prompt(item) for item in structured_inputs]
+        outputs = generator(
+            prompts,
+            batch_size=len(prompts),
+            do_sample=True,
+            temperature=0.7,
+            top_k=50,
+            num_return_sequences=1,
+        )
+        return [cls.postprocess(output[0]["generated_text"]) for output in outputs]
 
     @staticmethod
     def _template_explanation(payload: Dict) -> str:
@@ -58,29 +102,28 @@ class LLMClient:
             return cls._template_explanation(structured_input)
 
         if provider in (None, "hf"):
+            key = None
+            if EXPLANATION_CACHE_ENABLED:
+                key = explanation_key(structured_input, "hf", cls._hf_model_name)
+                cached = explanation_cache().get(key)
+                if cached is not None:
+                    return cached
             try:
-                generator = cls._init_hf()
-                prompt = (
-                    "You are a concise medical workflow allocator. Given the structured data, "
-                    "produce a professional 2-3 sentence explanation for the assignment.\n"
-                    f"Input: {structured_input}\nExplanation:"
-                )
-                output = generator(
-                    prompt,
-                    do_sample=True,
-                    temperature=0.7,
-                    top_k=50,
-                    num_return_sequences=1,
-                )
-                text = output[0]["generated_text"]
-                if "Explanation:" in text:
-                    text = text.split("Explanation:", 1)[1].strip()
-                sentences = [s.strip() for s in text.split(".") if s.strip()]
-                if len(sentences) > 2:
-                    text = ". ".join(sentences[:2]) + "."
-                return text
+                if LLM_INFERENCE_SERVER:
+                    # Shared model process that micro-batches concurrent calls.
+                    from services.api.app.services.inference_server import inference_server
+
+                    text = inference_server().generate(structured_input)
+                else:
+                    text = cls.generate_hf_batch([structured_input])[0]
             except Exception as exc:
                 logger.warning("HF generation failed (%s); falling back to template.", exc)
+            else:
+                # template fallbacks are not cached so a transient model
+                # failure does not pin the fallback text
+                if key is not None:
+                    explanation_cache().put(key, text)
+                return text
 
         return cls._template_explanation(structured_input)
 
@@ -0,0 +1,333 @@
+# services/api/app/services/load_test.py
+"""
+Concurrent load generator for the API with per-endpoint latency reports.
+
+Usage:
+    python -m services.api.app.services.load_test \
+        [--url http://127.0.0.1:8000] [--requests 500 | --duration 30] \
+        [--concurrency 16] [--rate 50] \
+        [--mix add_work=2,assign=2,work=3,on_duty=3,pipeline=1] \
+        [--slo assign=p95:250,work=p99:100] [--max-error-rate 0.01] [--output report.json]
+
+Without --url the app (services.api.app.main:app) is driven in-process
+through httpx's ASGI transport, lifespan included, against whatever
+database the environment configures; with --url requests go to a running
+server (e.g. a local uvicorn).
+
+Endpoints of the mix:
+    add_work   POST /add_work with a random case on a known date
+    assign     POST /assign/{work_id} for a pending id (incl. added ones)
+    work       GET  /work
+    on_duty    GET  /resources/on-duty for a known date and time
+    pipeline   GET  /pipeline/{work_id} (also assigns) for a pending id
+
+Each pending id is assigned at most once, so long runs do not keep bumping
+workloads and case counts of completed work; when none is left, an
+add_work request is sent (and counted) instead.
+
+With --rate > 0 requests arrive open-loop (Poisson, --rate per second) and at
+most --concurrency are in flight; latency is measured from the scheduled
+arrival, so waiting for a free slot counts (queueing shows up instead of
+being hidden). With --rate 0 --concurrency clients send back-to-back.
+
+The JSON report has count, error rate, status codes, throughput and
+p50/p95/p99 latency per endpoint, plus the /admin/db and /admin/cache
+snapshots taken after the run (pool waits, cache hit rates). SLOs are
+"endpoint=pNN:ms" targets; the exit status is 1 if any target or
+--max-error-rate is missed.
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import random
+import sys
+import time
+from collections import Counter, deque
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import httpx
+
+from services.api.app.db.synthetic_data import DESCRIPTIONS, WeightedChoice, parse_weights
+from services.api.app.services.pipeline_bench import latency_summary
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MIX = {"add_work": 2, "assign": 2, "work": 3, "on_duty": 3, "pipeline": 1}
+ENDPOINT_PATHS = {
+    "add_work": "POST /add_work",
+    "assign": "POST /assign/{work_id}",
+    "work": "GET /work",
+    "on_duty": "GET /resources/on-duty",
+    "pipeline": "GET /pipeline/{work_id}",
+}
+
+
+class LoadState:
+    """Work ids and dates the request builders draw from."""
+
+    def __init__(self, works: List[dict], rng: random.Random):
+        self.rng = rng
+        self.pending = deque(w["work_id"] for w in works if w.get("status") == "pending")
+        self.dates = sorted({str(w["scheduled_timestamp"])[:10] for w in works if w.get("scheduled_timestamp")})
+        if not self.dates:
+            raise RuntimeError("the target has no work requests to load-test with")
+
+    def request(self, endpoint: str):
+        """
+        (endpoint, method, url, httpx kwargs) for one request of `endpoint`;
+        assign/pipeline become add_work when no pending id is left.
+        """
+        rng = self.rng
+        if endpoint in ("assign", "pipeline") and not self.pending:
+            endpoint = "add_work"
+        if endpoint == "add_work":
+            work_type = rng.choice(sorted(DESCRIPTIONS))
+            return endpoint, "POST", "/add_work", {
+                "json": {
+                    "work_type": work_type,
+                    "description": rng.choice(DESCRIPTIONS[work_type]),
+                    "priority": rng.randint(1, 5),
+                    "scheduled_date": rng.choice(self.dates),
+                    "scheduled_time": f"{rng.randint(7, 18):02d}:{rng.choice((0, 15, 30, 45)):02d}",
+                }
+            }
+        if endpoint == "assign":
+            return endpoint, "POST", f"/assign/{self.pending.popleft()}", {}
+        if endpoint == "work":
+            return endpoint, "GET", "/work", {"params": {"limit": 25}}
+        if endpoint == "on_duty":
+            params = {"target_date": rng.choice(self.dates), "target_time": f"{rng.randint(0, 23):02d}:00"}
+            return endpoint, "GET", "/resources/on-duty", {"params": params}
+        if endpoint == "pipeline":
+            return endpoint, "GET", f"/pipeline/{self.pending.popleft()}", {}
+        raise ValueError(f"unknown endpoint {endpoint!r}; expected one of {', '.join(ENDPOINT_PATHS)}")
+
+    def observe(self, endpoint: str, response: httpx.Response):
+        if endpoint == "add_work" and response.status_code == 200:
+            self.pending.append(response.json()["result"]["work_id"])
+
+
+class EndpointStats:
+    def __init__(self):
+        self.latencies: List[float] = []
+        self.errors = 0
+        self.statuses: Counter = Counter()
+
+    def record(self, seconds: float, status):
+        self.latencies.append(seconds)
+        self.statuses[str(status)] += 1
+        if not isinstance(status, int) or status >= 400:
+            self.errors += 1
+
+    def summary(self, elapsed: float) -> dict:
+        count = len(self.latencies)
+        return {
+            "requests": count,
+            "errors": self.errors,
+            "error_rate": round(self.errors / count, 4) if count else None,
+            "throughput_rps": round(count / elapsed, 2) if elapsed else None,
+            "statuses": dict(self.statuses),
+            **(latency_summary(self.latencies) if count else {}),
+        }
+
+
+async def run_load(
+    client: httpx.AsyncClient,
+    mix: Dict[str, float],
+    requests: Optional[int] = 500,
+    duration: Optional[float] = None,
+    concurrency: int = 16,
+    rate: float = 0.0,
+    seed: int = 0,
+) -> dict:
+    for endpoint in mix:
+        if endpoint not in ENDPOINT_PATHS:
+            raise ValueError(f"unknown endpoint {endpoint!r}; expected one of {', '.join(ENDPOINT_PATHS)}")
+    rng = random.Random(seed)
+    works = (await client.get("/work", params={"limit": 500})).json()["work_requests"]
+    state = LoadState(works, rng)
+    choose = WeightedChoice(mix)
+    stats = {endpoint: EndpointStats() for endpoint in mix}
+    stats.setdefault("add_work", EndpointStats())  # stands in once nothing is pending
+    slots = asyncio.Semaphore(concurrency)
+    started = time.perf_counter()
+    deadline = started + duration if duration else None
+    issued = 0
+
+    def more() -> bool:
+        if deadline is not None:
+            return time.perf_counter() < deadline
+        return issued < requests
+
+    async def send(endpoint: str, arrival: float):
+        endpoint, method, url, kwargs = state.request(endpoint)
+        async with slots:
+            try:
+                response = await client.request(method, url, **kwargs)
+                status = response.status_code
+                state.observe(endpoint, response)
+            except Exception as exc:
+                status = type(exc).__name__
+        stats[endpoint].record(time.perf_counter() - arrival, status)
+
+    if rate > 0:
+        tasks = []
+        next_arrival = started
+        while more():
+            delay = next_arrival - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            issued += 1
+            tasks.append(asyncio.create_task(send(choose(rng), next_arrival)))
+            next_arrival += rng.expovariate(rate)
+        await asyncio.gather(*tasks)
+    else:
+
+        async def client_loop():
+            nonlocal issued
+            while more():
+                issued += 1
+                await send(choose(rng), time.perf_counter())
+
+        await asyncio.gather(*(client_loop() for _ in range(concurrency)))
+
+    elapsed = time.perf_counter() - started
+    total = EndpointStats()
+    for s in stats.values():
+        total.latencies += s.latencies
+        total.errors += s.errors
+        total.statuses.update(s.statuses)
+    return {
+        "elapsed_seconds": round(elapsed, 3),
+        "total": total.summary(elapsed),
+        "endpoints": {
+            endpoint: {"path": ENDPOINT_PATHS[endpoint], **s.summary(elapsed)}
+            for endpoint, s in stats.items()
+            if endpoint in mix or s.latencies
+        },
+    }
+
+
+def parse_slos(spec: Optional[str]) -> Dict[str, Dict[str, float]]:
+    """Parse "assign=p95:250,work=p99:100" into {"assign": {"p95_ms": 250.0}, ...}."""
+    slos: Dict[str, Dict[str, float]] = {}
+    for part in (spec or "").split(","):
+        if not part.strip():
+            continue
+        endpoint, _, target = part.strip().partition("=")
+        percentile, _, ms = target.partition(":")
+        if endpoint not in ENDPOINT_PATHS or percentile not in ("p50", "p90", "p95", "p99") or not ms:
+            raise ValueError(f"expected endpoint=pNN:ms, got {part!r}")
+        slos.setdefault(endpoint, {})[f"{percentile}_ms"] = float(ms)
+    return slos
+
+
+def check_slos(report: dict, slos: Dict[str, Dict[str, float]], max_error_rate: Optional[float] = None) -> List[dict]:
+    """Annotate endpoints with their SLO results; returns the misses."""
+    missed = []
+    for endpoint, result in report["endpoints"].items():
+        targets = dict(slos.get(endpoint, {}))
+        if max_error_rate is not None:
+            targets["error_rate"] = max_error_rate
+        if not targets:
+            continue
+        result["slo"] = {}
+        for metric, target in targets.items():
+            actual = result.get(metric)
+            met = actual is not None and actual <= target
+            result["slo"][metric] = {"target": target, "actual": actual, "met": met}
+            if not met:
+                missed.append({"endpoint": endpoint, "metric": metric, "target": target, "actual": actual})
+    return missed
+
+
+@asynccontextmanager
+async def _client(url: Optional[str], concurrency: int, timeout: float):
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    if url:
+        async with httpx.AsyncClient(base_url=url, limits=limits, timeout=timeout) as client:
+            yield client
+        return
+    from services.api.app.main import app
+
+    # ASGITransport does not send lifespan events; run startup/shutdown here
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://loadtest", limits=limits, timeout=timeout
+        ) as client:
+            yield client
+
+
+async def _server_snapshot(client: httpx.AsyncClient) -> dict:
+    snapshot = {}
+    for name, path in (("db", "/admin/db"), ("cache", "/admin/cache")):
+        try:
+            body = (await client.get(path)).json()
+            body.pop("status", None)
+            snapshot[name] = body
+        except Exception as exc:
+            snapshot[name] = {"error": repr(exc)}
+    return snapshot
+
+
+async def run(args) -> dict:
+    mix = parse_weights(args.mix, DEFAULT_MIX)
+    async with _client(args.url, args.concurrency, args.timeout) as client:
+        report = await run_load(
+            client,
+            mix,
+            requests=args.requests,
+            duration=args.duration,
+            concurrency=args.concurrency,
+            rate=args.rate,
+            seed=args.seed,
+        )
+        report["server"] = await _server_snapshot(client)
+    return {
+        "generated_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "target": args.url or "in-process",
+        "concurrency": args.concurrency,
+        "rate": args.rate,
+        "mix": mix,
+        **report,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load-test the API endpoints.")
+    parser.add_argument("--url", help="Base URL of a running server (default: in-process ASGI)")
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--duration", type=float, help="Run for this many seconds instead")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--rate", type=float, default=0.0, help="Arrivals per second (0: closed loop)")
+    parser.add_argument("--mix", help="endpoint=weight list (default: %s)" % ",".join(f"{k}={v}" for k, v in DEFAULT_MIX.items()))
+    parser.add_argument("--slo", help='Latency targets, e.g. "assign=p95:250,work=p99:100"')
+    parser.add_argument("--max-error-rate", type=float)
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Also write the JSON report to this file")
+    args = parser.parse_args(argv)
+
+    slos = parse_slos(args.slo)
+    report = asyncio.run(run(args))
+    missed = check_slos(report, slos, args.max_error_rate)
+    if slos or args.max_error_rate is not None:
+        report["slo_missed"] = missed
+
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.output:
+        Path(args.output).write_text(text + "\n", encoding="utf-8")
+    return 1 if missed else 0
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    logging.getLogger("httpx").setLevel(logging.WARNING)  # one line per request
+    sys.exit(main())
@@ -0,0 +1,157 @@
+# services/api/app/services/model_registry.py
+"""
+Process-wide registry of loaded models.
+
+Each model is loaded at most once per process, on first use or during
+warmup, and shared by all threads. Loads of different models can run in
+parallel; concurrent callers of the same model wait for the one load in
+progress. A failed load is not cached: the next caller retries.
+
+The API lifespan can warm the models named in MODEL_WARMUP (e.g.
+"embedding,hf") in the background; /healthz reports 503 until that is done.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+EMBEDDING_MODEL = "embedding"
+HF_GENERATOR = "hf"
+
+
+class ModelRegistry:
+    def __init__(self):
+        self._models: Dict[str, Any] = {}
+        self._load_locks: Dict[str, threading.Lock] = {}
+        self._info: Dict[str, dict] = {}
+        self._lock = threading.Lock()
+        self._warmup_pending: set = set()
+
+    def get(self, name: str, loader: Callable[[], Any]) -> Any:
+        model = self._models.get(name)
+        if model is not None:
+            return model
+        with self._lock:
+            load_lock = self._load_locks.setdefault(name, threading.Lock())
+        with load_lock:
+            model = self._models.get(name)
+            if model is not None:
+                return model
+            self._set_info(name, state="loading")
+            started = time.monotonic()
+            try:
+                model = loader()
+            except Exception as exc:
+                self._set_info(name, state="failed", error=repr(exc))
+                raise
+            self._set_info(
+                name, state="loaded", error=None, load_seconds=round(time.monotonic() - started, 3)
+            )
+            self._models[name] = model
+            return model
+
+    def loaded(self, name: str) -> bool:
+        return name in self._models
+
+    def unload(self, name: Optional[str] = None):
+        with self._lock:
+            names = [name] if name else list(self._models)
+            for n in names:
+                self._models.pop(n, None)
+                self._info.pop(n, None)
+
+    def _set_info(self, name: str, **fields):
+        with self._lock:
+            self._info.setdefault(name, {}).update(fields)
+
+    # -- warmup / readiness -----------------------------------------------------
+    def begin_warmup(self, names: Iterable[str]):
+        with self._lock:
+            self._warmup_pending.update(names)
+            for name in names:
+                self._info.setdefault(name, {"state": "loading"})
+
+    def end_warmup(self, name: str):
+        with self._lock:
+            self._warmup_pending.discard(name)
+
+    @property
+    def ready(self) -> bool:
+        with self._lock:
+            return not self._warmup_pending
+
+    def status(self) -> dict:
+        with self._lock:
+            return {
+                "ready": not self._warmup_pending,
+                "warming": sorted(self._warmup_pending),
+                "models": {name: dict(info) for name, info in self._info.items()},
+            }
+
+
+_registry = ModelRegistry()
+
+
+def model_registry() -> ModelRegistry:
+    return _registry
+
+
+def _warm(name: str):
+    if name == EMBEDDING_MODEL:
+        from services.api.app.services.embeddings import get_model
+
+        get_model()
+    elif name == HF_GENERATOR:
+        from services.api.app.config import LLM_INFERENCE_SERVER
+
+        if LLM_INFERENCE_SERVER:
+            # the generator lives in the inference process
+            from services.api.app.services.inference_server import inference_server
+
+            inference_server().start()
+        else:
+            from services.api.app.services.llm_client import LLMClient
+
+            LLMClient._init_hf()
+    else:
+        raise ValueError(f"unknown model {name!r}")
+
+
+def warmup(names: Iterable[str]) -> Dict[str, Optional[str]]:
+    """
+    Load the named models now. Failures are logged and reported (the
+    callers have fallbacks) but do not keep the service unready.
+    """
+    names = list(dict.fromkeys(n for n in names if n))
+    _registry.begin_warmup(names)
+    errors: Dict[str, Optional[str]] = {}
+    for name in names:
+        try:
+            _warm(name)
+            if not _registry.loaded(name):
+                # loaded elsewhere, e.g. by the inference process
+                _registry._set_info(name, state="ready", error=None)
+            errors[name] = None
+        except Exception as exc:
+            logger.warning("Warmup of model %s failed: %s", name, exc)
+            _registry._set_info(name, state="failed", error=repr(exc))
+            errors[name] = repr(exc)
+        finally:
+            _registry.end_warmup(name)
+    return errors
+
+
+def start_warmup(names: Iterable[str]) -> Optional[threading.Thread]:
+    """Run warmup() on a background thread; readiness flips when it ends."""
+    names = list(dict.fromkeys(n for n in names if n))
+    if not names:
+        return None
+    _registry.begin_warmup(names)
+    thread = threading.Thread(target=warmup, args=(names,), name="model-warmup", daemon=True)
+    thread.start()
+    return thread
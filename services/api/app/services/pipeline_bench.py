@@ -0,0 +1,414 @@
+# services/api/app/services/pipeline_bench.py
+"""
+Per-stage benchmark of the assignment pipeline on generated datasets.
+
+Usage:
+    python -m services.api.app.services.pipeline_bench \
+        [--sizes small,medium] [--stages analyzer,finder,...] [--ops 200] \
+        [--output report.json] [--baseline old.json] [--threshold 0.1]
+    python -m services.api.app.services.pipeline_bench --compare old.json new.json
+
+For every size a dataset is generated with db/synthetic_data.py and loaded
+into SQLite once; every stage then runs in its own process against a fresh
+copy of that database (so peak RSS is per stage and the end-to-end run's
+writes do not leak into other stages). Stages:
+
+    analyzer             WorkAnalyzerAgent.run
+    finder               ResourceFinderAgent.run, semantic fallback disabled
+    finder_faiss         ResourceFinderAgent.run with the FAISS fallback
+    availability         AvailabilityCheckerAgent.run
+    assignment_template  AssignmentAgent.run(commit=False), template text
+    assignment_hf        AssignmentAgent.run(commit=False), HF text
+    end_to_end           AssignmentController.assign
+
+Inputs of a stage are prepared by running the earlier stages first; only
+the stage itself is timed. Each result reports latency percentiles,
+ops/sec, SQL statements issued per op and peak RSS. Stages whose optional
+dependencies are missing report an error instead of aborting the run.
+
+With --baseline (or --compare) results are matched by (size, stage) and a
+regression is flagged when latency, queries/op or peak RSS grow, or ops/sec
+drops, by more than --threshold; the exit status is then 1.
+"""
+
+import argparse
+import json
+import logging
+import os
+import random
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Sequence
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+ROOT_DIR = Path(__file__).resolve().parents[4]
+SIZES = {
+    "small": {"resources": 100, "days": 7, "work_requests": 2000},
+    "medium": {"resources": 1000, "days": 14, "work_requests": 20000},
+    "large": {"resources": 10000, "days": 30, "work_requests": 200000},
+}
+STAGES = (
+    "analyzer",
+    "finder",
+    "finder_faiss",
+    "availability",
+    "assignment_template",
+    "assignment_hf",
+    "end_to_end",
+)
+
+# metric -> direction in which a change is a regression
+COMPARED_METRICS = {
+    "p50_ms": "up",
+    "p95_ms": "up",
+    "ops_per_sec": "down",
+    "queries_per_op": "up",
+    "peak_rss_mb": "up",
+}
+
+
+# -- measurement (runs inside the per-stage process) -----------------------------
+class StatementCounter:
+    """Counts SQL statements run on SQLite connections opened by the pool."""
+
+    IGNORED = ("SELECT 1", "BEGIN", "COMMIT", "ROLLBACK")
+
+    def __init__(self):
+        self.count = 0
+
+    def install(self):
+        from services.api.app.db import mysql
+
+        pool = mysql._pool
+        connect = pool._factory
+
+        def traced_connect():
+            conn = connect()
+            conn.set_trace_callback(self._trace)
+            return conn
+
+        pool._factory = traced_connect
+        with pool._cond:  # connections already pooled by an earlier run
+            for slot in pool._idle:
+                slot.raw.set_trace_callback(self._trace)
+
+    def _trace(self, sql: str):
+        if not sql.lstrip().upper().startswith(self.IGNORED):
+            self.count += 1
+
+
+def peak_rss_mb() -> float:
+    # ru_maxrss is in KiB on Linux (bytes on macOS)
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def latency_summary(seconds: Sequence[float]) -> dict:
+    ms = np.asarray(seconds, dtype=np.float64) * 1000.0
+    p50, p90, p95, p99 = np.percentile(ms, [50, 90, 95, 99])
+    return {
+        "mean_ms": round(float(ms.mean()), 3),
+        "p50_ms": round(float(p50), 3),
+        "p90_ms": round(float(p90), 3),
+        "p95_ms": round(float(p95), 3),
+        "p99_ms": round(float(p99), 3),
+        "max_ms": round(float(ms.max()), 3),
+    }
+
+
+def sample_work_ids(count: int, seed: int = 0) -> List[str]:
+    """
+    `count` distinct pending work ids. Raises when there are fewer: repeating
+    an id would time re-assignments of already assigned work.
+    """
+    from services.api.app.db.mysql import get_connection
+
+    conn = get_connection()
+    try:
+        rows = conn.execute(
+            "SELECT work_id FROM work_requests WHERE status = 'pending' ORDER BY work_id"
+        ).fetchall()
+    finally:
+        conn.close()
+    ids = [r[0] for r in rows]
+    if not ids:
+        raise RuntimeError("no pending work requests in the database")
+    if count > len(ids):
+        raise RuntimeError(
+            f"{count} ops (incl. warmup) requested but only {len(ids)} pending work requests"
+        )
+    return random.Random(seed).sample(ids, count)
+
+
+def _stage(stage: str, work_ids: List[str]):
+    """Return (inputs, op) for `stage`; preparing inputs is not timed."""
+    if stage not in STAGES:
+        raise ValueError(f"unknown stage {stage!r}; expected one of {', '.join(STAGES)}")
+    from services.api.app.agents import resource_finder_agent
+    from services.api.app.agents.assignment_agent import AssignmentAgent
+    from services.api.app.agents.availability_checker_agent import AvailabilityCheckerAgent
+    from services.api.app.agents.resource_finder_agent import ResourceFinderAgent
+    from services.api.app.agents.work_analyzer_agent import WorkAnalyzerAgent
+    from services.api.app.controllers.assignment_controller import AssignmentController
+    from services.api.app.services import llm_client
+
+    analyzer = WorkAnalyzerAgent()
+    finder = ResourceFinderAgent()
+    checker = AvailabilityCheckerAgent()
+    assigner = AssignmentAgent()
+
+    if stage == "end_to_end":
+        controller = AssignmentController()
+        return work_ids, controller.assign
+    if stage == "analyzer":
+        return [{"work_id": w} for w in work_ids], analyzer.run
+
+    if stage == "finder_faiss":
+        if not resource_finder_agent.FAISS_AVAILABLE:
+            raise RuntimeError("FAISS fallback unavailable (faiss / sentence-transformers missing)")
+        from services.api.app.services.faiss_builder import build_index_from_db
+
+        build_index_from_db()
+    else:
+        # the other stages measure the structured path only
+        resource_finder_agent.FAISS_AVAILABLE = False
+    analyses = [analyzer.run({"work_id": w}) for w in work_ids]
+    if stage in ("finder", "finder_faiss"):
+        return analyses, finder.run
+
+    found = [finder.run(a) for a in analyses]
+    if stage == "availability":
+        return found, checker.run
+
+    provider = "hf" if stage == "assignment_hf" else "template"
+    if provider == "hf" and not llm_client.HF_AVAILABLE:
+        raise RuntimeError("HF provider unavailable (transformers missing)")
+    inputs = [
+        {
+            **checker.run(f),
+            "work_type": a["work_type"],
+            "priority": a["priority"],
+            "scheduled_timestamp": a["scheduled_timestamp"],
+        }
+        for a, f in zip(analyses, found)
+    ]
+    return inputs, lambda item: assigner.run(item, llm_provider=provider, commit=False)
+
+
+def run_stage(stage: str, ops: int = 200, warmup: int = 20, seed: int = 0) -> dict:
+    """Time `ops` calls of one stage in this process (DB from the environment)."""
+    counter = StatementCounter()
+    counter.install()
+    work_ids = sample_work_ids(ops + warmup, seed)
+    inputs, op = _stage(stage, work_ids)
+    for item in inputs[:warmup]:
+        op(item)
+
+    counter.count = 0
+    timings = []
+    started = time.perf_counter()
+    for item in inputs[warmup:]:
+        t0 = time.perf_counter()
+        op(item)
+        timings.append(time.perf_counter() - t0)
+    seconds = time.perf_counter() - started
+    return {
+        "stage": stage,
+        "ops": len(timings),
+        "seconds": round(seconds, 4),
+        "ops_per_sec": round(len(timings) / seconds, 1) if seconds else None,
+        **latency_summary(timings),
+        "queries": counter.count,
+        "queries_per_op": round(counter.count / len(timings), 3),
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+# -- orchestration -------------------------------------------------------------------
+def _module_env(**overrides) -> Dict[str, str]:
+    env = dict(os.environ)
+    env.update({k: str(v) for k, v in overrides.items()})
+    env.setdefault("PYTHONPATH", str(ROOT_DIR))
+    return env
+
+
+def prepare_dataset(size: str, workdir: Path, seed: int) -> Path:
+    """Generate the dataset for `size` and load it into a template database."""
+    spec = SIZES[size]
+    target = workdir / size
+    db = target / "template.db"
+    if db.exists():
+        return db
+    subprocess.run(
+        [
+            sys.executable,
+            "-m",
+            "services.api.app.db.synthetic_data",
+            "--out", str(target / "csv"),
+            "--resources", str(spec["resources"]),
+            "--days", str(spec["days"]),
+            "--work-requests", str(spec["work_requests"]),
+            "--seed", str(seed),
+            "--sqlite", str(db),
+        ],
+        check=True,
+        env=_module_env(DB_DIALECT="sqlite", SQLITE_PATH=db),
+    )
+    return db
+
+
+def bench_stage(
+    size: str, stage: str, template_db: Path, workdir: Path, ops: int, warmup: int, seed: int
+) -> dict:
+    stage_dir = workdir / size / stage
+    shutil.rmtree(stage_dir, ignore_errors=True)
+    stage_dir.mkdir(parents=True)
+    db = stage_dir / "work_allocation.db"
+    shutil.copy2(template_db, db)
+    proc = subprocess.run(
+        [
+            sys.executable,
+            "-m",
+            "services.api.app.services.pipeline_bench",
+            "--worker", stage,
+            "--ops", str(ops),
+            "--warmup", str(warmup),
+            "--seed", str(seed),
+        ],
+        capture_output=True,
+        text=True,
+        env=_module_env(
+            DB_DIALECT="sqlite",
+            SQLITE_PATH=db,
+            EMB_CACHE_DIR=stage_dir / "embeddings_cache",
+            MODEL_WARMUP="",
+            # every op must run the stage, not replay a cached explanation
+            EXPLANATION_CACHE_ENABLED="0",
+        ),
+    )
+    lines = proc.stdout.strip().splitlines()
+    if proc.returncode != 0 or not lines:
+        error = (proc.stderr.strip().splitlines() or ["exit status %d" % proc.returncode])[-1]
+        return {"size": size, "stage": stage, "error": error}
+    return {"size": size, **json.loads(lines[-1])}
+
+
+def compare(baseline: dict, current: dict, threshold: float = 0.1) -> List[dict]:
+    """Regressions of `current` against `baseline` (both bench reports)."""
+    previous = {(r["size"], r["stage"]): r for r in baseline.get("results", []) if "error" not in r}
+    regressions = []
+    for result in current.get("results", []):
+        before = previous.get((result["size"], result["stage"]))
+        if before is None or "error" in result:
+            continue
+        for metric, direction in COMPARED_METRICS.items():
+            old, new = before.get(metric), result.get(metric)
+            if old is None or new is None:
+                continue
+            if old == 0:
+                change = 0.0 if new == 0 else float("inf")
+            else:
+                change = (new - old) / old
+            if (change > threshold) if direction == "up" else (change < -threshold):
+                regressions.append(
+                    {
+                        "size": result["size"],
+                        "stage": result["stage"],
+                        "metric": metric,
+                        "baseline": old,
+                        "current": new,
+                        "change": round(change, 4) if change != float("inf") else None,
+                    }
+                )
+    return regressions
+
+
+def _load(path: str) -> dict:
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _split(value: str) -> List[str]:
+    return [v.strip() for v in value.split(",") if v.strip()]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the assignment pipeline stages.")
+    parser.add_argument("--sizes", default="small,medium", help=f"Any of {', '.join(SIZES)}")
+    parser.add_argument("--stages", default=",".join(STAGES))
+    parser.add_argument("--ops", type=int, default=200, help="Timed operations per stage")
+    parser.add_argument("--warmup", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workdir", help="Keep datasets here (default: a temp dir)")
+    parser.add_argument("--output", help="Also write the JSON report to this file")
+    parser.add_argument("--baseline", help="Report of an earlier run to compare against")
+    parser.add_argument("--threshold", type=float, default=0.1)
+    parser.add_argument("--compare", nargs=2, metavar=("BASELINE", "CURRENT"))
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.worker:
+        print(json.dumps(run_stage(args.worker, args.ops, args.warmup, args.seed)))
+        return 0
+
+    if args.compare:
+        baseline, report = _load(args.compare[0]), _load(args.compare[1])
+        baseline_path = args.compare[0]
+    else:
+        report = run_suite(args)
+        baseline = _load(args.baseline) if args.baseline else None
+        baseline_path = args.baseline
+    if baseline is not None:
+        report["comparison"] = {
+            "baseline": baseline_path,
+            "threshold": args.threshold,
+            "regressions": compare(baseline, report, args.threshold),
+        }
+
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.output:
+        Path(args.output).write_text(text + "\n", encoding="utf-8")
+    return 1 if report.get("comparison", {}).get("regressions") else 0
+
+
+def run_suite(args) -> dict:
+    sizes, stages = _split(args.sizes), _split(args.stages)
+    for size in sizes:
+        if size not in SIZES:
+            raise SystemExit(f"unknown size {size!r}; expected one of {', '.join(SIZES)}")
+    workdir = Path(args.workdir) if args.workdir else Path(tempfile.mkdtemp(prefix="pipeline-bench-"))
+    report = {
+        "generated_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": sys.version.split()[0],
+        "ops": args.ops,
+        "seed": args.seed,
+        "sizes": {s: SIZES[s] for s in sizes},
+        "results": [],
+    }
+    try:
+        for size in sizes:
+            template_db = prepare_dataset(size, workdir, args.seed)
+            for stage in stages:
+                logger.info("Running %s / %s", size, stage)
+                report["results"].append(
+                    bench_stage(size, stage, template_db, workdir, args.ops, args.warmup, args.seed)
+                )
+    finally:
+        if not args.workdir:
+            shutil.rmtree(workdir, ignore_errors=True)
+    return report
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    sys.exit(main())
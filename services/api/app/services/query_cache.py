@@ -0,0 +1,125 @@
+# services/api/app/services/query_cache.py
+"""
+Caches in front of the semantic (FAISS) candidate expansion.
+
+ - vectors: LRU of normalized query embeddings keyed on the normalized
+   query text ("<work_type> <description>"), so repeated descriptions skip
+   the encoder;
+ - negative: keys of searches that added no new candidate (query, index
+   version, candidates already found), so repeated fallbacks skip encoding
+   and search entirely. Entries expire after `negative_ttl_seconds`.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Hashable, Optional
+
+import numpy as np
+
+from services.api.app.config import (
+    QUERY_CACHE_MAX_ENTRIES,
+    QUERY_NEGATIVE_CACHE_MAX_ENTRIES,
+    QUERY_NEGATIVE_CACHE_TTL_SECONDS,
+)
+
+
+def normalize_query(query: str) -> str:
+    return " ".join(query.lower().split())
+
+
+class QueryCache:
+    def __init__(
+        self,
+        max_entries: int = QUERY_CACHE_MAX_ENTRIES,
+        negative_max_entries: int = QUERY_NEGATIVE_CACHE_MAX_ENTRIES,
+        negative_ttl_seconds: float = QUERY_NEGATIVE_CACHE_TTL_SECONDS,
+    ):
+        self._max_entries = max_entries
+        self._negative_max = negative_max_entries
+        self._negative_ttl = negative_ttl_seconds
+        self._vectors: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._negative: "OrderedDict[Hashable, float]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.negative_hits = 0
+        self.negative_stores = 0
+        self.evictions = 0
+
+    # -- query vectors -----------------------------------------------------------
+    def get_vector(self, query: str) -> Optional[np.ndarray]:
+        key = normalize_query(query)
+        with self._lock:
+            vector = self._vectors.get(key)
+            if vector is None:
+                self.misses += 1
+                return None
+            self._vectors.move_to_end(key)
+            self.hits += 1
+            return vector
+
+    def put_vector(self, query: str, vector: np.ndarray):
+        if self._max_entries <= 0:
+            return
+        vector = np.array(vector, dtype=np.float32)
+        vector.setflags(write=False)  # shared between callers
+        with self._lock:
+            key = normalize_query(query)
+            self._vectors[key] = vector
+            self._vectors.move_to_end(key)
+            while len(self._vectors) > self._max_entries:
+                self._vectors.popitem(last=False)
+                self.evictions += 1
+
+    # -- negative results ----------------------------------------------------------
+    def is_negative(self, key: Hashable) -> bool:
+        with self._lock:
+            stored_at = self._negative.get(key)
+            if stored_at is None:
+                return False
+            if self._negative_ttl > 0 and time.monotonic() - stored_at >= self._negative_ttl:
+                del self._negative[key]
+                return False
+            self._negative.move_to_end(key)
+            self.negative_hits += 1
+            return True
+
+    def mark_negative(self, key: Hashable):
+        if self._negative_max <= 0:
+            return
+        with self._lock:
+            self._negative[key] = time.monotonic()
+            self._negative.move_to_end(key)
+            self.negative_stores += 1
+            while len(self._negative) > self._negative_max:
+                self._negative.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._vectors.clear()
+            self._negative.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else None,
+                "entries": len(self._vectors),
+                "evictions": self.evictions,
+                "negative_hits": self.negative_hits,
+                "negative_stores": self.negative_stores,
+                "negative_entries": len(self._negative),
+                "negative_ttl_seconds": self._negative_ttl,
+            }
+
+
+_cache = QueryCache()
+
+
+def query_cache() -> QueryCache:
+    return _cache
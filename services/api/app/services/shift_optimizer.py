@@ -0,0 +1,310 @@
+# services/api/app/services/shift_optimizer.py
+"""
+Shift-level optimal allocation.
+
+The regular pipeline assigns one work item at a time to its top-scored
+candidate, so a burst of urgent studies piles onto the same radiologist. This
+module allocates every pending request of a date at once:
+
+ 1. a work x calendar-entry score matrix is built in NumPy from the
+    vectorised components in utils.scoring, i.e. the same weights as
+    compute_candidate_score (role, skill, experience, availability, workload,
+    priority bonus);
+ 2. each calendar entry gets a capacity of `max_workload - current_workload`
+    slots, slot k scoring the workload component at `current_workload + k`;
+ 3. identical matrix rows (same specialties and covering shifts) are merged
+    into classes and the resulting transportation problem is solved as a
+    min-cost flow (network LP, integral by total unimodularity) with HiGHS.
+
+Assigning an item always outweighs any score difference, so the solver first
+maximises the number of assigned items and then the total score.
+
+Usage:
+    python -m services.api.app.services.shift_optimizer --date 2024-11-10 [--dry-run]
+"""
+
+import argparse
+import json
+import logging
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from services.api.app.agents.assignment_agent import AssignmentAgent
+from services.api.app.agents.work_analyzer_agent import WorkAnalyzerAgent
+from services.api.app.db.repositories import (
+    AssignmentRepo,
+    ResourceCalendarRepo,
+    WorkRequestsRepo,
+)
+from services.api.app.services.llm_client import LLMClient
+from services.api.app.utils.scoring import (
+    MISSING_CODE,
+    availability_scores,
+    compute_candidate_score,
+    encode_specialties,
+    experience_scores,
+    priority_bonuses,
+    role_match_scores,
+    skill_scores,
+    workload_scores,
+)
+from services.api.app.utils.time_utils import time_to_seconds
+
+logger = logging.getLogger(__name__)
+
+# optional heavy imports
+try:
+    from scipy import sparse
+    from scipy.optimize import linprog
+
+    SCIPY_AVAILABLE = True
+except Exception:
+    SCIPY_AVAILABLE = False
+
+GENERAL_SPECIALTY = "General_Radiologist"
+DEFAULT_MAX_WORKLOAD = 12  # workload score reaches 0 at 12 open cases
+ASSIGNMENT_BONUS = 10.0  # > any achievable score gap, favours coverage first
+INFEASIBLE = -1.0
+
+
+def build_score_matrix(analyses: List[Dict], entries: List[Dict]) -> np.ndarray:
+    """
+    Return a (W, E) matrix with the workload- and priority-independent part of
+    compute_candidate_score (0.25 role + 0.20 skill + 0.20 experience +
+    0.20 availability). Pairs that the pipeline would never consider (wrong
+    specialty or scheduled time outside the shift) are set to INFEASIBLE.
+    """
+    vocabulary = {GENERAL_SPECIALTY: 0}
+    entry_spec, vocabulary = encode_specialties([r.get("specialty") for r in entries], vocabulary)
+    req, vocabulary = encode_specialties([a["required_specialty"] for a in analyses], vocabulary)
+    alt, vocabulary = encode_specialties([a["alternate_specialty"] for a in analyses], vocabulary)
+    at = np.array(
+        [time_to_seconds(_as_datetime(a["scheduled_timestamp"]).time()) for a in analyses]
+    )[:, None]
+    start = np.array([time_to_seconds(r["available_from"]) for r in entries])[None, :]
+    end = np.array([time_to_seconds(r["available_to"]) for r in entries])[None, :]
+
+    spec = entry_spec[None, :]
+    req, alt = req[:, None], alt[:, None]
+    role = role_match_scores(spec, req, vocabulary[GENERAL_SPECIALTY])
+    availability = availability_scores(start, end, at)
+    profile = 0.20 * skill_scores(
+        [np.nan if r.get("skill_level") is None else r["skill_level"] for r in entries]
+    ) + 0.20 * experience_scores(
+        [np.nan if r.get("total_cases_handled") is None else r["total_cases_handled"] for r in entries]
+    )
+
+    feasible = ((spec == req) | (spec == alt)) & (spec != MISSING_CODE) & (availability > 0)
+    matrix = 0.25 * role + profile[None, :] + 0.20 * availability
+    return np.where(feasible, matrix, INFEASIBLE)
+
+
+def solve_allocation(
+    matrix: np.ndarray,
+    priorities: np.ndarray,
+    workloads: List[Optional[int]],
+    max_workload: int = DEFAULT_MAX_WORKLOAD,
+) -> np.ndarray:
+    """
+    Solve the capacity-constrained assignment for a (W, E) score matrix.
+    Returns an int array of length W holding the chosen entry index or -1.
+    """
+    if not SCIPY_AVAILABLE:
+        raise RuntimeError("scipy not installed")
+    n_work, n_entries = matrix.shape
+    choice = np.full(n_work, -1, dtype=np.int64)
+    if n_work == 0 or n_entries == 0:
+        return choice
+
+    # Slot k of entry e carries the workload component at workload w_e + k.
+    slot_entry, slot_gain = [], []
+    for e, workload in enumerate(workloads):
+        base = workload or 0
+        for k in range(max(0, max_workload - base)):
+            # compute_candidate_score treats a NULL workload as 0.8
+            gain = workload_scores(np.nan if k == 0 and workload is None else base + k)
+            slot_entry.append(e)
+            slot_gain.append(0.15 * float(gain))
+    if not slot_entry:
+        return choice
+    slot_entry = np.asarray(slot_entry)
+    slot_gain = np.asarray(slot_gain)
+
+    # Merge identical rows; within a class only priority tiers differ.
+    classes, class_of = np.unique(matrix, axis=0, return_inverse=True)
+    class_of = class_of.reshape(-1)
+    clamped = np.clip(priorities, 1, 5)
+    tiers = sorted({(c, p) for c, p in zip(class_of.tolist(), clamped.tolist())})
+    tier_class = np.array([c for c, _ in tiers])
+    tier_prio = np.array([p for _, p in tiers], dtype=np.float64)
+    tier_cap = np.array(
+        [np.count_nonzero((class_of == c) & (clamped == p)) for c, p in tiers],
+        dtype=np.float64,
+    )
+    pair_class, pair_entry = np.nonzero(classes > INFEASIBLE)
+    if pair_class.size == 0:
+        return choice
+
+    n_tiers, n_pairs, n_slots = len(tiers), pair_class.size, slot_entry.size
+    n_classes = classes.shape[0]
+    # Variables: [tiers | class->entry pairs | entry slots]; flow conservation
+    # at every class node and every entry node.
+    cost = -np.concatenate(
+        [
+            ASSIGNMENT_BONUS + priority_bonuses(tier_prio),
+            classes[pair_class, pair_entry],
+            slot_gain,
+        ]
+    )
+    pair_cols = n_tiers + np.arange(n_pairs)
+    slot_cols = n_tiers + n_pairs + np.arange(n_slots)
+    rows = np.concatenate([tier_class, pair_class, n_classes + pair_entry, n_classes + slot_entry])
+    cols = np.concatenate([np.arange(n_tiers), pair_cols, pair_cols, slot_cols])
+    vals = np.concatenate([np.ones(n_tiers), -np.ones(n_pairs), np.ones(n_pairs), -np.ones(n_slots)])
+    a_eq = sparse.csr_matrix(
+        (vals, (rows, cols)), shape=(n_classes + n_entries, n_tiers + n_pairs + n_slots)
+    )
+    bounds = np.column_stack(
+        [
+            np.zeros(n_tiers + n_pairs + n_slots),
+            np.concatenate([tier_cap, np.full(n_pairs, np.inf), np.ones(n_slots)]),
+        ]
+    )
+    result = linprog(
+        cost,
+        A_eq=a_eq,
+        b_eq=np.zeros(n_classes + n_entries),
+        bounds=bounds,
+        method="highs-ds",
+    )
+    if result.status != 0:
+        raise RuntimeError(f"shift optimisation failed: {result.message}")
+
+    flows = np.rint(result.x[n_tiers : n_tiers + n_pairs]).astype(np.int64)
+    # Within a class, hand the best entries to the highest priorities.
+    for c in range(n_classes):
+        members = np.flatnonzero(class_of == c)
+        if members.size == 0:
+            continue
+        members = members[np.argsort(-clamped[members], kind="stable")]
+        picked = np.flatnonzero((pair_class == c) & (flows > 0))
+        picked = picked[np.argsort(-classes[c, pair_entry[picked]], kind="stable")]
+        slots = np.repeat(pair_entry[picked], flows[picked])
+        choice[members[: slots.size]] = slots[: members.size]
+    return choice
+
+
+def optimize_shift(
+    date_str: str,
+    dry_run: bool = False,
+    llm_provider: Optional[str] = "template",
+    max_workload: int = DEFAULT_MAX_WORKLOAD,
+) -> Dict:
+    """
+    Allocate every pending work request scheduled on `date_str`.
+    With dry_run=True nothing is written to the database.
+    """
+    works = WorkRequestsRepo.list_pending_on_date(date_str)
+    analyses = [WorkAnalyzerAgent.analyze(w) for w in works]
+    entries = ResourceCalendarRepo.get_on_duty(date_str)
+
+    matrix = build_score_matrix(analyses, entries) if analyses and entries else np.empty(
+        (len(analyses), len(entries))
+    )
+    priorities = np.array([a["priority"] for a in analyses], dtype=np.int64)
+    choice = solve_allocation(
+        matrix, priorities, [e.get("current_workload") for e in entries], max_workload
+    )
+
+    # Walk assignments in priority order so reported workloads follow the
+    # slot order used by the solver.
+    order = sorted(range(len(analyses)), key=lambda i: -min(max(priorities[i], 1), 5))
+    workload_now = {e["calendar_id"]: e.get("current_workload") for e in entries}
+    assignments, writes = [], []
+    for i in order:
+        analysis = analyses[i]
+        if choice[i] < 0:
+            assignments.append(
+                {"work_id": analysis["work_id"], "assigned_to": None, "explanation": "No candidate available"}
+            )
+            continue
+        entry = entries[choice[i]]
+        calendar_entry = {**entry, "current_workload": workload_now[entry["calendar_id"]]}
+        scheduled_dt = _as_datetime(analysis["scheduled_timestamp"])
+        selected = {
+            "resource_id": entry["resource_id"],
+            "name": entry.get("name"),
+            "specialty": entry.get("specialty"),
+            "skill_level": entry.get("skill_level"),
+            "total_cases_handled": entry.get("total_cases_handled"),
+            **compute_candidate_score(
+                candidate=entry,
+                calendar_entry=calendar_entry,
+                scheduled_dt=scheduled_dt,
+                required_specialty=analysis["required_specialty"],
+                priority=analysis["priority"],
+            ),
+            "calendar_id": entry["calendar_id"],
+            "scheduled_timestamp": scheduled_dt.isoformat(),
+        }
+        workload_now[entry["calendar_id"]] = (workload_now[entry["calendar_id"]] or 0) + 1
+        explanation = LLMClient.generate_explanation(
+            AssignmentAgent.build_explanation_input(analysis, selected), provider=llm_provider
+        )
+        assignments.append(
+            {
+                "work_id": analysis["work_id"],
+                "work_type": analysis["work_type"],
+                "priority": analysis["priority"],
+                "scheduled_timestamp": scheduled_dt.isoformat(),
+                "assigned_to": entry["resource_id"],
+                "explanation": explanation,
+                "selected": selected,
+            }
+        )
+        writes.append(
+            {
+                "work_id": analysis["work_id"],
+                "resource_id": entry["resource_id"],
+                "calendar_id": entry["calendar_id"],
+            }
+        )
+
+    if not dry_run:
+        AssignmentRepo.commit_assignments(writes)
+
+    return {
+        "date": date_str,
+        "dry_run": dry_run,
+        "assignments": assignments,
+        "summary": {
+            "pending": len(analyses),
+            "on_duty_entries": len(entries),
+            "assigned": len(writes),
+            "unassigned": len(analyses) - len(writes),
+            "total_score": round(sum(a["selected"]["score"] for a in assignments if a["assigned_to"]), 4),
+        },
+    }
+
+
+def _as_datetime(value) -> datetime:
+    return value if isinstance(value, datetime) else datetime.fromisoformat(str(value))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Optimally allocate a shift's pending work.")
+    parser.add_argument("--date", required=True, help="Shift date (YYYY-MM-DD)")
+    parser.add_argument("--dry-run", action="store_true", help="Do not write assignments")
+    parser.add_argument("--max-workload", type=int, default=DEFAULT_MAX_WORKLOAD)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+    result = optimize_shift(args.date, dry_run=args.dry_run, max_workload=args.max_workload)
+    logger.info("Shift %s summary: %s", args.date, result["summary"])
+    print(json.dumps(result["summary"], indent=2))
+
+
+if __name__ == "__main__":
+    main()
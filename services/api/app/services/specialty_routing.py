@@ -0,0 +1,132 @@
+# services/api/app/services/specialty_routing.py
+"""
+In-memory specialty routing table.
+
+`specialty_mapping` (a handful of rows that rarely change) and the built-in
+FALLBACK_SPECIALTIES are compiled into one work_type -> (required, alternate)
+table, so analysing a work request no longer needs a DB round trip.
+
+The table is loaded at startup (or on first use), can be reloaded explicitly
+(see POST /admin/routing/reload) and re-checks a fingerprint of the mapping
+rows at most every ROUTING_VERSION_CHECK_SECONDS to pick up edits made by
+other processes.
+"""
+
+import hashlib
+import json
+import logging
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+from services.api.app.config import ROUTING_VERSION_CHECK_SECONDS
+from services.api.app.db.repositories import SpecialtyMappingRepo
+
+logger = logging.getLogger(__name__)
+
+GENERAL_SPECIALTY = "General_Radiologist"
+FALLBACK_SPECIALTIES = {
+    "MRI_Brain": ("Neurologist", "General_Radiologist"),
+    "CT_Scan_Brain": ("Neurologist", "General_Radiologist"),
+    "MRI_Cardiac": ("Cardiologist", "General_Radiologist"),
+    "CT_Scan_Chest": ("General_Radiologist", None),
+    "X_Ray_Bone": ("Musculoskeletal_Specialist", "General_Radiologist"),
+    "X_Ray_Chest": ("General_Radiologist", None),
+    "Ultrasound_Abdomen": ("General_Radiologist", None),
+    "Mammography": ("Breast_Imaging_Specialist", "General_Radiologist"),
+}
+DEFAULT_ROUTE = (GENERAL_SPECIALTY, GENERAL_SPECIALTY)
+
+
+def compile_route(work_type: str, mapping: Optional[dict]) -> Tuple[str, str]:
+    """
+    Resolve (required, alternate) for one work type from its mapping row and
+    the fallbacks: a missing required specialty falls back to
+    FALLBACK_SPECIALTIES, a missing alternate to General_Radiologist.
+    """
+    if mapping:
+        required = mapping.get("required_specialty")
+        alternate = mapping.get("alternate_specialty")
+    else:
+        required = alternate = None
+
+    if not required:
+        fallback_required, fallback_alt = FALLBACK_SPECIALTIES.get(work_type, DEFAULT_ROUTE)
+        required = fallback_required
+        alternate = alternate or fallback_alt
+
+    if not alternate:
+        alternate = GENERAL_SPECIALTY
+    return required, alternate
+
+
+def _fingerprint(rows) -> str:
+    canonical = sorted(
+        (r["work_type"], r.get("required_specialty") or "", r.get("alternate_specialty") or "")
+        for r in rows
+    )
+    return hashlib.sha1(json.dumps(canonical).encode("utf-8")).hexdigest()[:16]
+
+
+class SpecialtyRoutingTable:
+    def __init__(self, version_check_seconds: float = ROUTING_VERSION_CHECK_SECONDS):
+        self._routes: Optional[Dict[str, Tuple[str, str]]] = None
+        self._version: Optional[str] = None
+        self._loaded_at: Optional[float] = None
+        self._checked_at = 0.0
+        self._check_every = version_check_seconds
+        self._lock = threading.Lock()
+
+    def reload(self) -> dict:
+        rows = SpecialtyMappingRepo.list_mappings()
+        by_type = {r["work_type"]: r for r in rows}
+        routes = {
+            work_type: compile_route(work_type, by_type.get(work_type))
+            for work_type in set(by_type) | set(FALLBACK_SPECIALTIES)
+        }
+        with self._lock:
+            previous = self._version
+            self._routes = routes
+            self._version = _fingerprint(rows)
+            self._loaded_at = self._checked_at = time.monotonic()
+        if previous and previous != self._version:
+            logger.info("Specialty routing table changed: %s -> %s", previous, self._version)
+        return self.info()
+
+    def refresh_if_stale(self):
+        if self._routes is None:
+            self.reload()
+            return
+        if self._check_every <= 0 or time.monotonic() - self._checked_at < self._check_every:
+            return
+        with self._lock:
+            self._checked_at = time.monotonic()
+        if _fingerprint(SpecialtyMappingRepo.list_mappings()) != self._version:
+            self.reload()
+
+    def resolve(self, work_type: str) -> Tuple[str, str]:
+        self.refresh_if_stale()
+        route = self._routes.get(work_type)
+        return route if route else compile_route(work_type, None)
+
+    def info(self) -> dict:
+        return {
+            "version": self._version,
+            "work_types": len(self._routes or {}),
+            "routes": {k: list(v) for k, v in sorted((self._routes or {}).items())},
+        }
+
+
+_table = SpecialtyRoutingTable()
+
+
+def resolve_specialties(work_type: str) -> Tuple[str, str]:
+    return _table.resolve(work_type)
+
+
+def reload_routing_table() -> dict:
+    return _table.reload()
+
+
+def routing_table_info() -> dict:
+    return _table.info()
@@ -0,0 +1,71 @@
+# services/api/app/utils/ids.py
+"""
+Time-ordered, collision-free identifiers (ULID layout).
+
+A ULID is 128 bits: a 48-bit millisecond timestamp followed by 80 random
+bits, written as 26 Crockford base32 characters, so ids sort by creation
+time as plain strings. Within one millisecond the generator increments the
+random part instead of drawing a new one, which keeps ids from one process
+strictly increasing; the random bits keep processes apart.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+from datetime import datetime, timezone
+
+CROCKFORD32 = "0123456789ABCDEFGHJKMNPQRSTVWXYZ"
+_RANDOM_BITS = 80
+_RANDOM_MAX = (1 << _RANDOM_BITS) - 1
+
+
+def _encode(value: int, length: int) -> str:
+    chars = []
+    for _ in range(length):
+        value, digit = divmod(value, 32)
+        chars.append(CROCKFORD32[digit])
+    return "".join(reversed(chars))
+
+
+class UlidGenerator:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._last_ms = -1
+        self._last_random = 0
+
+    def new(self) -> str:
+        with self._lock:
+            now_ms = time.time_ns() // 1_000_000
+            if now_ms <= self._last_ms:
+                # same millisecond (or the clock stepped back): stay monotonic
+                now_ms = self._last_ms
+                random_part = self._last_random + 1
+                if random_part > _RANDOM_MAX:
+                    now_ms += 1
+                    random_part = int.from_bytes(os.urandom(10), "big")
+            else:
+                random_part = int.from_bytes(os.urandom(10), "big")
+            self._last_ms, self._last_random = now_ms, random_part
+        return _encode(now_ms, 10) + _encode(random_part, 16)
+
+
+def ulid_datetime(ulid: str) -> datetime:
+    """Creation time encoded in a ULID (ignores any prefix before the last 26 chars)."""
+    ms = 0
+    for char in ulid[-26:-16]:
+        ms = ms * 32 + CROCKFORD32.index(char)
+    return datetime.fromtimestamp(ms / 1000, tz=timezone.utc)
+
+
+_generator = UlidGenerator()
+
+
+def new_ulid() -> str:
+    return _generator.new()
+
+
+def new_work_id() -> str:
+    # "W" keeps the prefix of the existing work ids (W001, W<epoch ms>)
+    return "W" + new_ulid()
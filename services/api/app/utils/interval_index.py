@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import itertools
+from bisect import bisect_left, insort
+from typing import Dict, Hashable, Iterable, List, Optional, Tuple
+
+
+class _Node:
+    __slots__ = ("center", "left", "right", "by_start", "by_end")
+
+    def __init__(self, center: float):
+        self.center = center
+        self.left: Optional[_Node] = None
+        self.right: Optional[_Node] = None
+        # (start, seq, key) ascending and (-end, seq, key) ascending
+        self.by_start: List[Tuple[float, int, Hashable]] = []
+        self.by_end: List[Tuple[float, int, Hashable]] = []
+
+
+class IntervalTree:
+    """
+    Centered interval tree over closed intervals [start, end].
+
+    `stab(point)` returns the keys of all intervals containing `point` in
+    O(log n + k), ordered by (start, insertion order). Intervals can be added
+    and removed one at a time, so callers can keep the tree in sync with the
+    underlying rows without rebuilding it.
+    """
+
+    def __init__(self, intervals: Iterable[Tuple[float, float, Hashable]] = ()):
+        self._seq = itertools.count()
+        self._intervals: Dict[Hashable, Tuple[float, float, int]] = {}
+        self._node_of: Dict[Hashable, _Node] = {}
+        items = []
+        for start, end, key in intervals:
+            if key in self._intervals:
+                raise KeyError(f"duplicate interval key: {key!r}")
+            seq = next(self._seq)
+            self._intervals[key] = (start, end, seq)
+            items.append((start, end, seq, key))
+        self._root = self._build(items)
+
+    def __len__(self) -> int:
+        return len(self._intervals)
+
+    def __contains__(self, key) -> bool:
+        return key in self._intervals
+
+    def _build(self, items) -> Optional[_Node]:
+        if not items:
+            return None
+        endpoints = sorted(p for start, end, _, _ in items for p in (start, end))
+        node = _Node(endpoints[len(endpoints) // 2])
+        left, right = [], []
+        for item in items:
+            start, end, seq, key = item
+            if end < node.center:
+                left.append(item)
+            elif start > node.center:
+                right.append(item)
+            else:
+                self._attach(node, start, end, seq, key)
+        node.left = self._build(left)
+        node.right = self._build(right)
+        return node
+
+    def _attach(self, node: _Node, start, end, seq, key):
+        insort(node.by_start, (start, seq, key))
+        insort(node.by_end, (-end, seq, key))
+        self._node_of[key] = node
+
+    def insert(self, start: float, end: float, key: Hashable):
+        if key in self._intervals:
+            self.remove(key)
+        seq = next(self._seq)
+        self._intervals[key] = (start, end, seq)
+        if self._root is None:
+            self._root = _Node((start + end) / 2.0)
+        node = self._root
+        while True:
+            if end < node.center:
+                if node.left is None:
+                    node.left = _Node((start + end) / 2.0)
+                node = node.left
+            elif start > node.center:
+                if node.right is None:
+                    node.right = _Node((start + end) / 2.0)
+                node = node.right
+            else:
+                self._attach(node, start, end, seq, key)
+                return
+
+    def remove(self, key: Hashable) -> bool:
+        interval = self._intervals.pop(key, None)
+        if interval is None:
+            return False
+        start, end, seq = interval
+        node = self._node_of.pop(key)
+        del node.by_start[bisect_left(node.by_start, (start, seq, key))]
+        del node.by_end[bisect_left(node.by_end, (-end, seq, key))]
+        return True
+
+    def stab(self, point: float) -> List[Hashable]:
+        hits = []
+        node = self._root
+        while node is not None:
+            if point < node.center:
+                for start, seq, key in node.by_start:
+                    if start > point:
+                        break
+                    hits.append((start, seq, key))
+                node = node.left
+            elif point > node.center:
+                for neg_end, seq, key in node.by_end:
+                    if -neg_end < point:
+                        break
+                    hits.append((self._intervals[key][0], seq, key))
+                node = node.right
+            else:
+                hits.extend(node.by_start)
+                break
+        hits.sort(key=lambda hit: hit[:2])
+        return [key for _, _, key in hits]
@@ -1,7 +1,9 @@
 from __future__ import annotations
 
 from datetime import datetime, time, timedelta
-from typing import Dict, Optional
+from typing import Dict, Iterable, Optional, Tuple
+
+import numpy as np
 
 
 def parse_time_window(start_str: str, end_str: str) -> tuple[time, time]:
@@ -95,3 +97,164 @@ def compute_candidate_score(
         "current_workload": calendar_entry.get("current_workload"),
     }
 
+
+# ---------------------------------------------------------------------------
+# Vectorised scoring
+#
+# The helpers below mirror the scalar functions above on NumPy arrays so that
+# thousands of candidates (or a whole work x shift matrix) can be scored in a
+# single pass. Inputs broadcast against each other. Missing values follow the
+# scalar semantics: specialty code -1 means "unknown", NaN skill/cases count
+# as 0 and NaN workload scores 0.8.
+# ---------------------------------------------------------------------------
+
+MISSING_CODE = -1
+
+
+def encode_specialties(
+    values: Iterable[Optional[str]], vocabulary: Optional[Dict[str, int]] = None
+) -> Tuple[np.ndarray, Dict[str, int]]:
+    """
+    Map specialty names to integer codes (None/"" -> MISSING_CODE). The
+    vocabulary is extended in place so several arrays can share it.
+    """
+    vocabulary = {} if vocabulary is None else vocabulary
+    codes = []
+    for value in values:
+        if not value:
+            codes.append(MISSING_CODE)
+            continue
+        codes.append(vocabulary.setdefault(value, len(vocabulary)))
+    return np.asarray(codes, dtype=np.int64), vocabulary
+
+
+def role_match_scores(candidate_codes, required_codes, general_code: int) -> np.ndarray:
+    candidate_codes = np.asarray(candidate_codes)
+    required_codes = np.asarray(required_codes)
+    partial = np.where(
+        (required_codes != general_code) & (candidate_codes == general_code), 0.5, 0.4
+    )
+    role = np.where(candidate_codes == required_codes, 1.0, partial)
+    missing = (candidate_codes == MISSING_CODE) | (required_codes == MISSING_CODE)
+    return np.where(missing, 0.0, role)
+
+
+def skill_scores(skill_levels) -> np.ndarray:
+    skill = np.nan_to_num(np.asarray(skill_levels, dtype=np.float64))
+    return np.maximum(0.0, np.minimum(skill, 5)) / 5.0
+
+
+def experience_scores(total_cases) -> np.ndarray:
+    cases = np.nan_to_num(np.asarray(total_cases, dtype=np.float64))
+    return np.minimum(cases, 400) / 400.0
+
+
+def availability_scores(window_start, window_end, scheduled_seconds) -> np.ndarray:
+    start = np.asarray(window_start, dtype=np.float64)
+    end = np.asarray(window_end, dtype=np.float64)
+    at = np.asarray(scheduled_seconds, dtype=np.float64)
+    hours = (end - start) / 3600.0
+    within = (start <= at) & (at <= end)
+    return np.where(within, np.minimum(1.0, np.maximum(0.5, hours / 12.0)), 0.0)
+
+
+def workload_scores(current_workload) -> np.ndarray:
+    workload = np.asarray(current_workload, dtype=np.float64)
+    score = np.maximum(0.0, 1.0 - np.minimum(workload, 12) / 12.0)
+    return np.where(np.isnan(workload), 0.8, score)
+
+
+def priority_bonuses(priority) -> np.ndarray:
+    prio = np.asarray(priority, dtype=np.float64)
+    return 0.15 * np.maximum(1, np.minimum(prio, 5)) / 5.0
+
+
+def round_like_builtin(values, ndigits: int = 4) -> np.ndarray:
+    """
+    Vectorised equivalent of the builtin round(x, ndigits) for floats.
+    np.rint(x * 10**ndigits) only disagrees when the product lands exactly on
+    .5 after floating-point multiplication, so those (rare) cells fall back to
+    the builtin.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    factor = 10.0**ndigits
+    scaled = values * factor
+    rounded = np.asarray(np.rint(scaled) / factor)
+    ties = (scaled - np.floor(scaled)) == 0.5
+    if np.any(ties):
+        flat_rounded = rounded.reshape(-1)
+        flat_values = values.reshape(-1)
+        for i in np.flatnonzero(ties):
+            flat_rounded[i] = round(float(flat_values[i]), ndigits)
+    return rounded
+
+
+def compute_candidate_scores_batch(
+    specialty_codes,
+    skill_levels,
+    total_cases,
+    window_start,
+    window_end,
+    current_workload,
+    scheduled_seconds,
+    required_code,
+    priority,
+    general_code: int,
+) -> Dict:
+    """
+    Columnar counterpart of compute_candidate_score. Window bounds and the
+    scheduled time are seconds since midnight. Returns
+    {"score": array, "breakdown": {component: array}} with values identical
+    to the scalar function (including its 4-decimal rounding).
+    `general_code` is the code of "General_Radiologist" in the same vocabulary.
+    """
+    role = role_match_scores(specialty_codes, required_code, general_code)
+    skill = skill_scores(skill_levels)
+    experience = experience_scores(total_cases)
+    availability = availability_scores(window_start, window_end, scheduled_seconds)
+    workload = workload_scores(current_workload)
+    priority_bonus = priority_bonuses(priority)
+
+    score = (
+        0.25 * role
+        + 0.20 * skill
+        + 0.20 * experience
+        + 0.20 * availability
+        + 0.15 * workload
+        + priority_bonus
+    )
+    components = {
+        "role": role,
+        "skill": skill,
+        "experience": experience,
+        "availability": availability,
+        "workload": workload,
+        "priority_bonus": priority_bonus,
+    }
+    return {
+        "score": round_like_builtin(score),
+        "breakdown": {
+            name: np.broadcast_to(round_like_builtin(values), score.shape)
+            for name, values in components.items()
+        },
+    }
+
+
+def score_payloads(batch: Dict, calendar_entries) -> list:
+    """
+    Expand a 1-D compute_candidate_scores_batch result into the per-candidate
+    dicts returned by compute_candidate_score.
+    """
+    scores = batch["score"].tolist()
+    breakdown = {name: values.tolist() for name, values in batch["breakdown"].items()}
+    payloads = []
+    for i, entry in enumerate(calendar_entries):
+        payloads.append(
+            {
+                "score": scores[i],
+                "breakdown": {name: values[i] for name, values in breakdown.items()},
+                "availability_window": f"{entry['available_from']} - {entry['available_to']}",
+                "current_workload": entry.get("current_workload"),
+            }
+        )
+    return payloads
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from datetime import date, datetime, time
+from datetime import date, datetime, time, timedelta
 from typing import Optional, Union
 
 
@@ -32,3 +32,14 @@ def is_within_window(
     start_time = parse_iso_time(start_str)
     end_time = parse_iso_time(end_str)
     return start_time <= target_time <= end_time
+
+
+def time_to_seconds(value: Union[str, time, timedelta]) -> float:
+    """
+    Seconds since midnight for a TIME value. MySQL returns TIME columns as
+    timedelta, SQLite as "HH:MM[:SS]" strings.
+    """
+    if isinstance(value, timedelta):
+        return value.total_seconds()
+    t = parse_iso_time(value)
+    return t.hour * 3600 + t.minute * 60 + t.second + t.microsecond / 1e6
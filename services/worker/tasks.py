@@ -1 +1,34 @@
+# services/worker/tasks.py
+"""
+Job handlers executed by the assignment worker (services/worker/worker.py).
 
+A handler receives the claimed job row and returns a small JSON-serialisable
+result that is stored on the job. Raising NonRetryableJobError fails the job
+immediately; any other exception is retried with backoff.
+"""
+
+from services.api.app.controllers.assignment_controller import AssignmentController
+from services.api.app.db.repositories import WorkRequestsRepo
+
+
+class NonRetryableJobError(Exception):
+    """The job can never succeed (e.g. its work request no longer exists)."""
+
+
+def run_assignment(job: dict, controller: AssignmentController) -> dict:
+    work_id = job["work_id"]
+    work = WorkRequestsRepo.get_work_by_id(work_id)
+    if not work:
+        raise NonRetryableJobError(f"work_id {work_id} not found")
+    if work.get("status") == "assigned":
+        # A previous attempt committed before losing its lease, or the item
+        # was assigned through the API meanwhile: nothing left to do.
+        return {"work_id": work_id, "assigned_to": work.get("assigned_to"), "skipped": True}
+
+    assignment = controller.assign(work_id, llm_provider=job.get("llm_provider") or "template")
+    return {
+        "work_id": work_id,
+        "assigned_to": assignment.get("assigned_to"),
+        "score": (assignment.get("selected") or {}).get("score"),
+        "explanation": assignment.get("explanation"),
+    }
@@ -1 +1,190 @@
+# services/worker/worker.py
+"""
+Assignment worker: drains the durable assignment_jobs queue.
 
+Usage:
+    python -m services.worker.worker --processes 4
+    python -m services.worker.worker --drain        # exit once the queue is empty
+
+Each process claims jobs with a lease (AssignmentJobsRepo.claim), renews the
+lease while the pipeline runs and records the outcome. Failed attempts are
+requeued with exponential backoff until max_attempts; a worker that dies
+mid-job simply lets its lease expire and another worker retries the job.
+"""
+
+import argparse
+import logging
+import multiprocessing
+import os
+import random
+import signal
+import socket
+import threading
+from typing import Optional
+
+from services.api.app.config import (
+    JOB_BACKOFF_BASE_SECONDS,
+    JOB_BACKOFF_MAX_SECONDS,
+    JOB_LEASE_SECONDS,
+    WORKER_POLL_SECONDS,
+)
+from services.api.app.controllers.assignment_controller import AssignmentController
+from services.api.app.db.repositories import AssignmentJobsRepo
+from services.worker.tasks import NonRetryableJobError, run_assignment
+
+logger = logging.getLogger(__name__)
+
+
+def backoff_seconds(attempts: int, jitter: bool = True) -> float:
+    """
+    Delay before retry number `attempts` (1-based): base * 2^(attempts-1),
+    capped, with up to 50% random jitter so failed jobs do not retry in lockstep.
+    """
+    delay = min(JOB_BACKOFF_BASE_SECONDS * (2 ** max(attempts - 1, 0)), JOB_BACKOFF_MAX_SECONDS)
+    if jitter:
+        delay *= 0.5 + random.random() / 2
+    return delay
+
+
+class _LeaseKeeper:
+    """Renews a job lease in the background while it is being processed."""
+
+    def __init__(self, job_id: str, worker_id: str, lease_seconds: float):
+        self._job_id = job_id
+        self._worker_id = worker_id
+        self._lease_seconds = lease_seconds
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        while not self._stop.wait(self._lease_seconds / 3):
+            try:
+                if not AssignmentJobsRepo.extend_lease(self._job_id, self._worker_id, self._lease_seconds):
+                    logger.warning("Lost lease on job %s", self._job_id)
+                    return
+            except Exception as exc:
+                logger.warning("Could not renew lease on job %s: %s", self._job_id, exc)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        return False
+
+
+class AssignmentWorker:
+    def __init__(
+        self,
+        worker_id: Optional[str] = None,
+        lease_seconds: float = JOB_LEASE_SECONDS,
+        poll_seconds: float = WORKER_POLL_SECONDS,
+        controller: Optional[AssignmentController] = None,
+    ):
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}"
+        self.lease_seconds = lease_seconds
+        self.poll_seconds = poll_seconds
+        self.controller = controller or AssignmentController()
+        self.processed = 0
+        self.failed = 0
+
+    def run_once(self) -> Optional[dict]:
+        """
+        Claim and process at most one job. Returns {"job_id", "status"} or
+        None when nothing was due.
+        """
+        jobs = AssignmentJobsRepo.claim(self.worker_id, lease_seconds=self.lease_seconds)
+        if not jobs:
+            return None
+        job = jobs[0]
+        try:
+            with _LeaseKeeper(job["job_id"], self.worker_id, self.lease_seconds):
+                result = run_assignment(job, self.controller)
+        except NonRetryableJobError as exc:
+            AssignmentJobsRepo.fail(job["job_id"], self.worker_id, exc)
+            self.failed += 1
+            logger.warning("Job %s (%s) failed permanently: %s", job["job_id"], job["work_id"], exc)
+            return {"job_id": job["job_id"], "status": "failed"}
+        except Exception as exc:
+            if job["attempts"] >= job["max_attempts"]:
+                AssignmentJobsRepo.fail(job["job_id"], self.worker_id, exc)
+                self.failed += 1
+                logger.error("Job %s (%s) gave up after %s attempts: %s",
+                             job["job_id"], job["work_id"], job["attempts"], exc)
+                return {"job_id": job["job_id"], "status": "failed"}
+            delay = backoff_seconds(job["attempts"])
+            AssignmentJobsRepo.fail(job["job_id"], self.worker_id, exc, retry_in_seconds=delay)
+            logger.info("Job %s (%s) attempt %s failed, retrying in %.1fs: %s",
+                        job["job_id"], job["work_id"], job["attempts"], delay, exc)
+            return {"job_id": job["job_id"], "status": "queued"}
+
+        if not AssignmentJobsRepo.complete(job["job_id"], self.worker_id, result):
+            logger.warning("Job %s finished after its lease was lost", job["job_id"])
+        self.processed += 1
+        return {"job_id": job["job_id"], "status": "done"}
+
+    def run(self, stop: Optional[threading.Event] = None, drain: bool = False):
+        """
+        Process jobs until `stop` is set (or, with drain=True, until no job is
+        due).
+        """
+        stop = stop or threading.Event()
+        logger.info("Worker %s started", self.worker_id)
+        while not stop.is_set():
+            try:
+                outcome = self.run_once()
+            except Exception as exc:  # DB hiccup: back off, keep the worker alive
+                logger.exception("Worker %s could not claim jobs: %s", self.worker_id, exc)
+                outcome = None
+            if outcome is None:
+                if drain:
+                    break
+                stop.wait(self.poll_seconds)
+        logger.info("Worker %s stopped (%s done, %s failed)", self.worker_id, self.processed, self.failed)
+
+
+def _process_main(index: int, drain: bool, lease_seconds: float, poll_seconds: float):
+    logging.basicConfig(level=logging.INFO, format=f"%(asctime)s [worker-{index}] %(message)s")
+    stop = threading.Event()
+    signal.signal(signal.SIGTERM, lambda *_: stop.set())
+    signal.signal(signal.SIGINT, lambda *_: stop.set())
+    AssignmentWorker(lease_seconds=lease_seconds, poll_seconds=poll_seconds).run(stop, drain=drain)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run assignment queue workers.")
+    parser.add_argument("--processes", type=int, default=1, help="Number of worker processes")
+    parser.add_argument("--drain", action="store_true", help="Exit when no job is due")
+    parser.add_argument("--lease-seconds", type=float, default=JOB_LEASE_SECONDS)
+    parser.add_argument("--poll-seconds", type=float, default=WORKER_POLL_SECONDS)
+    args = parser.parse_args(argv)
+
+    if args.processes <= 1:
+        _process_main(0, args.drain, args.lease_seconds, args.poll_seconds)
+        return
+
+    ctx = multiprocessing.get_context("spawn")
+    processes = [
+        ctx.Process(
+            target=_process_main,
+            args=(i, args.drain, args.lease_seconds, args.poll_seconds),
+            name=f"assignment-worker-{i}",
+        )
+        for i in range(args.processes)
+    ]
+    for proc in processes:
+        proc.start()
+    try:
+        for proc in processes:
+            proc.join()
+    except KeyboardInterrupt:
+        for proc in processes:
+            proc.terminate()
+        for proc in processes:
+            proc.join()
+
+
+if __name__ == "__main__":
+    main()
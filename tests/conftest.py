@@ -20,12 +20,16 @@ def sqlite_database(tmp_path_factory, monkeypatch):
     monkeypatch.setenv("SQLITE_PATH", str(db_path))
 
     from services.api.app import config as config_module
+    from services.api.app.db import async_repositories as async_repositories_module
     from services.api.app.db import mysql as mysql_module
     from services.api.app.db import repositories as repositories_module
+    from services.api.app.services import specialty_routing as routing_module
 
     importlib.reload(config_module)
     importlib.reload(mysql_module)
     importlib.reload(repositories_module)
+    importlib.reload(async_repositories_module)
+    importlib.reload(routing_module)
 
     yield
 
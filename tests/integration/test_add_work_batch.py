@@ -0,0 +1,47 @@
+import json
+
+from fastapi.testclient import TestClient
+
+from services.api.app.db.repositories import WorkRequestsRepo
+from services.api.app.main import app
+
+
+def _row(i, **overrides):
+    return {
+        "work_type": "MRI_Brain",
+        "description": f"Batch case {i}",
+        "priority": 3,
+        "scheduled_date": "2024-11-10",
+        "scheduled_time": "10:00",
+        **overrides,
+    }
+
+
+def test_add_work_batch_json_array_reports_invalid_rows(sqlite_database):
+    rows = [_row(0), _row(1, priority="high"), "not an object", _row(3)]
+    with TestClient(app) as client:
+        body = client.post("/add_work/batch", json=rows).json()
+    assert (body["received"], body["accepted"], body["rejected"]) == (4, 2, 2)
+    assert [e["index"] for e in body["errors"]] == [1, 2]
+    assert body["work_ids"] == sorted(body["work_ids"])  # time-ordered ids
+    for work_id, expected in zip(body["work_ids"], ("Batch case 0", "Batch case 3")):
+        work = WorkRequestsRepo.get_work_by_id(work_id)
+        assert work["description"] == expected and work["status"] == "pending"
+
+
+def test_add_work_batch_ndjson_stream(sqlite_database, monkeypatch):
+    from services.api.app.routes import work_routes
+
+    monkeypatch.setattr(work_routes, "WORK_INTAKE_CHUNK_SIZE", 2)  # several transactions
+    lines = [json.dumps(_row(i)) for i in range(5)] + ["{broken"]
+    with TestClient(app) as client:
+        body = client.post(
+            "/add_work/batch",
+            content="\n".join(lines) + "\n",
+            headers={"Content-Type": "application/x-ndjson"},
+        ).json()
+        assert client.post("/add_work/batch", json={"rows": []}).status_code == 400
+    assert (body["accepted"], body["rejected"]) == (5, 1)
+    assert body["errors"][0]["index"] == 5
+    assert len(set(body["work_ids"])) == 5
+    assert all(WorkRequestsRepo.get_work_by_id(w) for w in body["work_ids"])
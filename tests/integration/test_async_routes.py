@@ -0,0 +1,126 @@
+import asyncio
+import traceback
+
+import httpx
+from fastapi.testclient import TestClient
+
+from services.api.app.db import async_repositories, repositories
+from services.api.app.db.repositories import ResourceCalendarRepo, ResourcesRepo, WorkRequestsRepo
+from services.api.app.main import app
+
+
+def test_async_routes_assign_and_persist(sqlite_database):
+    before_cases = {r["resource_id"]: r["total_cases_handled"] for r in ResourcesRepo.list_resources()}
+    with TestClient(app) as client:
+        added = client.post(
+            "/add_work",
+            json={
+                "work_type": "MRI_Brain",
+                "description": "Async route case",
+                "priority": 5,
+                "scheduled_date": "2024-11-10",
+                "scheduled_time": "09:30",
+            },
+        ).json()["result"]
+        work_id = added["work_id"]
+        assert WorkRequestsRepo.get_work_by_id(work_id)["status"] == "pending"
+
+        assignment = client.post(f"/assign/{work_id}").json()["assignment"]
+        resource_id = assignment["assigned_to"]
+        assert resource_id is not None
+
+        status = client.get(f"/status/{work_id}").json()["work"]
+        assert status["status"] == "assigned" and status["assigned_to"] == resource_id
+
+        on_duty = client.get("/resources/on-duty", params={"target_date": "2024-11-10"}).json()
+        assert on_duty["resources"] == [
+            {**row, "availability_window": f"{row['available_from']} - {row['available_to']}"}
+            for row in ResourceCalendarRepo.get_on_duty("2024-11-10")
+        ]
+
+    after_cases = {r["resource_id"]: r["total_cases_handled"] for r in ResourcesRepo.list_resources()}
+    assert after_cases[resource_id] == before_cases[resource_id] + 1
+    assert async_repositories.native_async() == async_repositories.AIOSQLITE_AVAILABLE
+
+
+def test_deferred_explanation_is_committed_then_filled_in(sqlite_database):
+    from services.api.app.services.explanation_queue import explanation_queue
+
+    with TestClient(app) as client:
+        body = client.post("/assign/W003", params={"defer_explanation": True}).json()
+        assignment = body["assignment"]
+        assert assignment["assigned_to"] is not None
+        assert assignment["explanation"] is None
+        assert assignment["explanation_status"] == "pending"
+        assert WorkRequestsRepo.get_work_by_id("W003")["status"] == "assigned"
+
+        explanation_queue().shutdown(wait=True)  # let the background job finish
+        work = client.get("/status/W003").json()["work"]
+        assert work["explanation_status"] == "ready"
+        assert work["explanation"].startswith(assignment["selected"]["name"])
+
+
+def test_concurrent_async_intake_and_assignment(sqlite_database, monkeypatch):
+    # a sync DB call on the event loop stalls every other request and, with
+    # aiosqlite transactions in flight, ends in "database is locked"
+    sync_get_connection = repositories.get_connection
+    on_loop = []
+
+    def guarded_get_connection(*args, **kwargs):
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:  # worker thread (asyncio.to_thread)
+            return sync_get_connection(*args, **kwargs)
+        on_loop.append("".join(traceback.format_stack(limit=8)[:-1]))
+        raise RuntimeError("sync DB connection opened on the event loop")
+
+    new_work = {
+        "work_type": "CT_Chest",
+        "description": "Concurrent intake",
+        "priority": 3,
+        "scheduled_date": "2024-11-10",
+        "scheduled_time": "10:00",
+    }
+
+    async def add_then_assign(client, slots, i):
+        async with slots:
+            added = await client.post("/add_work", json=new_work)
+            if added.status_code != 200:
+                return [added]
+            work_id = added.json()["result"]["work_id"]
+            if i % 2:
+                return [added, await client.get(f"/pipeline/{work_id}")]
+            return [added, await client.post(f"/assign/{work_id}")]
+
+    async def run():
+        async with app.router.lifespan_context(app):
+            monkeypatch.setattr(repositories, "get_connection", guarded_get_connection)
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+                slots = asyncio.Semaphore(8)
+                return await asyncio.gather(*(add_then_assign(client, slots, i) for i in range(40)))
+
+    responses = [r for pair in asyncio.run(run()) for r in pair]
+    assert on_loop == []
+    assert [r.status_code for r in responses] == [200] * 80
+
+
+def test_batch_planning_runs_off_the_event_loop(sqlite_database, monkeypatch):
+    from services.api.app.routes import work_routes
+
+    plan_batch = work_routes.controller.sync.plan_batch
+    planned_on_loop = []
+
+    def recording_plan_batch(*args, **kwargs):
+        try:
+            asyncio.get_running_loop()
+            planned_on_loop.append(True)
+        except RuntimeError:
+            planned_on_loop.append(False)
+        return plan_batch(*args, **kwargs)
+
+    monkeypatch.setattr(work_routes.controller.sync, "plan_batch", recording_plan_batch)
+    with TestClient(app) as client:
+        body = client.post("/assign/batch", json={"work_ids": ["W003", "W004"]}).json()
+    assert body["status"] == "ok"
+    assert planned_on_loop == [False]
@@ -0,0 +1,44 @@
+import asyncio
+import random
+
+import httpx
+
+from services.api.app.main import app
+from services.api.app.services.load_test import DEFAULT_MIX, LoadState, check_slos, parse_slos, run_load
+
+
+async def _run(**kwargs):
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://loadtest") as client:
+            return await run_load(client, DEFAULT_MIX, **kwargs)
+
+
+def test_in_process_load_reports_every_endpoint(sqlite_database):
+    report = asyncio.run(_run(requests=40, concurrency=4, seed=1))
+    assert report["total"]["requests"] == 40
+    assert sum(e["requests"] for e in report["endpoints"].values()) == 40
+    for endpoint, result in report["endpoints"].items():
+        assert result["path"]
+        if result["requests"]:
+            assert result["p50_ms"] <= result["p95_ms"] <= result["p99_ms"]
+    assert {endpoint: result["errors"] for endpoint, result in report["endpoints"].items()} == {
+        endpoint: 0 for endpoint in DEFAULT_MIX
+    }
+
+    missed = check_slos(report, parse_slos("work=p95:0.000001"), max_error_rate=1.0)
+    assert [m["metric"] for m in missed] == ["p95_ms"]
+    assert report["endpoints"]["work"]["slo"]["error_rate"]["met"]
+
+
+def test_pending_work_is_assigned_at_most_once():
+    works = [
+        {"work_id": "W1", "status": "pending", "scheduled_timestamp": "2024-11-10 09:00:00"},
+        {"work_id": "W2", "status": "completed", "scheduled_timestamp": "2024-11-10 10:00:00"},
+    ]
+    state = LoadState(works, random.Random(0))
+    assert state.request("pipeline")[:3] == ("pipeline", "GET", "/pipeline/W1")
+    # nothing pending any more: new work is added instead of re-assigning
+    endpoint, method, url, kwargs = state.request("assign")
+    assert (endpoint, method, url) == ("add_work", "POST", "/add_work")
+    assert kwargs["json"]["scheduled_date"] == "2024-11-10"
@@ -22,3 +22,31 @@ def test_full_pipeline_assignment(sqlite_database):
     assert status["status"] == "assigned"
     assert status["assigned_to"] == assignment["assigned_to"]
 
+
+
+def test_batch_assignment_commits_all_writes(sqlite_database):
+    from services.api.app.db.repositories import ResourceCalendarRepo
+
+    controller = AssignmentController()
+    work_ids = ["W003", "W009", "W010", "W018", "W999"]
+    before = ResourceCalendarRepo.get_calendars_on_date("2024-11-10")
+
+    result = controller.assign_many(work_ids, llm_provider="template")
+
+    assert result["summary"]["requested"] == len(work_ids)
+    assert result["summary"]["errors"] == 1
+    assigned = [a for a in result["assignments"] if a.get("assigned_to")]
+    assert len(assigned) == result["summary"]["assigned"] == 4
+
+    after = ResourceCalendarRepo.get_calendars_on_date("2024-11-10")
+    workload = lambda cals: {
+        e["calendar_id"]: e["current_workload"] for entries in cals.values() for e in entries
+    }
+    delta = {
+        cid: workload(after)[cid] - value for cid, value in workload(before).items()
+    }
+    for item in assigned:
+        status = controller.fetch_status(item["work_id"])
+        assert status["status"] == "assigned"
+        assert status["assigned_to"] == item["assigned_to"]
+    assert sum(delta.values()) == len(assigned)
@@ -0,0 +1,54 @@
+from services.api.app.controllers.assignment_controller import AssignmentController
+from services.api.app.db.repositories import AssignmentJobsRepo, WorkRequestsRepo
+from services.worker import worker as worker_module
+from services.worker.worker import AssignmentWorker
+
+
+def test_jobs_claimed_by_priority_and_processed(sqlite_database):
+    controller = AssignmentController()
+    work_ids = ["W003", "W009", "W010"]
+    priorities = {w: WorkRequestsRepo.get_work_by_id(w)["priority"] for w in work_ids}
+    jobs = [controller.enqueue_assignment(w) for w in work_ids]
+    # enqueueing again returns the active job instead of a duplicate
+    assert controller.enqueue_assignment("W003")["job_id"] == jobs[0]["job_id"]
+
+    claimed = AssignmentJobsRepo.claim("probe", lease_seconds=60, limit=3)
+    assert [j["priority"] for j in claimed] == sorted(priorities.values(), reverse=True)
+    assert AssignmentJobsRepo.claim("other", lease_seconds=60) == []
+    # an expired lease makes the job claimable again
+    for job in claimed:
+        AssignmentJobsRepo.extend_lease(job["job_id"], "probe", lease_seconds=-1)
+
+    worker = AssignmentWorker(worker_id="w1", controller=controller)
+    worker.run(drain=True)
+    assert worker.processed == 3
+    for job in jobs:
+        stored = AssignmentJobsRepo.get(job["job_id"])
+        assert stored["status"] == "done" and stored["attempts"] == 2
+        work = WorkRequestsRepo.get_work_by_id(job["work_id"])
+        assert work["status"] == "assigned"
+        assert stored["result"]["assigned_to"] == work["assigned_to"]
+
+
+def test_failed_attempts_back_off_then_give_up(sqlite_database, monkeypatch):
+    def boom(job, controller):
+        raise RuntimeError("pipeline down")
+
+    monkeypatch.setattr(worker_module, "run_assignment", boom)
+    job = AssignmentJobsRepo.enqueue("W003", 3, max_attempts=2)
+    worker = AssignmentWorker(worker_id="w1")
+
+    assert worker.run_once() == {"job_id": job["job_id"], "status": "queued"}
+    stored = AssignmentJobsRepo.get(job["job_id"])
+    assert stored["attempts"] == 1 and stored["last_error"] == "pipeline down"
+    assert stored["available_at"] > stored["updated_at"]
+    assert worker.run_once() is None  # backing off, not due yet
+
+    AssignmentJobsRepo.fail(job["job_id"], "w1", "ignored")  # not leased: no-op
+    assert AssignmentJobsRepo.get(job["job_id"])["status"] == "queued"
+
+    monkeypatch.setattr(worker_module, "backoff_seconds", lambda attempts: 0)
+    job2 = AssignmentJobsRepo.enqueue("W009", 1, max_attempts=2)
+    assert worker.run_once()["status"] == "queued"
+    assert worker.run_once() == {"job_id": job2["job_id"], "status": "failed"}
+    assert AssignmentJobsRepo.counts_by_status() == {"queued": 1, "failed": 1}
@@ -0,0 +1,33 @@
+import sqlite3
+
+from services.api.app.db.bulk_load import csv_sources, load_sqlite, split_schema
+
+
+def test_split_schema_defers_secondary_indexes():
+    tables, indexes = split_schema()
+    assert indexes and all(s.upper().startswith("CREATE INDEX") for s in indexes)
+    assert not any("CREATE INDEX" in s.upper() for s in tables)
+
+
+def test_load_sqlite_replaces_file_and_analyzes(tmp_path):
+    db = tmp_path / "seed.db"
+    db.write_text("stale")
+    report = load_sqlite(db, csv_sources())
+    rows = {t["table"]: t["rows"] for t in report["tables"]}
+    assert rows == {"resources": 15, "resource_calendar": 45, "specialty_mapping": 8, "work_requests": 22}
+
+    conn = sqlite3.connect(db)
+    try:
+        for table, count in rows.items():
+            assert conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0] == count
+        index_names = {r[0] for r in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+        assert "idx_work_requests_status" in index_names
+        assert conn.execute("SELECT COUNT(*) FROM sqlite_stat1").fetchone()[0] > 0
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "delete"
+        # empty CSV fields load as NULL
+        assert conn.execute(
+            "SELECT alternate_specialty FROM specialty_mapping WHERE work_type = 'CT_Scan_Chest'"
+        ).fetchone()[0] is None
+    finally:
+        conn.close()
+    assert not (tmp_path / ".seed.db.loading").exists()
@@ -0,0 +1,16 @@
+import importlib
+
+import pytest
+
+from services.api.app import config
+
+
+def test_unknown_embedding_backend_is_rejected_at_load(monkeypatch):
+    monkeypatch.setenv("EMB_BACKEND", "cuda-fp16")
+    with pytest.raises(ValueError, match="EMB_BACKEND"):
+        importlib.reload(config)
+    monkeypatch.setenv("EMB_BACKEND", "ONNX")
+    importlib.reload(config)
+    assert config.EMB_BACKEND == "onnx"
+    monkeypatch.delenv("EMB_BACKEND")
+    importlib.reload(config)
@@ -0,0 +1,64 @@
+import sqlite3
+import threading
+
+import pytest
+
+from services.api.app.db import mysql as mysql_module
+from services.api.app.db.pool import ConnectionPool, PoolTimeout
+
+
+def test_pool_reuses_connections_and_checks_schema_once(sqlite_database, monkeypatch):
+    calls = []
+    original = mysql_module._ensure_sqlite_db
+    monkeypatch.setattr(mysql_module, "_ensure_sqlite_db", lambda: calls.append(1) or original())
+
+    for _ in range(5):
+        conn = mysql_module.get_connection()
+        assert conn.execute("SELECT COUNT(*) FROM resources").fetchone()[0] > 0
+        conn.close()
+
+    stats = mysql_module.pool_stats()
+    assert len(calls) == 1
+    assert stats["created"] == 1 and stats["acquires"] == 5 and stats["in_use"] == 0
+
+
+def test_pool_waits_for_release_then_times_out():
+    pool = ConnectionPool(lambda: sqlite3.connect(":memory:", check_same_thread=False), max_size=1, timeout=2)
+    held = pool.acquire()
+    threading.Timer(0.05, held.close).start()
+    second = pool.acquire()  # blocks until the timer returns the connection
+    assert pool.stats()["waits"] == 1 and pool.stats()["created"] == 1
+
+    with pytest.raises(PoolTimeout):
+        pool.acquire(timeout=0.01)
+    second.close()
+    assert pool.stats()["timeouts"] == 1
+
+
+def test_unhealthy_connection_is_replaced_and_uncommitted_work_rolled_back():
+    def ping(conn):
+        if getattr(conn, "poisoned", False):
+            raise RuntimeError("gone")
+
+    class Conn(sqlite3.Connection):
+        poisoned = False
+
+    pool = ConnectionPool(
+        lambda: sqlite3.connect(":memory:", factory=Conn, check_same_thread=False),
+        max_size=1,
+        health_check=ping,
+        health_check_after=0,
+        reset=mysql_module._rollback_open_transaction,
+    )
+    conn = pool.acquire()
+    conn.execute("CREATE TABLE t (x INTEGER)")
+    conn.execute("INSERT INTO t VALUES (1)")
+    raw = conn.raw
+    conn.close()
+    assert not raw.in_transaction
+
+    raw.poisoned = True
+    fresh = pool.acquire()
+    assert fresh.raw is not raw
+    fresh.close()
+    assert pool.stats()["health_check_failures"] == 1
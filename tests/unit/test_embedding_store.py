@@ -0,0 +1,61 @@
+import json
+
+import numpy as np
+import pytest
+
+from services.api.app.services.embedding_store import MANIFEST_FILE, EmbeddingStore, plan_update
+
+
+def _write(tmp_path, ids=("R001", "R10"), dim=4):
+    vectors = np.arange(len(ids) * dim, dtype=np.float64).reshape(len(ids), dim)
+    return EmbeddingStore.write(
+        tmp_path,
+        ids=list(ids),
+        labels=[7, 3],
+        hashes=["a" * 16, "b" * 16],
+        vectors=vectors,
+        model="all-MiniLM-L6-v2",
+        normalized=True,
+        next_label=8,
+    )
+
+
+def test_round_trip_is_memory_mapped(tmp_path):
+    manifest = _write(tmp_path)
+    assert manifest["dim"] == 4 and manifest["count"] == 2 and manifest["normalized"]
+
+    store = EmbeddingStore.open(tmp_path)
+    assert isinstance(store.vectors, np.memmap) and store.vectors.dtype == np.float32
+    assert store.ids.dtype == np.dtype("<U4")
+    assert store.ids_by_label() == {7: "R001", 3: "R10"}
+    assert store.hash_by_id()["R10"] == "b" * 16
+    assert store.next_label == 8 and store.model == "all-MiniLM-L6-v2"
+    np.testing.assert_array_equal(store.vectors[store.rows_by_id()["R10"]], [4, 5, 6, 7])
+
+
+def test_open_rejects_store_that_disagrees_with_manifest(tmp_path):
+    _write(tmp_path)
+    manifest = json.loads((tmp_path / MANIFEST_FILE).read_text())
+    manifest["count"] = 3
+    (tmp_path / MANIFEST_FILE).write_text(json.dumps(manifest))
+    with pytest.raises(ValueError):
+        EmbeddingStore.open(tmp_path)
+    assert not EmbeddingStore.exists(tmp_path / "missing")
+
+
+def test_plan_update_embeds_only_new_and_changed_profiles():
+    old_labels = {"R1": 0, "R2": 1, "R3": 2}
+    old_hashes = {"R1": "h1", "R2": "h2", "R3": "h3"}
+    plan = plan_update(["R1", "R2", "R4"], {"R1": "h1", "R2": "h2x", "R4": "h4"}, old_labels, old_hashes, 3)
+    assert (plan.removed, plan.changed, plan.added) == (["R3"], ["R2"], ["R4"])
+    assert sorted(plan.stale_labels) == [1, 2]
+    # labels are not reused: the changed profile gets a fresh one
+    assert plan.labels == {"R1": 0, "R2": 3, "R4": 4} and plan.next_label == 5
+    assert plan.to_embed == ["R2", "R4"] and not plan.up_to_date
+    assert old_labels == {"R1": 0, "R2": 1, "R3": 2}
+
+    same = plan_update(["R1"], {"R1": "h1"}, {"R1": 0}, {"R1": "h1"}, 1)
+    assert same.up_to_date and same.stale_labels == [] and same.next_label == 1
+
+    first = plan_update(["R1", "R2"], {"R1": "h1", "R2": "h2"}, {}, {}, 0)
+    assert first.added == ["R1", "R2"] and first.labels == {"R1": 0, "R2": 1}
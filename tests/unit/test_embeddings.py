@@ -0,0 +1,70 @@
+import numpy as np
+import pytest
+
+pytest.importorskip("faiss")
+
+from services.api.app.services import embeddings  # noqa: E402
+from services.api.app.services.index_store import IndexStore  # noqa: E402
+
+
+def test_parity_report_compares_against_the_reference_backend(monkeypatch):
+    vectors = {
+        "torch-fp32": np.array([[1.0, 0.0], [0.0, 2.0]], dtype=np.float32),
+        # same direction for the first text, 45 degrees off for the second
+        "torch-int8": np.array([[3.0, 0.0], [1.0, 1.0]], dtype=np.float32),
+    }
+    calls = []
+
+    def fake_embed(texts, batch_size=None, backend=None):
+        calls.append(backend)
+        return vectors[backend]
+
+    monkeypatch.setattr(embeddings, "embed_texts", fake_embed)
+    report = embeddings.parity_report(["a", "b"], "torch-int8")
+    assert calls == ["torch-fp32", "torch-int8"]
+    assert report["texts"] == 2
+    assert report["min_cosine"] == pytest.approx(np.sqrt(0.5), abs=1e-6)
+    assert report["mean_cosine"] == pytest.approx((1 + np.sqrt(0.5)) / 2, abs=1e-6)
+    assert report["max_drift"] == pytest.approx(1 - np.sqrt(0.5), abs=1e-6)
+
+
+def test_incremental_build_reembeds_only_changed_profiles(tmp_path, monkeypatch):
+    embedded = []
+
+    def fake_embed(texts, batch_size=None, backend=None):
+        embedded.append(list(texts))
+        return np.asarray([[len(t), 1.0, float(i)] for i, t in enumerate(texts)], dtype=np.float32)
+
+    monkeypatch.setattr(embeddings, "ST_AVAILABLE", True)
+    monkeypatch.setattr(embeddings, "embed_texts", fake_embed)
+    monkeypatch.setattr(embeddings, "INDEX_STORE", IndexStore(tmp_path))
+    resources = [
+        {"resource_id": "R1", "name": "Ann", "specialty": "MRI", "skill_level": 3},
+        {"resource_id": "R2", "name": "Bob", "specialty": "CT", "skill_level": 2},
+    ]
+    index, ids = embeddings.build_faiss_index(resources)
+    assert index.ntotal == 2 and sorted(ids.values()) == ["R1", "R2"]
+
+    resources[1] = {**resources[1], "skill_level": 4}
+    resources.append({"resource_id": "R3", "name": "Cy", "specialty": "XRay", "skill_level": 1})
+    index, ids = embeddings.build_faiss_index(resources)
+    assert len(embedded) == 2 and len(embedded[1]) == 2  # R2 (changed) and R3 only
+    assert index.ntotal == 3 and sorted(ids.values()) == ["R1", "R2", "R3"]
+
+
+def test_published_index_is_read_back_for_search(tmp_path, monkeypatch):
+    monkeypatch.setattr(embeddings, "ST_AVAILABLE", True)
+    monkeypatch.setattr(
+        embeddings,
+        "embed_texts",
+        lambda texts, **_: np.eye(len(texts), 4, dtype=np.float32),
+    )
+    store = IndexStore(tmp_path)
+    monkeypatch.setattr(embeddings, "INDEX_STORE", store)
+    embeddings.build_faiss_index(
+        [{"resource_id": f"R{i}", "name": str(i), "specialty": "MRI", "skill_level": i} for i in range(3)]
+    )
+    index, ids, labels_by_id = embeddings._read_index(store.current_dir())
+    assert index.ntotal == 3 and sorted(labels_by_id) == ["R0", "R1", "R2"]
+    _, found = index.search(np.eye(1, 4, dtype=np.float32), 1)
+    assert ids[int(found[0][0])] == "R0"
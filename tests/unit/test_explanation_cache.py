@@ -0,0 +1,76 @@
+from services.api.app.services import llm_client
+from services.api.app.services.explanation_cache import ExplanationCache, explanation_key
+from services.api.app.services.llm_client import LLMClient
+
+PAYLOAD = {
+    "work_type": "CT",
+    "priority": 4,
+    "selected_resource": "Dr. Lee",
+    "skill_level": 5,
+    "cases_handled": 120,
+    "availability": "08:00-16:00",
+    "workload": 2,
+}
+
+
+def test_key_is_canonical_and_scoped_by_model():
+    reordered = dict(reversed(list(PAYLOAD.items())))
+    assert explanation_key(PAYLOAD, "hf", "m") == explanation_key(reordered, "hf", "m")
+    assert explanation_key(PAYLOAD, "hf", "m") != explanation_key(PAYLOAD, "hf", "other")
+    assert explanation_key(PAYLOAD, "hf", "m") != explanation_key({**PAYLOAD, "workload": 3}, "hf", "m")
+
+
+def test_memory_lru_and_disk_tier(tmp_path):
+    cache = ExplanationCache(tmp_path, max_entries=2, max_disk_bytes=1024)
+    for key in ("a1", "b2", "c3"):
+        cache.put(key, f"text {key}")
+    assert cache.stats()["memory_evictions"] == 1
+
+    # a1 fell out of memory but is still on disk
+    assert cache.get("a1") == "text a1"
+    assert cache.get("a1") == "text a1"
+    assert cache.get("zz") is None
+    stats = cache.stats()
+    assert (stats["disk_hits"], stats["memory_hits"], stats["misses"]) == (1, 1, 1)
+
+    # a new instance (another process / a restart) sees the disk tier
+    assert ExplanationCache(tmp_path, max_entries=2, max_disk_bytes=1024).get("b2") == "text b2"
+
+
+def test_disk_tier_evicts_least_recently_used(tmp_path):
+    cache = ExplanationCache(tmp_path, max_entries=0, max_disk_bytes=25)
+    cache.put("a1", "x" * 10)
+    cache.put("b2", "y" * 10)
+    assert cache.get("a1") is not None  # touch a1, b2 becomes the oldest
+    cache.put("c3", "z" * 10)
+    assert cache.get("b2") is None
+    assert cache.get("a1") is not None and cache.get("c3") is not None
+    assert cache.stats()["disk_bytes"] == 20
+
+
+def test_disk_cap_counts_other_processes_after_rescan(tmp_path):
+    first = ExplanationCache(tmp_path, max_entries=0, max_disk_bytes=25, rescan_seconds=0)
+    second = ExplanationCache(tmp_path, max_entries=0, max_disk_bytes=25, rescan_seconds=0)
+    first.put("a1", "x" * 10)
+    second.put("b2", "y" * 10)
+    first.put("c3", "z" * 10)  # sees b2 on the re-scan: a1 is evicted
+    assert sum(p.stat().st_size for p in tmp_path.glob("*/*.txt")) == 20
+    assert second.get("a1") is None and second.get("b2") is not None
+
+
+def test_generate_explanation_reuses_cached_hf_text(tmp_path, monkeypatch):
+    calls = []
+
+    def fake_batch(inputs):
+        calls.append(len(inputs))
+        return ["Generated explanation."] * len(inputs)
+
+    monkeypatch.setattr(llm_client, "explanation_cache", lambda: cache)
+    monkeypatch.setattr(LLMClient, "generate_hf_batch", staticmethod(fake_batch))
+    cache = ExplanationCache(tmp_path, max_entries=16, max_disk_bytes=4096)
+
+    first = LLMClient.generate_explanation(PAYLOAD, provider="hf")
+    second = LLMClient.generate_explanation(dict(PAYLOAD), provider="hf")
+    assert first == second == "Generated explanation."
+    assert calls == [1]
+    assert cache.stats()["memory_hits"] == 1
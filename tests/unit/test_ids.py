@@ -0,0 +1,17 @@
+from datetime import datetime, timezone
+
+from services.api.app.utils.ids import CROCKFORD32, UlidGenerator, new_work_id, ulid_datetime
+
+
+def test_ulids_are_unique_and_strictly_increasing():
+    generator = UlidGenerator()
+    ids = [generator.new() for _ in range(10000)]  # many share a millisecond
+    assert ids == sorted(ids) and len(set(ids)) == len(ids)
+    assert all(len(i) == 26 and set(i) <= set(CROCKFORD32) for i in ids)
+
+
+def test_work_id_encodes_creation_time():
+    before = datetime.now(timezone.utc)
+    work_id = new_work_id()
+    assert work_id.startswith("W") and len(work_id) == 27
+    assert abs((ulid_datetime(work_id) - before).total_seconds()) < 1
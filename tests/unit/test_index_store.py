@@ -0,0 +1,77 @@
+import json
+
+from services.api.app.services.index_store import IndexStore, ResidentIndex
+
+
+def _write_ids(ids):
+    def write(directory):
+        (directory / "ids.json").write_text(json.dumps(ids))
+
+    return write
+
+
+def _load(directory):
+    if directory is None:
+        raise FileNotFoundError("nothing published")
+    return json.loads((directory / "ids.json").read_text())
+
+
+def test_publish_switches_current_and_prunes(tmp_path):
+    store = IndexStore(tmp_path, keep=2)
+    assert store.current_version() is None
+    versions = [store.publish(_write_ids([f"R{i}"])) for i in range(4)]
+    assert store.current_version() == versions[-1]
+    kept = sorted(p.name for p in store.versions.iterdir())
+    assert kept == versions[-2:]
+    assert not list(tmp_path.glob(".CURRENT-*"))
+
+
+def test_failed_build_leaves_current_untouched(tmp_path):
+    store = IndexStore(tmp_path)
+    good = store.publish(_write_ids(["R1"]))
+
+    def broken(directory):
+        (directory / "ids.json").write_text("[")
+        raise RuntimeError("embedding failed")
+
+    try:
+        store.publish(broken)
+    except RuntimeError:
+        pass
+    assert store.current_version() == good
+    assert [p.name for p in store.versions.iterdir()] == [good]
+
+
+def test_resident_index_reloads_on_new_version(tmp_path):
+    store = IndexStore(tmp_path)
+    store.publish(_write_ids(["R1"]))
+    loads = []
+
+    def counting_load(directory):
+        loads.append(directory)
+        return _load(directory)
+
+    resident = ResidentIndex(store, counting_load, check_seconds=0)
+    assert resident.get() == ["R1"]
+    assert resident.get() == ["R1"]
+    assert len(loads) == 1  # unchanged version is not re-read
+
+    store.publish(_write_ids(["R1", "R2"]))
+    assert resident.get() == ["R1", "R2"]
+    assert resident.info()["version"] == store.current_version()
+
+    # a broken new version keeps the previous one in service
+    store._set_current("missing-version")
+    assert resident.get() == ["R1", "R2"]
+
+
+def test_fresh_version_sees_versions_published_elsewhere(tmp_path):
+    store = IndexStore(tmp_path)
+    resident = ResidentIndex(store, _load, check_seconds=0)
+    assert resident.fresh_version() is None  # nothing published yet
+    first = store.publish(_write_ids(["R1"]))
+    assert resident.fresh_version() == first
+    # e.g. a rebuild published by another worker process
+    second = IndexStore(tmp_path).publish(_write_ids(["R1", "R2"]))
+    assert resident.version == first
+    assert resident.fresh_version() == second
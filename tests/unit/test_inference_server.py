@@ -0,0 +1,85 @@
+import threading
+import time
+from concurrent.futures import TimeoutError as FutureTimeout
+
+import pytest
+
+from services.api.app.services.inference_server import InferenceServer, MicroBatcher
+
+
+def upper_batch(payloads):
+    return [str(p["text"]).upper() for p in payloads]
+
+
+def slow_batch(payloads):
+    time.sleep(1)
+    return upper_batch(payloads)
+
+
+def test_micro_batcher_groups_concurrent_requests():
+    sizes = []
+    release = threading.Event()
+
+    def batch_fn(items):
+        sizes.append(len(items))
+        release.wait(1)  # hold the first batch so the rest queue up
+        return [i * 10 for i in items]
+
+    batcher = MicroBatcher(batch_fn, max_batch_size=4, max_wait_ms=50)
+    futures = [batcher.submit(i) for i in range(10)]
+    release.set()
+    assert [f.result(timeout=5) for f in futures] == [i * 10 for i in range(10)]
+    assert max(sizes) <= 4 and sum(sizes) == 10 and len(sizes) < 10
+
+    stats = batcher.stats.snapshot()
+    assert stats["requests"] == 10 and stats["batches"] == len(sizes)
+    assert sum(b["requests"] for b in stats["by_batch_size"].values()) == 10
+    batcher.close()
+
+
+def test_micro_batcher_propagates_errors():
+    def broken(items):
+        raise ValueError("model exploded")
+
+    batcher = MicroBatcher(broken, max_batch_size=2, max_wait_ms=1)
+    with pytest.raises(ValueError):
+        batcher.submit("x").result(timeout=5)
+    batcher.close()
+
+
+def test_inference_process_round_trip():
+    server = InferenceServer(batch_fn="test_inference_server:upper_batch", max_batch_size=8, max_wait_ms=30)
+    try:
+        futures = [server.submit({"text": f"case {i}"}) for i in range(6)]
+        assert [f.result(timeout=60) for f in futures] == [f"CASE {i}" for i in range(6)]
+        stats = server.stats()
+        assert stats["running"] and stats["requests"] == 6 and stats["inflight"] == 0
+    finally:
+        server.shutdown()
+
+
+def test_failed_start_raises_and_backs_off():
+    server = InferenceServer(batch_fn="test_inference_server:missing_batch_fn", timeout=60, restart_backoff=60)
+    try:
+        with pytest.raises(RuntimeError, match="failed to start"):
+            server.start()
+        process = server._process
+        # within the backoff window the error is raised without respawning
+        with pytest.raises(RuntimeError, match="missing_batch_fn"):
+            server.generate({"text": "case"})
+        assert server._process is process
+        assert "missing_batch_fn" in server.stats()["last_error"]
+    finally:
+        server.shutdown()
+
+
+def test_generate_timeout_drops_the_pending_request():
+    server = InferenceServer(batch_fn="test_inference_server:slow_batch", timeout=60)
+    try:
+        server.start()
+        server._timeout = 0.1
+        with pytest.raises(FutureTimeout):
+            server.generate({"text": "case"})
+        assert server.stats()["inflight"] == 0
+    finally:
+        server.shutdown()
@@ -0,0 +1,56 @@
+import random
+import sqlite3
+
+from services.api.app.db import mysql
+from services.api.app.db.repositories import ResourceCalendarRepo
+from services.api.app.utils.interval_index import IntervalTree
+
+
+def _brute_force(intervals, point):
+    hits = [(s, i, k) for i, (s, e, k) in enumerate(intervals) if s <= point <= e]
+    return [k for _, _, k in sorted(hits)]
+
+
+def test_stab_matches_linear_scan_with_incremental_updates():
+    rng = random.Random(3)
+    intervals = []
+    for i in range(300):
+        start = rng.randrange(0, 86400, 900)
+        intervals.append((start, start + rng.randrange(0, 43200, 900), f"C{i}"))
+    tree = IntervalTree(intervals)
+
+    for key in [f"C{i}" for i in range(0, 300, 7)]:
+        tree.remove(key)
+    intervals = [iv for iv in intervals if iv[2] in tree]
+    for i in range(300, 340):
+        start = rng.randrange(0, 86400, 900)
+        interval = (start, start + 3600, f"C{i}")
+        tree.insert(*interval)
+        intervals.append(interval)
+
+    for point in range(0, 86400 + 43200, 450):
+        assert tree.stab(point) == _brute_force(intervals, point)
+
+
+def test_on_duty_index_tracks_workload_writes(sqlite_database):
+    rows = ResourceCalendarRepo.on_duty_at("2024-11-10", "08:30")
+    assert {r["resource_id"] for r in rows} == {"R001", "R004", "R007"}
+
+    ResourceCalendarRepo.increment_workload("C001", delta=2)
+    entry = ResourceCalendarRepo.first_entries_covering(["R001"], "2024-11-10", "08:30")["R001"]
+    assert entry["current_workload"] == 7
+    assert ResourceCalendarRepo.get_calendars_for_resources_on_date(["R001"], "2024-11-10")[
+        "R001"
+    ][0]["current_workload"] == 7
+
+
+def test_scoring_lookup_sees_workload_written_by_another_process(sqlite_database):
+    ResourceCalendarRepo.on_duty_at("2024-11-10", "08:30")  # date is now indexed
+    # a write that bypasses this process's index (e.g. another worker)
+    with sqlite3.connect(mysql.sqlite_path()) as conn:
+        conn.execute("UPDATE resource_calendar SET current_workload = 9 WHERE calendar_id = 'C001'")
+    entry = ResourceCalendarRepo.first_entries_covering(["R001"], "2024-11-10", "08:30")["R001"]
+    assert entry["current_workload"] == 9
+    assert {r["calendar_id"]: r for r in ResourceCalendarRepo.on_duty_at("2024-11-10")}["C001"][
+        "current_workload"
+    ] == 9
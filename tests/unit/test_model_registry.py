@@ -0,0 +1,63 @@
+import threading
+import time
+
+import pytest
+
+from services.api.app.services import model_registry as registry_module
+from services.api.app.services.model_registry import ModelRegistry
+
+
+def test_model_is_loaded_once_across_threads():
+    registry = ModelRegistry()
+    loads = []
+
+    def loader():
+        loads.append(1)
+        time.sleep(0.05)
+        return object()
+
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(registry.get("embedding", loader)))
+        for _ in range(8)
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(loads) == 1
+    assert all(r is results[0] for r in results)
+    assert registry.status()["models"]["embedding"]["state"] == "loaded"
+
+
+def test_failed_load_is_retried():
+    registry = ModelRegistry()
+    attempts = []
+
+    def flaky():
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise OSError("weights not downloaded")
+        return "model"
+
+    with pytest.raises(OSError):
+        registry.get("hf", flaky)
+    assert registry.status()["models"]["hf"]["state"] == "failed"
+    assert registry.get("hf", flaky) == "model"
+
+
+def test_background_warmup_flips_readiness(monkeypatch):
+    registry = ModelRegistry()
+    release = threading.Event()
+    monkeypatch.setattr(registry_module, "_registry", registry)
+    monkeypatch.setattr(
+        registry_module, "_warm", lambda name: registry.get(name, lambda: release.wait(5))
+    )
+
+    thread = registry_module.start_warmup(["embedding", "embedding"])
+    assert registry.status()["ready"] is False
+    assert registry.status()["warming"] == ["embedding"]
+    release.set()
+    thread.join(5)
+    assert registry.ready
+    assert registry_module.start_warmup([]) is None
@@ -0,0 +1,37 @@
+import pytest
+
+from services.api.app.services.pipeline_bench import compare, latency_summary, run_stage, sample_work_ids
+
+
+def test_latency_summary_percentiles():
+    summary = latency_summary([i / 1000 for i in range(1, 101)])
+    assert summary["p50_ms"] == 50.5
+    assert summary["max_ms"] == 100.0
+    assert summary["p90_ms"] <= summary["p95_ms"] <= summary["p99_ms"]
+
+
+def test_compare_flags_regressions_beyond_threshold():
+    base = {"size": "small", "stage": "finder", "p50_ms": 1.0, "p95_ms": 2.0,
+            "ops_per_sec": 1000.0, "queries_per_op": 0.0, "peak_rss_mb": 40.0}
+    current = {**base, "p50_ms": 1.05, "ops_per_sec": 800.0, "queries_per_op": 1.0}
+    regressions = compare({"results": [base]}, {"results": [current]}, threshold=0.1)
+    assert {r["metric"] for r in regressions} == {"ops_per_sec", "queries_per_op"}
+    assert compare({"results": [base]}, {"results": [base]}) == []
+    # stages that failed in either run are not compared
+    failed = {"size": "small", "stage": "finder", "error": "boom"}
+    assert compare({"results": [failed]}, {"results": [current]}) == []
+
+
+def test_run_stage_measures_queries():
+    analyzer = run_stage("analyzer", ops=5, warmup=1)
+    assert analyzer["ops"] == 5 and analyzer["queries_per_op"] == 1.0
+    end_to_end = run_stage("end_to_end", ops=3, warmup=0)
+    assert end_to_end["ops"] == 3 and end_to_end["queries"] > 0
+    assert end_to_end["peak_rss_mb"] > 0
+
+
+def test_sample_work_ids_refuses_to_repeat_work():
+    ids = sample_work_ids(3, seed=1)
+    assert len(set(ids)) == 3
+    with pytest.raises(RuntimeError, match="pending work requests"):
+        sample_work_ids(10**6)
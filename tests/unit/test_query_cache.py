@@ -0,0 +1,113 @@
+import time
+
+import numpy as np
+
+from services.api.app.agents import resource_finder_agent
+from services.api.app.agents.resource_finder_agent import ResourceFinderAgent
+from services.api.app.db.calendar_index import ShiftIndex
+from services.api.app.services.query_cache import QueryCache
+
+
+def test_vector_lru_normalizes_query_text():
+    cache = QueryCache(max_entries=2, negative_max_entries=4, negative_ttl_seconds=60)
+    cache.put_vector("CT_Scan_Brain Acute stroke evaluation - URGENT", np.ones((1, 3)))
+    hit = cache.get_vector("ct_scan_brain  acute stroke EVALUATION - urgent")
+    assert hit is not None and hit.dtype == np.float32 and not hit.flags.writeable
+    cache.put_vector("b", np.zeros((1, 3)))
+    cache.put_vector("c", np.zeros((1, 3)))
+    assert cache.get_vector("b") is not None
+    assert cache.get_vector("ct_scan_brain acute stroke evaluation - urgent") is None
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["evictions"]) == (2, 1, 1)
+
+
+def test_negative_entries_expire():
+    cache = QueryCache(max_entries=2, negative_max_entries=4, negative_ttl_seconds=0.01)
+    cache.mark_negative(("q", "v1", ("R1",)))
+    assert cache.is_negative(("q", "v1", ("R1",)))
+    assert not cache.is_negative(("q", "v2", ("R1",)))
+
+    time.sleep(0.02)
+    assert not cache.is_negative(("q", "v1", ("R1",)))
+
+
+def test_finder_skips_repeated_fruitless_semantic_search(monkeypatch):
+    searches = []
+    cache = QueryCache(max_entries=8, negative_max_entries=8, negative_ttl_seconds=60)
+
+    def search(query, top_k=5):
+        searches.append(query)
+        return [{"id": "R005", "score": 0.9}]
+
+    monkeypatch.setattr(resource_finder_agent, "FAISS_AVAILABLE", True)
+    monkeypatch.setattr(resource_finder_agent, "query_faiss_by_text", search, raising=False)
+    monkeypatch.setattr(resource_finder_agent, "index_version", lambda: "v1", raising=False)
+    monkeypatch.setattr(resource_finder_agent, "query_cache", lambda: cache)
+
+    roster = [{"resource_id": "R005", "specialty": "Neurologist"}]
+    work = {
+        "work_id": "W1",
+        "work_type": "CT_Scan_Brain",
+        "description": "Acute stroke evaluation - URGENT",
+        "required_specialty": "Neurologist",
+    }
+    for _ in range(3):
+        found = ResourceFinderAgent().run(work, roster=roster)
+        assert [c["resource_id"] for c in found["candidates"]] == ["R005"]
+    assert len(searches) == 1
+    assert cache.stats()["negative_hits"] == 2
+
+
+def test_semantic_search_is_restricted_to_resources_on_shift(monkeypatch):
+    allowed = []
+
+    def search(query, top_k=5, allow_ids=None):
+        allowed.append(sorted(allow_ids))
+        return [{"id": rid, "score": 0.5} for rid in sorted(allow_ids)]
+
+    def no_db(*args, **kwargs):
+        raise AssertionError("semantic candidates must come from the calendar rows")
+
+    monkeypatch.setattr(resource_finder_agent, "FAISS_AVAILABLE", True)
+    monkeypatch.setattr(resource_finder_agent, "query_faiss_by_text", search, raising=False)
+    monkeypatch.setattr(resource_finder_agent, "index_version", lambda: "v1", raising=False)
+    monkeypatch.setattr(resource_finder_agent.ResourcesRepo, "roster_cache", no_db)
+
+    def shift(calendar_id, resource_id, start, end):
+        return {
+            "calendar_id": calendar_id,
+            "resource_id": resource_id,
+            "available_from": start,
+            "available_to": end,
+            "current_workload": 0,
+            "name": f"Dr {resource_id}",
+            "specialty": "General_Radiologist",
+            "skill_level": 3,
+            "total_cases_handled": 10,
+        }
+
+    calendars = ShiftIndex(
+        [
+            shift("C1", "R005", "08:00:00", "16:00:00"),
+            shift("C2", "R010", "08:00:00", "16:00:00"),
+            shift("C3", "R011", "16:00:00", "23:00:00"),  # off shift at 10:00
+        ]
+    )
+    roster = [{"resource_id": "R005", "specialty": "Neurologist"}]
+    work = {
+        "work_id": "W2",
+        "work_type": "MRI_Brain",
+        "description": "Follow-up",
+        "required_specialty": "Neurologist",
+        "scheduled_timestamp": "2025-01-06T10:00:00",
+    }
+    found = ResourceFinderAgent().run(work, roster=roster, calendars=calendars)
+    assert allowed == [["R010"]]
+    assert [c["resource_id"] for c in found["candidates"]] == ["R005", "R010"]
+    assert found["candidates"][1] == {
+        "resource_id": "R010",
+        "name": "Dr R010",
+        "specialty": "General_Radiologist",
+        "skill_level": 3,
+        "total_cases_handled": 10,
+    }
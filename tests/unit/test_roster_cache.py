@@ -0,0 +1,21 @@
+from services.api.app.db.repositories import ResourcesRepo
+
+
+def test_roster_cache_hits_and_write_through(sqlite_database):
+    cache = ResourcesRepo.roster_cache()
+    neuro = cache.get_by_specialty(["Neurologist"])
+    assert [r["resource_id"] for r in neuro] == ["R005", "R006", "R007", "R008"]
+    assert cache.stats()["misses"] == 1
+
+    ResourcesRepo.increment_cases_handled("R005", delta=3)
+    again = cache.get_by_specialty(["Neurologist", "Cardiologist"])
+    stats = cache.stats()
+    assert stats["hits"] == 1 and stats["misses"] == 2
+    r005 = next(r for r in again if r["resource_id"] == "R005")
+    assert r005["total_cases_handled"] == neuro[0]["total_cases_handled"] + 3
+    assert ResourcesRepo.get_by_ids(["R005"])[0]["total_cases_handled"] == r005["total_cases_handled"]
+
+    # callers get copies; mutating them does not leak into the cache
+    expected = r005["total_cases_handled"]
+    r005["total_cases_handled"] = -1
+    assert cache.get_by_ids(["R005"])[0]["total_cases_handled"] == expected
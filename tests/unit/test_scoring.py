@@ -0,0 +1,76 @@
+import random
+from datetime import datetime
+
+import numpy as np
+
+from services.api.app.utils.scoring import (
+    compute_candidate_score,
+    compute_candidate_scores_batch,
+    encode_specialties,
+    round_like_builtin,
+    score_payloads,
+)
+from services.api.app.utils.time_utils import time_to_seconds
+
+SPECIALTIES = ["General_Radiologist", "Neurologist", "Cardiologist", None]
+
+
+def test_round_like_builtin_matches_round():
+    rng = random.Random(7)
+    values = [rng.uniform(-2, 2) for _ in range(5000)] + [0.50125, 0.03125, 2.675, 1.00005]
+    expected = [round(v, 4) for v in values]
+    assert round_like_builtin(np.array(values)).tolist() == expected
+
+
+def test_batch_scores_match_scalar_function():
+    rng = random.Random(42)
+    for _ in range(50):
+        required = rng.choice(SPECIALTIES)
+        priority = rng.randint(-1, 7)
+        scheduled = datetime(2024, 11, 10, rng.randint(0, 23), rng.randint(0, 59), rng.randint(0, 59))
+        candidates, entries = [], []
+        for _ in range(40):
+            start = rng.randint(0, 86399)
+            end = rng.randint(start, 86399)
+            candidates.append(
+                {
+                    "specialty": rng.choice(SPECIALTIES),
+                    "skill_level": rng.choice([None, 0, 1, 3, 5, 7]),
+                    "total_cases_handled": rng.choice([None, 0, 17, 399, 401]),
+                }
+            )
+            entries.append(
+                {
+                    "available_from": f"{start // 3600:02d}:{start % 3600 // 60:02d}:{start % 60:02d}",
+                    "available_to": f"{end // 3600:02d}:{end % 3600 // 60:02d}:{end % 60:02d}",
+                    "current_workload": rng.choice([None, 0, 4, 12, 15]),
+                }
+            )
+
+        vocabulary = {"General_Radiologist": 0}
+        codes, vocabulary = encode_specialties([c["specialty"] for c in candidates], vocabulary)
+        required_code = encode_specialties([required], vocabulary)[0][0]
+        nan = float("nan")
+        batch = compute_candidate_scores_batch(
+            specialty_codes=codes,
+            skill_levels=[nan if c["skill_level"] is None else c["skill_level"] for c in candidates],
+            total_cases=[
+                nan if c["total_cases_handled"] is None else c["total_cases_handled"]
+                for c in candidates
+            ],
+            window_start=[time_to_seconds(e["available_from"]) for e in entries],
+            window_end=[time_to_seconds(e["available_to"]) for e in entries],
+            current_workload=[
+                nan if e["current_workload"] is None else e["current_workload"] for e in entries
+            ],
+            scheduled_seconds=time_to_seconds(scheduled.time()),
+            required_code=required_code,
+            priority=priority,
+            general_code=vocabulary["General_Radiologist"],
+        )
+
+        expected = [
+            compute_candidate_score(c, e, scheduled, required, priority)
+            for c, e in zip(candidates, entries)
+        ]
+        assert score_payloads(batch, entries) == expected
@@ -0,0 +1,44 @@
+from collections import Counter
+
+import numpy as np
+
+from services.api.app.controllers.assignment_controller import AssignmentController
+from services.api.app.db.repositories import ResourceCalendarRepo, WorkRequestsRepo
+from services.api.app.services.shift_optimizer import solve_allocation
+
+
+def test_solver_respects_capacity_and_prefers_priority():
+    # Two items compete for the single remaining slot of one entry.
+    matrix = np.array([[0.6], [0.6]])
+    choice = solve_allocation(matrix, np.array([1, 5]), [11], max_workload=12)
+    assert choice.tolist() == [-1, 0]
+
+
+def test_solver_spreads_load_across_entries():
+    # Entry 0 scores slightly higher, but its workload component decays.
+    matrix = np.array([[0.7, 0.69]] * 4)
+    choice = solve_allocation(matrix, np.array([3, 3, 3, 3]), [6, 6])
+    assert Counter(choice.tolist()) == {0: 2, 1: 2}
+
+
+def test_optimize_shift_dry_run_and_commit(sqlite_database):
+    controller = AssignmentController()
+    pending = WorkRequestsRepo.list_pending_on_date("2024-11-10")
+
+    preview = controller.optimize_shift("2024-11-10", dry_run=True)
+    assert preview["summary"]["pending"] == len(pending)
+    assert WorkRequestsRepo.list_pending_on_date("2024-11-10") == pending
+
+    before = ResourceCalendarRepo.get_calendars_on_date("2024-11-10")
+    result = controller.optimize_shift("2024-11-10")
+    assigned = [a for a in result["assignments"] if a["assigned_to"]]
+    assert len(assigned) == result["summary"]["assigned"] > 0
+    for item in assigned:
+        assert item["selected"]["breakdown"]["availability"] > 0
+        assert WorkRequestsRepo.get_work_by_id(item["work_id"])["assigned_to"] == item["assigned_to"]
+
+    after = ResourceCalendarRepo.get_calendars_on_date("2024-11-10")
+    per_entry = Counter(a["selected"]["calendar_id"] for a in assigned)
+    for resource_id, entries in after.items():
+        for old, new in zip(before[resource_id], entries):
+            assert new["current_workload"] == old["current_workload"] + per_entry[old["calendar_id"]]
@@ -0,0 +1,30 @@
+from services.api.app.db.mysql import get_connection
+from services.api.app.services import specialty_routing
+
+
+def test_routes_combine_mapping_and_fallbacks(sqlite_database):
+    assert specialty_routing.resolve_specialties("MRI_Brain") == ("Neurologist", "General_Radiologist")
+    assert specialty_routing.resolve_specialties("CT_Scan_Chest") == (
+        "General_Radiologist",
+        "General_Radiologist",
+    )
+    assert specialty_routing.resolve_specialties("PET_Scan") == (
+        "General_Radiologist",
+        "General_Radiologist",
+    )
+
+
+def test_reload_picks_up_mapping_edits(sqlite_database):
+    before = specialty_routing.reload_routing_table()["version"]
+    conn = get_connection()
+    conn.execute(
+        "UPDATE specialty_mapping SET required_specialty='Cardiologist' WHERE work_type='CT_Scan_Chest'"
+    )
+    conn.commit()
+    conn.close()
+
+    # served from memory until reloaded
+    assert specialty_routing.resolve_specialties("CT_Scan_Chest")[0] == "General_Radiologist"
+    info = specialty_routing.reload_routing_table()
+    assert info["version"] != before
+    assert specialty_routing.resolve_specialties("CT_Scan_Chest")[0] == "Cardiologist"
@@ -0,0 +1,65 @@
+import csv
+import sqlite3
+from datetime import date
+
+from services.api.app.db.mysql import _bootstrap_sqlite_db
+from services.api.app.db.synthetic_data import (
+    CALENDAR_COLUMNS,
+    RESOURCE_COLUMNS,
+    WORK_COLUMNS,
+    DatasetGenerator,
+    parse_weights,
+)
+
+
+def _generator(**overrides):
+    kwargs = dict(resources=40, days=5, work_requests=300, start_date=date(2024, 11, 10), seed=3)
+    kwargs.update(overrides)
+    return DatasetGenerator(**kwargs)
+
+
+def test_same_seed_writes_identical_files(tmp_path):
+    counts = _generator().write(tmp_path / "a")
+    _generator().write(tmp_path / "b")
+    for name in counts:
+        assert (tmp_path / "a" / f"{name}.csv").read_bytes() == (tmp_path / "b" / f"{name}.csv").read_bytes()
+    assert counts["resources"] == 40
+    assert counts["work_requests"] == 300
+    assert 0 < counts["resource_calendar"] <= 40 * 5
+
+    # more work requests leave resources and calendars untouched
+    _generator(work_requests=10).write(tmp_path / "c")
+    for name in ("resources", "resource_calendar"):
+        assert (tmp_path / "a" / f"{name}.csv").read_bytes() == (tmp_path / "c" / f"{name}.csv").read_bytes()
+
+
+def test_columns_and_weights(tmp_path):
+    _generator(
+        specialty_weights=parse_weights("Neurologist=1", {}),
+        shift_weights=parse_weights("08:00-13:00=1", {}),
+    ).write(tmp_path)
+    for name, columns in (
+        ("resources", RESOURCE_COLUMNS),
+        ("resource_calendar", CALENDAR_COLUMNS),
+        ("work_requests", WORK_COLUMNS),
+    ):
+        with open(tmp_path / f"{name}.csv", newline="") as f:
+            assert next(csv.reader(f)) == columns
+    with open(tmp_path / "resources.csv", newline="") as f:
+        assert {row["specialty"] for row in csv.DictReader(f)} == {"Neurologist"}
+    with open(tmp_path / "resource_calendar.csv", newline="") as f:
+        rows = list(csv.DictReader(f))
+    assert {(r["available_from"], r["available_to"]) for r in rows} == {("08:00:00", "13:00:00")}
+    assert parse_weights("1=2,5=0.5", {}, int) == {1: 2.0, 5: 0.5}
+
+
+def test_output_loads_into_sqlite(tmp_path):
+    counts = _generator().write(tmp_path / "csv")
+    db = tmp_path / "synthetic.db"
+    _bootstrap_sqlite_db(db, csv_dir=tmp_path / "csv")
+    conn = sqlite3.connect(db)
+    try:
+        for name, expected in counts.items():
+            assert conn.execute(f"SELECT COUNT(*) FROM {name}").fetchone()[0] == expected
+    finally:
+        conn.close()
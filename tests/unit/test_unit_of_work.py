@@ -0,0 +1,37 @@
+import pytest
+
+from services.api.app.db.repositories import (
+    ResourceCalendarRepo,
+    ResourcesRepo,
+    UnitOfWork,
+    WorkRequestsRepo,
+)
+
+
+def _cases(resource_id):
+    return ResourcesRepo.get_by_ids([resource_id])[0]["total_cases_handled"]
+
+
+def test_unit_of_work_commits_together_or_not_at_all(sqlite_database):
+    cache = ResourcesRepo.roster_cache()
+    before = cache.get_by_ids(["R001"])[0]["total_cases_handled"]
+    work_id = WorkRequestsRepo.list_work_requests(limit=1, status="pending")[0]["work_id"]
+
+    with pytest.raises(RuntimeError):
+        with UnitOfWork() as uow:
+            WorkRequestsRepo.assign_work(work_id, "R001", uow=uow)
+            ResourcesRepo.increment_cases_handled("R001", uow=uow)
+            raise RuntimeError("crash between writes")
+    assert _cases("R001") == before
+    assert cache.get_by_ids(["R001"])[0]["total_cases_handled"] == before
+    assert WorkRequestsRepo.get_work_by_id(work_id)["status"] == "pending"
+
+    with UnitOfWork() as uow:
+        WorkRequestsRepo.assign_work(work_id, "R001", uow=uow)
+        ResourcesRepo.increment_cases_handled("R001", uow=uow)
+        ResourceCalendarRepo.increment_workload("does-not-exist", uow=uow)
+        # cache is only updated after the commit
+        assert cache.get_by_ids(["R001"])[0]["total_cases_handled"] == before
+    assert _cases("R001") == before + 1
+    assert cache.get_by_ids(["R001"])[0]["total_cases_handled"] == before + 1
+    assert WorkRequestsRepo.get_work_by_id(work_id)["assigned_to"] == "R001"